@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+AI scheduler benchmark.
+Steers growing numbers of enemies spread over the level towards a moving wizard,
+every enemy every tick with the plain chase system and then time-sliced by the
+AI scheduler, and reports the per-tick cost, budget use and per-tier update rates.
+Then checks that under load the near tier still steers every tick: half a budget
+of enemies around the wizard and thousands more further out. Finally checks that
+the far tier is not starved when the near tier alone overflows the budget.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+
+from ecs import World, Kind, ChaseSystem
+from ai import AIScheduler, AI_BUDGET, AI_TIERS
+
+# Per-tick steering cost in milliseconds, at any enemy count
+TARGET_TICK_MS = 1.0
+WIDTH, HEIGHT = 1200, 800
+
+def populate(enemies: int, rng: np.random.Generator) -> World:
+    world = World(capacity=enemies)
+    world.spawn_many(Kind.ENEMY, enemies,
+                     position=(rng.uniform(-20, WIDTH + 20, enemies), rng.uniform(-20, HEIGHT + 20, enemies)),
+                     velocity=0.0, chase=(rng.uniform(1, 2.5, enemies), 0.0), think=(-np.inf, 1.0))
+    return world
+
+def crowd(near: int, enemies: int, rng: np.random.Generator) -> World:
+    # Standing enemies, so the tiers stay put: ``near`` of them within 250 px of
+    # the wizard at the centre and the rest 350-2000 px away
+    distance = np.concatenate([rng.uniform(0, 250, near), rng.uniform(350, 2000, enemies - near)])
+    angle = rng.uniform(0, 2 * np.pi, enemies)
+    world = World(capacity=enemies)
+    world.spawn_many(Kind.ENEMY, enemies,
+                     position=(WIDTH / 2 + np.cos(angle) * distance, HEIGHT / 2 + np.sin(angle) * distance),
+                     velocity=0.0, chase=(0.0, 0.0), think=(-np.inf, 1.0))
+    return world
+
+def measure(system, world: World, ticks: int) -> float:
+    start = time.perf_counter()
+    for tick in range(ticks):
+        system.target = (WIDTH / 2 + np.cos(tick / 30) * 200, HEIGHT / 2 + np.sin(tick / 30) * 150)
+        system.run(world)
+    return (time.perf_counter() - start) * 1000 / ticks
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--budget", type=int, default=AI_BUDGET)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for enemies in (100, 1000, 10000, 50000):
+        every_tick = measure(ChaseSystem(), populate(enemies, rng), args.ticks)
+        ai = AIScheduler(args.budget)
+        world = populate(enemies, rng)
+        sliced = measure(ai, world, args.ticks)
+        rates = "  ".join(f"{name} {rate:.3f}" for name, rate in ai.tier_rates().items())
+        # The horde closes in, so the near tier alone may outgrow the budget
+        near = np.count_nonzero(np.hypot(world.columns["x"][:enemies] - ai.target[0],
+                                         world.columns["y"][:enemies] - ai.target[1]) <= AI_TIERS[0].distance)
+        status = "✓" if sliced <= TARGET_TICK_MS else "✗"
+        print(f"{status} {enemies:6d} enemies: every tick {every_tick:.3f} ms, sliced {sliced:.3f} ms "
+              f"(target {TARGET_TICK_MS} ms)")
+        print(f"    budget {ai.budget_use():.0%} used, peak {ai.stats['peak_updates']} updates; "
+              f"updates/enemy/tick {rates}; {near} in the near tier at the end")
+
+    near = args.budget // 2
+    for enemies in (10000, 50000):
+        ai = AIScheduler(args.budget)
+        ai.target = (WIDTH / 2, HEIGHT / 2)
+        world = crowd(near, enemies, rng)
+        for _ in range(args.ticks):
+            ai.run(world)
+        rates = ai.tier_rates()
+        status = "✓" if rates["near"] >= 1.0 else "✗"
+        print(f"{status} {near} near of {enemies:6d} enemies: near tier steered {rates['near']:.2f} "
+              f"per tick (target 1.00), {ai.stats['deferred']} updates deferred")
+
+    near = args.budget * 4
+    for enemies in (10000, 50000):
+        ai = AIScheduler(args.budget)
+        ai.target = (WIDTH / 2, HEIGHT / 2)
+        world = crowd(near, enemies, rng)
+        for _ in range(args.ticks):
+            ai.run(world)
+        rates = ai.tier_rates()
+        status = "✓" if rates["far"] > 0 else "✗"
+        print(f"{status} {near} near of {enemies:6d} enemies: far tier steered {rates['far']:.4f} "
+              f"per tick (target > 0), mid {rates['mid']:.4f}, near {rates['near']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Gameplay capture benchmark.
+Runs headless frames with and without capture and reports the time capture
+adds on the game thread, frames written and frames dropped for each format.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+from game import Game, GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from game_objects import Enemy, EnemyType
+from capture import FrameCapture
+
+FRAME_BUDGET_MS = 1000 / 60
+
+def run(frames: int, enemies: int, capture=None) -> float:
+    game = Game(audio=False, capture=capture)
+    game.state = GameState.PLAYING
+    game.enemy_spawn_delay = 10 ** 9
+    game.wizard.invulnerable = True
+    game.wizard.invulnerability_timer = 10 ** 9 + 5
+    rng = random.Random(0)
+    for _ in range(enemies):
+        Enemy(game.world, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+              rng.choice(list(EnemyType)))
+    
+    # Paced like the real loop so the writer gets the idle time it would in play
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.update()
+        game.draw()
+        game.clock.tick(60)
+    return (time.perf_counter() - start) * 1000 / frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--enemies", type=int, default=100)
+    parser.add_argument("--buffers", type=int, default=8)
+    parser.add_argument("--formats", nargs="+", default=["bmp", "png"])
+    args = parser.parse_args()
+    
+    baseline = run(args.frames, args.enemies)
+    print(f"no capture: {baseline:.2f} ms/frame")
+    for image_format in args.formats:
+        with tempfile.TemporaryDirectory() as directory:
+            capture = FrameCapture(directory, (SCREEN_WIDTH, SCREEN_HEIGHT), args.buffers,
+                                   image_format=image_format)
+            run(args.frames, args.enemies, capture)
+            capture.close()
+            overhead = capture.overhead_ms / capture.frames_seen
+            status = "✓" if overhead <= FRAME_BUDGET_MS * 0.05 else "✗"
+            print(f"{status} {image_format:4s}: {overhead:.2f} ms/frame on the game thread "
+                  f"({overhead / FRAME_BUDGET_MS:.1%} of budget), {capture.frames_written} written, "
+                  f"{capture.frames_dropped} dropped")
+
+if __name__ == "__main__":
+    main()
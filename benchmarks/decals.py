@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Impact decal benchmark.
+Piles up 1k-100k scorch, frost and blood marks and times a frame of the
+baked ground layer against blitting every mark each frame, as marks kept
+as entities would be. Also times stamping a fight's worth of new marks
+into the ground.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from game import SCREEN_WIDTH, SCREEN_HEIGHT
+from decals import Decal, DecalLog, DecalLayer, decal_stamp
+from render_backend import SurfaceBackend
+
+# Per-frame budget in milliseconds for the ground, however many marks it holds
+TARGET_FRAME_MS = 1.0
+
+def pile(log: DecalLog, count: int, rng: np.random.Generator):
+    kinds = rng.integers(0, len(Decal), count).tolist()
+    xs = rng.uniform(0, SCREEN_WIDTH, count).tolist()
+    ys = rng.uniform(0, SCREEN_HEIGHT, count).tolist()
+    radii = rng.choice((5, 8, 12, 16), count).tolist()
+    for kind, x, y, radius in zip(kinds, xs, ys, radii):
+        log.stamp(Decal(kind), x, y, radius)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--per-frame", type=int, default=20, help="new marks stamped per frame")
+    args = parser.parse_args()
+
+    backend = SurfaceBackend((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = np.random.default_rng(0)
+    for count in (1000, 10000, 100000):
+        log = DecalLog()
+        layer = DecalLayer()
+        pile(log, count, rng)
+        start = time.perf_counter()
+        layer.draw(backend, log.state())
+        baked_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            layer.draw(backend, log.state())
+        frame_ms = (time.perf_counter() - start) * 1000 / args.frames
+
+        stamping = 0.0
+        for _ in range(args.frames):
+            pile(log, args.per_frame, rng)
+            start = time.perf_counter()
+            layer.draw(backend, log.state())
+            stamping += time.perf_counter() - start
+        stamping_ms = stamping * 1000 / args.frames
+
+        # Every mark drawn every frame
+        stamps = log.state().stamps[:count]
+        sprites = [(decal_stamp(Decal(int(kind)), int(variant), round(radius)), (round(x), round(y)))
+                   for kind, variant, x, y, radius in stamps.tolist()]
+        frames = max(1, args.frames // 10)
+        start = time.perf_counter()
+        for _ in range(frames):
+            backend.clear((0, 0, 0))
+            backend.blits(sprites)
+        entity_ms = (time.perf_counter() - start) * 1000 / frames
+
+        status = "✓" if frame_ms <= TARGET_FRAME_MS else "✗"
+        print(f"{status} {count:6d} marks: {frame_ms:5.2f} ms/frame baked "
+              f"({stamping_ms:.2f} ms with {args.per_frame} new marks, {baked_ms:.0f} ms to bake the pile) "
+              f"vs {entity_ms:7.2f} ms/frame as entities (target {TARGET_FRAME_MS} ms)")
+
+if __name__ == "__main__":
+    main()
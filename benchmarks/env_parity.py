@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Environment parity check.
+Resets WizardEnv and a one-environment VectorWizardEnv from the same seed,
+stages the same enemies of every type around the wizard in both, and steps
+them with the same policy (stand still, fire at the nearest enemy), comparing
+the reward of every step. Random spawns are held off, since the two draw
+from different generators.
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from env import WizardEnv, VectorWizardEnv, ENEMY_ORDER, ENEMY_FEATURES, SPELL_ORDER
+from game_objects import Enemy, EnemyType
+from spells import SpellType
+
+NEVER = 10 ** 9
+FIREBALL = SPELL_ORDER.index(SpellType.FIREBALL) + 1
+
+def staging(level, center, count: int, rng: np.random.Generator):
+    # Enemies of every regular type around the wizard, within the near AI tier
+    # and on open ground
+    types = [t for t in ENEMY_ORDER if t is not EnemyType.BOSS]
+    placed = []
+    while len(placed) < count:
+        angle = rng.uniform(0, 2 * np.pi)
+        distance = rng.uniform(120, 240)
+        x, y = center[0] + np.cos(angle) * distance, center[1] + np.sin(angle) * distance
+        if not level.blocked_at(x, y):
+            placed.append((x, y, types[len(placed) % len(types)]))
+    return placed
+
+def policy(observation) -> np.ndarray:
+    # Fire at the nearest enemy, without moving
+    dx, dy = observation["enemies"][0, 0, :2]
+    present = observation["enemies"][0, 0, ENEMY_FEATURES.index("present")]
+    return np.array([0, 0, FIREBALL if present else 0, dx, dy], dtype=np.float64)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--enemies", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=400)
+    args = parser.parse_args()
+
+    for seed in args.seeds:
+        single = WizardEnv(seed=seed)
+        vector = VectorWizardEnv(1, max_enemies=args.enemies, seed=seed)
+        single_obs = single.reset()
+        vector.reset()
+
+        game = single.game
+        game.enemy_spawn_delay = game.power_up_delay = NEVER
+        vector.spawn_delay[:] = NEVER
+        vector.power_up_timer[:] = -NEVER
+        staged = staging(game.level, (game.wizard.x, game.wizard.y), args.enemies, np.random.default_rng(seed))
+        for slot, (x, y, enemy_type) in enumerate(staged):
+            Enemy(game.world, x, y, enemy_type)
+            etype = ENEMY_ORDER.index(enemy_type)
+            vector.ex[0, slot], vector.ey[0, slot] = x, y
+            vector.etype[0, slot] = etype
+            vector.ehealth[0, slot] = vector.enemy_health[etype]
+            vector.ealive[0, slot] = True
+        single_obs = single.observe()
+        vector_obs = vector.observe()
+
+        single_total = vector_total = 0.0
+        mismatch = None
+        for step in range(args.steps):
+            single_obs, single_reward, single_done, _ = single.step(policy(single_obs))
+            vector_obs, vector_reward, vector_done, _ = vector.step(policy(vector_obs)[None])
+            single_total += single_reward
+            vector_total += float(vector_reward[0])
+            if mismatch is None and single_reward != float(vector_reward[0]):
+                mismatch = (step, single_reward, float(vector_reward[0]))
+            if single_done or vector_done[0]:
+                break
+
+        status = "✓" if mismatch is None else "✗"
+        detail = "every step matches" if mismatch is None else \
+            "first differs at step {} ({:g} vs {:g})".format(*mismatch)
+        print(f"{status} seed {seed}: reward {single_total:g} WizardEnv vs {vector_total:g} "
+              f"VectorWizardEnv over {step + 1} steps, {detail}")
+
+if __name__ == "__main__":
+    main()
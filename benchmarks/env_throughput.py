@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Vectorized environment throughput benchmark.
+Steps VectorWizardEnv with random actions and reports env-steps per second,
+timed after a warm-up so the games have filled up with enemies and
+projectiles. Small batches are bound by the fixed cost of each batched step
+and may fall short of the target.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from env import VectorWizardEnv, SPELL_ORDER
+
+TARGET_STEPS_PER_SECOND = 100_000
+
+def run(num_envs: int, steps: int, warmup: int = 0, seed: int = 0) -> float:
+    env = VectorWizardEnv(num_envs, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = np.zeros((num_envs, 5))
+    
+    start = time.perf_counter()
+    for step in range(warmup + steps):
+        if step == warmup:
+            start = time.perf_counter()
+        actions[:, 0:2] = rng.integers(-1, 2, (num_envs, 2))
+        actions[:, 2] = rng.integers(0, len(SPELL_ORDER) + 1, num_envs)
+        actions[:, 3:5] = rng.normal(0, 100, (num_envs, 2))
+        env.step(actions)
+    elapsed = time.perf_counter() - start
+    return num_envs * steps / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--envs", type=int, nargs="+", default=[64, 256, 1024, 4096])
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=1200, help="untimed steps first")
+    args = parser.parse_args()
+    
+    met = 0
+    for num_envs in args.envs:
+        rate = run(num_envs, args.steps, args.warmup)
+        met += rate >= TARGET_STEPS_PER_SECOND
+        status = "✓" if rate >= TARGET_STEPS_PER_SECOND else "✗"
+        print(f"{status} {num_envs:6d} envs: {rate:12,.0f} env-steps/s (target {TARGET_STEPS_PER_SECOND:,})")
+    print(f"Target met at {met} of {len(args.envs)} batch sizes")
+
+if __name__ == "__main__":
+    main()
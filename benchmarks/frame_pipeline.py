@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Frame pipeline benchmark.
+Compares uncapped simulation and presented-frame throughput with synchronous
+rendering against a render thread with double and triple buffered snapshots.
+The render thread only helps with more than one CPU available; a threaded run
+that presents fewer frames than synchronous rendering is flagged, and on one
+CPU the game renders synchronously even when asked to thread.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+from game import Game, GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from frame_pipeline import render_thread_helps
+from game_objects import Enemy, EnemyType, emit_particles
+from ecs import Kind
+
+def populate(game: Game, enemies: int, particles: int):
+    rng = random.Random(0)
+    for _ in range(enemies):
+        Enemy(game.world, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+              rng.choice(list(EnemyType)))
+    xs = [rng.uniform(0, SCREEN_WIDTH) for _ in range(particles)]
+    ys = [rng.uniform(0, SCREEN_HEIGHT) for _ in range(particles)]
+    emit_particles(game.world, Kind.PARTICLE, xs, ys, particles, (255, 165, 0), 10 ** 9, spread=0)
+
+def run(threaded: bool, buffers: int, frames: int, enemies: int, particles: int) -> float:
+    game = Game(threaded_render=threaded, render_buffers=buffers, audio=False)
+    game.state = GameState.PLAYING
+    game.enemy_spawn_delay = 10 ** 9
+    game.wizard.invulnerable = True
+    game.wizard.invulnerability_timer = 10 ** 9 + 5
+    populate(game, enemies, particles)
+    
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.update()
+        game.draw()
+    game.pipeline.wait_idle()
+    elapsed = time.perf_counter() - start
+    rendered = game.pipeline.frames_rendered
+    game.pipeline.close()
+    return frames / elapsed, rendered / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--enemies", type=int, default=300)
+    parser.add_argument("--particles", type=int, default=500)
+    args = parser.parse_args()
+    
+    print(f"More than one CPU available: {'yes' if render_thread_helps() else 'no'}")
+    baseline = None
+    for name, threaded, buffers in (("synchronous", False, 2), ("threaded x2", True, 2), ("threaded x3", True, 3)):
+        ticks, presented = run(threaded, buffers, args.frames, args.enemies, args.particles)
+        if baseline is None:
+            baseline = presented
+            print(f"  {name:12s}: {ticks:7.1f} ticks/s, {presented:7.1f} frames presented/s")
+            continue
+        status = "✓" if presented >= baseline else "✗"
+        print(f"{status} {name:12s}: {ticks:7.1f} ticks/s, {presented:7.1f} frames presented/s "
+              f"({presented / baseline - 1:+.0%} vs synchronous)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Input latency benchmark.
+Posts key presses at random moments from a background thread while the real
+main loop runs, then reports the game's own input-to-present percentiles with
+the default pacing and with --low-latency pacing.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import pygame
+
+from game import Game, GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from game_objects import Enemy, EnemyType
+
+def press_keys(stop: threading.Event, stamped: bool, seed: int):
+    # Spell hotkey presses at random moments, stamped with their real post time
+    rng = random.Random(seed)
+    while not stop.wait(rng.uniform(0.005, 0.05)):
+        attributes = {"key": pygame.K_1, "mod": 0, "unicode": "1", "scancode": 30}
+        if stamped:
+            attributes["timestamp"] = time.perf_counter()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, attributes))
+
+def run(low_latency: bool, frames: int, enemies: int, stamped: bool):
+    game = Game(audio=False, low_latency=low_latency)
+    game.state = GameState.PLAYING
+    game.enemy_spawn_delay = 10 ** 9
+    game.wizard.invulnerable = True
+    game.wizard.invulnerability_timer = 10 ** 9 + 5
+    rng = random.Random(0)
+    for _ in range(enemies):
+        Enemy(game.world, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+              rng.choice(list(EnemyType)))
+
+    stop = threading.Event()
+    poster = threading.Thread(target=press_keys, args=(stop, stamped, 1), daemon=True)
+    poster.start()
+    for _ in range(frames):
+        game.run_frame()
+    stop.set()
+    poster.join()
+    game.pipeline.close()
+    return game.latency
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--enemies", type=int, default=200)
+    parser.add_argument("--estimate", action="store_true",
+                        help="post unstamped events so the game estimates their arrival time")
+    args = parser.parse_args()
+
+    for name, low_latency in (("default", False), ("low-latency", True)):
+        latency = run(low_latency, args.frames, args.enemies, not args.estimate)
+        for kind in ("key", "sampled"):
+            stats = latency.percentiles(kind)
+            values = "  ".join(f"p{q:g} {ms:6.2f} ms" for q, ms in stats.items())
+            print(f"{name:12s} {kind:8s} {values}")
+
+if __name__ == "__main__":
+    main()
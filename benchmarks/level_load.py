@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Level loading benchmark.
+Writes a large generated level as a level file and as JSON, then times loading
+each into a ready-to-play Level (collision grid built) in a fresh interpreter.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+import numpy as np
+
+from level import Level
+
+# Target in milliseconds for loading the binary level
+TARGET_LOAD_MS = 10
+
+LOAD_SCRIPT = """
+import sys, time, json
+sys.path.insert(0, {src!r})
+from level import Level
+start = time.perf_counter()
+if {path!r}.endswith(".json"):
+    with open({path!r}) as f:
+        layout = json.load(f)
+    level = Level.from_layout(layout["size"], layout["walls"], layout["doors"],
+                              layout["enemy_spawns"], layout["power_up_spawns"])
+else:
+    level = Level.load({path!r})
+level.blocked_at(0, 0)
+print((time.perf_counter() - start) * 1000)
+"""
+
+def generate(size: int, walls: int, seed: int) -> dict:
+    # Random wall segments on a tile-aligned square map
+    rng = np.random.default_rng(seed)
+    tiles = size // 20
+    horizontal = rng.random(walls) < 0.5
+    length = rng.integers(2, 10, walls)
+    x = rng.integers(0, tiles - 10, walls) * 20
+    y = rng.integers(0, tiles - 10, walls) * 20
+    w = np.where(horizontal, length, 1) * 20
+    h = np.where(horizontal, 1, length) * 20
+    points = rng.integers(50, size - 50, (1000, 2))
+    return {
+        "size": [size, size],
+        "walls": np.stack([x, y, w, h], axis=1).tolist(),
+        "doors": [[size - 50, size // 2, 40, 80, "next_level"]],
+        "enemy_spawns": [[0, -20, size, 0], [0, size + 20, size, 0]],
+        "power_up_spawns": np.hstack([points, np.zeros_like(points)]).tolist(),  # fixed points
+    }
+
+def measure(path: str, runs: int) -> float:
+    script = LOAD_SCRIPT.format(src=SRC_DIR, path=path)
+    samples = [float(subprocess.run([sys.executable, "-c", script], capture_output=True,
+                                    text=True, check=True).stdout)
+               for _ in range(runs)]
+    return min(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000, help="map width and height in pixels")
+    parser.add_argument("--walls", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    layout = generate(args.size, args.walls, seed=0)
+    with tempfile.TemporaryDirectory() as directory:
+        binary = os.path.join(directory, "level.lvl")
+        text = os.path.join(directory, "level.json")
+        start = time.perf_counter()
+        Level.from_layout(layout["size"], layout["walls"], layout["doors"],
+                          layout["enemy_spawns"], layout["power_up_spawns"]).save(binary)
+        convert_ms = (time.perf_counter() - start) * 1000
+        with open(text, "w") as f:
+            json.dump(layout, f)
+
+        print(f"{args.size}x{args.size} px, {args.walls:,} walls: "
+              f"level file {os.path.getsize(binary) / 1e6:.1f} MB (converted in {convert_ms:.0f} ms), "
+              f"JSON {os.path.getsize(text) / 1e6:.1f} MB")
+        json_ms = measure(text, args.runs)
+        binary_ms = measure(binary, args.runs)
+
+    print(f"  JSON + rasterize: {json_ms:8.1f} ms")
+    status = "✓" if binary_ms <= TARGET_LOAD_MS else "✗"
+    print(f"{status} level file:       {binary_ms:8.1f} ms (target {TARGET_LOAD_MS} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Light map benchmark.
+Times the lighting pass (stamping, upscaling and blending) for growing numbers
+of spell lights at several light buffer resolutions, drawn at the configured
+resolution as at high quality, then adaptive as below it: the lights are
+30-120 px in radius, so the buffer may drop to a coarser level. Each line shows
+the resolution it was drawn at.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from game import SCREEN_WIDTH, SCREEN_HEIGHT
+from lighting import LightMap
+from render_backend import SurfaceBackend
+
+# Per-frame budget in milliseconds for the lighting pass
+TARGET_FRAME_MS = 5.0
+
+def random_lights(count: int, rng: np.random.Generator) -> np.ndarray:
+    lights = np.empty((count, 6), dtype=np.float32)
+    lights[:, 0] = rng.uniform(0, SCREEN_WIDTH, count)
+    lights[:, 1] = rng.uniform(0, SCREEN_HEIGHT, count)
+    lights[:, 2] = rng.uniform(30, 120, count)
+    lights[:, 3:] = rng.uniform(40, 200, (count, 3))
+    return lights
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    backend = SurfaceBackend((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = np.random.default_rng(0)
+    for adaptive in (False, True):
+        for resolution in (0.125, 0.25, 0.5):
+            light_map = LightMap((SCREEN_WIDTH, SCREEN_HEIGHT), resolution)
+            for count in (10, 50, 200):
+                lights = random_lights(count, rng)
+                light_map.draw(backend, lights, adaptive=adaptive)  # fill the kernel cache
+                start = time.perf_counter()
+                for _ in range(args.frames):
+                    light_map.draw(backend, lights, adaptive=adaptive)
+                frame_ms = (time.perf_counter() - start) * 1000 / args.frames
+                status = "✓" if frame_ms <= TARGET_FRAME_MS else "✗"
+                mode = "adaptive" if adaptive else "fixed"
+                print(f"{status} {mode:8s} resolution {resolution:5.3f}, {count:4d} lights: "
+                      f"{frame_ms:6.2f} ms/frame (target {TARGET_FRAME_MS} ms), "
+                      f"drawn at {light_map.drawn_at:.3f}")
+
+if __name__ == "__main__":
+    main()
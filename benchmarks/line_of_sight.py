@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Line-of-sight benchmark.
+Walks the wizard across the level and reports the shadowcasting recompute cost,
+then the per-tick cost of sight lookups and the fog overlay for growing enemy counts.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from game import SCREEN_WIDTH, SCREEN_HEIGHT, default_level
+from ecs import World, Kind
+from visibility import Visibility, SightSystem
+from render_backend import SurfaceBackend
+
+# Per-tick budget in milliseconds for sight and fog together
+TARGET_TICK_MS = 1.5
+
+def walk(visibility: Visibility, steps: int, speed: float):
+    # Wizard positions along a zig-zag across the whole level
+    xs = np.abs((np.arange(steps) * speed) % (2 * SCREEN_WIDTH) - SCREEN_WIDTH)
+    ys = SCREEN_HEIGHT / 2 + np.sin(np.arange(steps) / 40) * (SCREEN_HEIGHT / 2 - 30)
+    return list(zip(np.clip(xs, 25, SCREEN_WIDTH - 25).tolist(), ys.tolist()))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--speed", type=float, default=5.0, help="wizard pixels per tick")
+    args = parser.parse_args()
+
+    backend = SurfaceBackend((SCREEN_WIDTH, SCREEN_HEIGHT))
+    level = default_level()
+    visibility = Visibility(level)
+    path = walk(visibility, args.steps, args.speed)
+
+    samples = []
+    for x, y in path:
+        start = time.perf_counter()
+        if visibility.update(x, y):
+            samples.append((time.perf_counter() - start) * 1000)
+    print(f"recompute: {len(samples)} of {len(path)} ticks, "
+          f"mean {np.mean(samples):.2f} ms, max {np.max(samples):.2f} ms")
+
+    rng = np.random.default_rng(0)
+    for enemies in (100, 1000, 10000):
+        world = World(capacity=enemies)
+        world.spawn_many(Kind.ENEMY, enemies,
+                         position=(rng.uniform(0, SCREEN_WIDTH, enemies),
+                                   rng.uniform(0, SCREEN_HEIGHT, enemies)),
+                         sight=np.nan)
+        visibility.reset()
+        sight = SightSystem(visibility)
+        start = time.perf_counter()
+        for x, y in path:
+            visibility.update(x, y)
+            sight.target = (x, y)
+            sight.run(world)
+            visibility.overlay.draw(backend, visibility.fog, visibility.tile_size)
+        per_tick = (time.perf_counter() - start) * 1000 / len(path)
+        status = "✓" if per_tick <= TARGET_TICK_MS else "✗"
+        print(f"{status} {enemies:6d} enemies: {per_tick:.3f} ms/tick sight + fog "
+              f"(target {TARGET_TICK_MS} ms)")
+
+if __name__ == "__main__":
+    main()
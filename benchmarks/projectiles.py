@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Wizard projectile benchmark.
+Casts spells as fast as their cooldowns allow and times casting, the motion,
+lifetime and culling systems, and the batched projectile draw per frame:
+first Magic Missile spam on its own, then every fan spell on top of it.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from ecs import World, Kind, Scheduler, MovementSystem, LifetimeSystem, CullSystem
+from spells import SpellManager, SpellType, projectile_batches, draw_projectiles
+from render_backend import SurfaceBackend
+
+# Per-frame budget in milliseconds for everything projectiles cost
+TARGET_FRAME_MS = 0.5
+
+SCENARIOS = {
+    "magic missile": [SpellType.MAGIC_MISSILE],
+    "every spell": [SpellType.MAGIC_MISSILE, SpellType.FIREBALL, SpellType.LIGHTNING,
+                    SpellType.ICE_SHARD, SpellType.ICE_STORM, SpellType.FIRE_NOVA],
+}
+
+def run(backend, spells, frames: int, rng: np.random.Generator):
+    world = World(bounds=backend.size)
+    scheduler = Scheduler([MovementSystem(), LifetimeSystem(), CullSystem()])
+    manager = SpellManager()
+    for spell_type in spells:
+        manager.unlock_spell(spell_type)
+    x, y = backend.size[0] / 2, backend.size[1] / 2
+    targets = rng.uniform((0, 0), backend.size, (frames, 2)).tolist()
+
+    timings = {"cast": 0.0, "systems": 0.0, "draw": 0.0}
+    live = 0
+    for target_x, target_y in targets:
+        backend.clear((0, 0, 0))
+        start = time.perf_counter()
+        for spell_type in spells:
+            manager.current_spell = spell_type
+            manager.cast_spell(world, x, y, target_x, target_y, mana=100)
+        manager.update_cooldowns()
+        cast = time.perf_counter()
+        scheduler.run(world)
+        moved = time.perf_counter()
+        draw_projectiles(backend, projectile_batches(world))
+        end = time.perf_counter()
+
+        timings["cast"] += cast - start
+        timings["systems"] += moved - cast
+        timings["draw"] += end - moved
+        live += world.count_of(Kind.PROJECTILE)
+    return timings, live / frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    backend = SurfaceBackend((1200, 800))
+    rng = np.random.default_rng(0)
+    for name, spells in SCENARIOS.items():
+        timings, live = run(backend, spells, args.frames, rng)
+        total = 0.0
+        print(f"{name}:")
+        for part, seconds in timings.items():
+            ms = seconds * 1000 / args.frames
+            total += ms
+            print(f"  {part:8s}: {ms:6.3f} ms/frame")
+        status = "✓" if total <= TARGET_FRAME_MS else "✗"
+        print(f"{status} {live:.0f} live projectiles: {total:.3f} ms/frame (target {TARGET_FRAME_MS} ms)")
+
+if __name__ == "__main__":
+    main()
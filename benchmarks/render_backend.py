@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Render backend benchmark.
+Renders the same busy frame (enemies, particles, bullets, spells with their
+light, fog and the HUD) through each render backend and times the draw
+submission plus present: pygame surfaces, SDL2 textures on the software
+renderer, and the null backend as the floor left for the simulation.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from game import Game, GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from game_objects import Enemy, EnemyType, emit_particles
+from ecs import Kind
+from spells import SpellType
+from render_backend import SurfaceBackend, RendererBackend, NullBackend
+
+FRAME_BUDGET_MS = 1000 / 60
+
+BACKENDS = {
+    "surface": lambda size: SurfaceBackend(size),
+    "sdl2 software": lambda size: RendererBackend(size, accelerated=False),
+    "null": lambda size: NullBackend(size),
+}
+
+def busy_game(backend, enemies: int, particles: int, bullets: int, scale: float) -> Game:
+    game = Game(audio=False, backend=backend, render_scale=scale)
+    game.state = GameState.PLAYING
+    rng = random.Random(0)
+    for _ in range(enemies):
+        Enemy(game.world, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+              rng.choice(list(EnemyType)))
+    xs = [rng.uniform(0, SCREEN_WIDTH) for _ in range(particles)]
+    ys = [rng.uniform(0, SCREEN_HEIGHT) for _ in range(particles)]
+    emit_particles(game.world, Kind.PARTICLE, xs, ys, particles, (255, 165, 0), 10 ** 9, spread=0)
+    angles = np.random.default_rng(0).uniform(0, 2 * np.pi, bullets)
+    game.bullets.emit(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, angles, 0)
+    for _ in range(60):
+        game.bullets.x[:len(game.bullets)] += np.cos(angles[:len(game.bullets)]) * 6
+        game.bullets.y[:len(game.bullets)] += np.sin(angles[:len(game.bullets)]) * 6
+    wizard = game.wizard
+    for spell_type in (SpellType.FIRE_NOVA, SpellType.LIGHTNING, SpellType.ICE_SHARD):
+        wizard.unlock_spell(spell_type)
+        wizard.current_spell = spell_type
+        wizard.mana = wizard.max_mana
+        wizard.cast_spell(SCREEN_WIDTH, SCREEN_HEIGHT / 2)
+    if game.visibility:
+        game.visibility.update(wizard.x, wizard.y)
+    return game
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--enemies", type=int, default=300)
+    parser.add_argument("--particles", type=int, default=500)
+    parser.add_argument("--bullets", type=int, default=3000)
+    parser.add_argument("--scale", type=float, default=1.0, help="world render scale")
+    args = parser.parse_args()
+
+    for name, create in BACKENDS.items():
+        backend = create((SCREEN_WIDTH, SCREEN_HEIGHT))
+        game = busy_game(backend, args.enemies, args.particles, args.bullets, args.scale)
+        for _ in range(20):  # upload textures and fill sprite caches
+            game.render(game.snapshot())
+        # A fresh snapshot per frame, as in the game, so changing sprites
+        # (light, fog) are re-uploaded where a backend keeps textures
+        elapsed = 0.0
+        for _ in range(args.frames):
+            snapshot = game.snapshot()
+            start = time.perf_counter()
+            game.render(snapshot)
+            elapsed += time.perf_counter() - start
+        ms = elapsed * 1000 / args.frames
+        status = "✓" if ms <= FRAME_BUDGET_MS else "✗"
+        print(f"{status} {name:14s}: {ms:6.2f} ms/frame draw + present (budget {FRAME_BUDGET_MS:.1f} ms)")
+        backend.close()
+
+if __name__ == "__main__":
+    main()
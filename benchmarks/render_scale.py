@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Render scale benchmark.
+Times draw_game for a busy frame with the world rendered at full, 0.75x and
+0.5x resolution and upscaled to the window, HUD included.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+
+from game import Game, GameState, RENDER_SCALES, SCREEN_WIDTH, SCREEN_HEIGHT
+from game_objects import Enemy, EnemyType, emit_particles
+from ecs import Kind
+
+FRAME_BUDGET_MS = 1000 / 60
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--enemies", type=int, default=300)
+    parser.add_argument("--particles", type=int, default=500)
+    parser.add_argument("--bullets", type=int, default=3000)
+    parser.add_argument("--scales", type=float, nargs="+", default=list(RENDER_SCALES))
+    args = parser.parse_args()
+    
+    game = Game(audio=False)
+    game.state = GameState.PLAYING
+    rng = random.Random(0)
+    for _ in range(args.enemies):
+        Enemy(game.world, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+              rng.choice(list(EnemyType)))
+    xs = [rng.uniform(0, SCREEN_WIDTH) for _ in range(args.particles)]
+    ys = [rng.uniform(0, SCREEN_HEIGHT) for _ in range(args.particles)]
+    emit_particles(game.world, Kind.PARTICLE, xs, ys, args.particles, (255, 165, 0), 10 ** 9, spread=0)
+    angles = np.random.default_rng(0).uniform(0, 2 * np.pi, args.bullets)
+    game.bullets.emit(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, angles, 0)
+    for _ in range(60):
+        game.bullets.x[:len(game.bullets)] += np.cos(angles[:len(game.bullets)]) * 6
+        game.bullets.y[:len(game.bullets)] += np.sin(angles[:len(game.bullets)]) * 6
+    
+    for scale in args.scales:
+        game.render_scale = scale
+        snapshot = game.snapshot()
+        for _ in range(20):  # allocate this scale's surfaces and sprites, warm up
+            game.draw_game(snapshot)
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            game.draw_game(snapshot)
+        ms = (time.perf_counter() - start) * 1000 / args.frames
+        status = "✓" if ms <= FRAME_BUDGET_MS else "✗"
+        print(f"{status} scale {scale:.2f}: {ms:6.2f} ms/frame draw (budget {FRAME_BUDGET_MS:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Startup and restart benchmark.
+Measures time-to-first-frame for a fresh interpreter and the cost of restarting a run.
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+# Targets in milliseconds
+TARGET_FIRST_FRAME_MS = 500
+TARGET_RESTART_MS = 5
+
+FIRST_FRAME_SCRIPT = """
+import sys, time
+sys.path.insert(0, {src!r})
+from game import Game
+game = Game()
+game.draw()
+print(time.time())
+"""
+
+def measure_first_frame(runs: int) -> float:
+    script = FIRST_FRAME_SCRIPT.format(src=SRC_DIR)
+    samples = []
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                check=True).stdout
+        samples.append((float(output.split()[-1]) - start) * 1000)
+    return min(samples)
+
+def measure_restart(runs: int) -> float:
+    from game import Game, GameState
+    
+    game = Game()
+    game.draw()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        game.reset()
+        game.state = GameState.PLAYING
+        game.draw()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def report(name: str, value: float, target: float):
+    status = "✓" if value <= target else "✗"
+    print(f"{status} {name}: {value:.1f} ms (target {target} ms)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--window", action="store_true", help="use a real window instead of SDL's dummy driver")
+    args = parser.parse_args()
+    
+    if not args.window:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    
+    report("Time to first frame", measure_first_frame(args.runs), TARGET_FIRST_FRAME_MS)
+    report("Restart", measure_restart(args.runs * 10), TARGET_RESTART_MS)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Swarm scaling benchmark.
+Steps headless swarms of 10k-100k enemies with 1..N worker processes and prints
+the tick time and speedup over a single worker for each combination.
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+from swarm import Swarm
+from game import SCREEN_WIDTH, SCREEN_HEIGHT, LEVEL_WALLS
+
+def measure(enemies, workers, ticks):
+    swarm = Swarm(enemies, workers, (SCREEN_WIDTH, SCREEN_HEIGHT), LEVEL_WALLS, seed=0)
+    try:
+        swarm.spawn(enemies)
+        swarm.step(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)  # warm up the workers and flow field
+
+        # Circle the target so the flow field is rebuilt as it would be in play
+        start = time.perf_counter()
+        for tick in range(ticks):
+            swarm.step(SCREEN_WIDTH / 2 + 200 * (tick % 60 < 30), SCREEN_HEIGHT / 2)
+        return (time.perf_counter() - start) * 1000 / ticks
+    finally:
+        swarm.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, nargs="+", default=[10000, 25000, 50000, 100000])
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'enemies':>8s} {'workers':>8s} {'ms/tick':>8s} {'ticks/s':>8s} {'speedup':>8s}")
+    for enemies in args.enemies:
+        baseline = None
+        for workers in range(0, args.max_workers + 1):
+            ms = measure(enemies, workers, args.ticks)
+            if workers == 1:
+                baseline = ms
+            speedup = f"{baseline / ms:7.2f}x" if baseline else f"{'-':>8s}"
+            label = str(workers) if workers else "inline"
+            print(f"{enemies:8d} {label:>8s} {ms:8.2f} {1000 / ms:8.0f} {speedup}")
+
+if __name__ == "__main__":
+    main()
@@ -6,19 +6,18 @@ Simple launcher script to start the game with proper setup.
 
 import sys
 import os
-import subprocess
+import importlib.util
 
 def check_dependencies():
     """Check if required dependencies are installed."""
-    try:
-        import pygame
-        import numpy
-        print("✓ All dependencies are installed!")
-        return True
-    except ImportError as e:
-        print(f"✗ Missing dependency: {e}")
+    # Locate the packages without importing them; the game imports them itself
+    missing = [name for name in ("pygame", "numpy") if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"✗ Missing dependency: {', '.join(missing)}")
         print("Please install dependencies with: pip install -r requirements.txt")
         return False
+    print("✓ All dependencies are installed!")
+    return True
 
 def main():
     print("=" * 50)
@@ -46,8 +45,10 @@ def main():
     print("\n" + "=" * 50)
     
     try:
-        # Run the game
-        subprocess.run([sys.executable, "src/main.py"])
+        # Run the game in this interpreter
+        sys.path.insert(0, os.path.abspath("src"))
+        from main import main as run
+        run(sys.argv[1:])
     except KeyboardInterrupt:
         print("\n👋 Game stopped by user")
     except Exception as e:
@@ -0,0 +1,164 @@
+import math
+import numpy as np
+from typing import Dict, List, NamedTuple, Sequence
+
+from ecs import ChaseSystem, World
+
+class AITier(NamedTuple):
+    name: str
+    distance: float  # enemies up to this far from the wizard, in pixels
+    interval: int    # ticks between steering updates
+
+# Nearby enemies steer every tick, distant ones every few ticks
+AI_TIERS = (
+    AITier("near", 300, 1),
+    AITier("mid", 700, 4),
+    AITier("far", math.inf, 12),
+)
+
+# Steering updates per tick, across all tiers; over budget, this many times
+# the budget left after the near tier is ranked among the other due enemies,
+# and at least 1 / (AI_WINDOW + 1) of the budget is kept for them
+AI_BUDGET = 512
+AI_WINDOW = 4
+
+class AIScheduler(ChaseSystem):
+    """Chase steering time-sliced by distance from the wizard, under a budget.
+
+    Each entity with the think component carries its own schedule: the tick it
+    is next due and its current interval. A tick finds the due entities with
+    one comparison, steers at most ``budget`` of them, and reschedules each by
+    the tier of its distance from the wizard at that moment. Everyone else keeps
+    moving along their last heading, so the per-tick cost beyond that comparison
+    is bounded by the budget. Over budget, the enemies now in the near tier are
+    steered first, every tick; if they alone overflow what the budget leaves
+    them they take turns round-robin. The rest of the budget, never less than
+    a ``1 / (AI_WINDOW + 1)`` share while any are due, goes to the other due
+    enemies, most overdue first with lateness measured in intervals, ranked
+    within a window that rotates through them, so the mid and far tiers fall
+    behind under a near-tier crush but are never starved. Newcomers are due at once, and their second update is
+    offset by their id so a wave spawned on one tick spreads round-robin over
+    the interval.
+
+    ``stats`` counts ticks, updates, due enemies and enemies deferred by the
+    budget; ``budget_use()``, ``tier_rates()`` and ``summary()`` summarize them.
+    """
+    reads = ChaseSystem.reads | {"think"}
+    writes = ChaseSystem.writes | {"think"}
+
+    def __init__(self, budget: int = AI_BUDGET, tiers: Sequence[AITier] = AI_TIERS):
+        super().__init__()
+        self.budget = budget
+        self.tiers = tuple(tiers)
+        self.tick = 0
+        self._cursor = 0
+        self._near_cursor = 0
+        self._limits_sq = np.array([tier.distance for tier in self.tiers[:-1]], dtype=np.float64) ** 2
+        self._intervals = np.array([tier.interval for tier in self.tiers], dtype=np.float64)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"ticks": 0, "updates": 0, "due": 0, "deferred": 0, "peak_updates": 0}
+        self._tier_updates = np.zeros(len(self.tiers), dtype=np.int64)
+        self._tier_gaps = np.zeros(len(self.tiers), dtype=np.float64)  # ticks since each one's last update
+
+    def run(self, world: World):
+        tick = self.tick
+        self.tick += 1
+        self.stats["ticks"] += 1
+        rows = world.select("position", "velocity", "chase", "think")
+        c = world.columns
+        # Read as a slice when the rows are contiguous, as they are when enemies
+        # are packed together in the columns; gathered otherwise
+        index = slice(rows[0], rows[-1] + 1) if len(rows) and rows[-1] + 1 - rows[0] == len(rows) else rows
+        is_due = c["think_at"][index] <= tick
+        deferred = max(0, np.count_nonzero(is_due) - self.budget)
+        if deferred:
+            due = self.choose(world, rows, index, is_due, tick)
+        else:
+            due = rows[is_due]
+        self.stats["due"] += len(due) + deferred
+        self.stats["deferred"] += deferred
+        if not len(due):
+            return
+        self.steer(world, due)
+
+        # Reschedule by the current distance tier
+        dx = c["x"][due] - self.target[0]
+        dy = c["y"][due] - self.target[1]
+        distance_sq = dx * dx + dy * dy
+        tier = np.zeros(len(due), dtype=np.intp)
+        for limit in self._limits_sq:
+            tier += distance_sq > limit
+        interval = self._intervals[tier]
+        think_at = c["think_at"][due]
+        newcomers = np.isinf(think_at)
+        gaps = tick - (think_at - c["think_every"][due])
+        c["think_every"][due] = interval
+        c["think_at"][due] = tick + np.where(newcomers, 1 + world.ids[due] % interval, interval)
+
+        stats = self.stats
+        stats["updates"] += len(due)
+        stats["peak_updates"] = max(stats["peak_updates"], len(due))
+        self._tier_updates += np.bincount(tier[~newcomers], minlength=len(self.tiers))
+        self._tier_gaps += np.bincount(tier[~newcomers], gaps[~newcomers], minlength=len(self.tiers))
+
+    def choose(self, world: World, rows: np.ndarray, index, is_due: np.ndarray, tick: int) -> np.ndarray:
+        # The budget's worth of the due rows: those now within the near tier
+        # first, then the most overdue of the rest. ``index`` reads ``rows``
+        # from the columns and ``is_due`` marks the due ones among them
+        c = world.columns
+        budget = self.budget
+        if len(self._limits_sq):
+            # In place; this runs over every row
+            distance_sq = c["x"][index] - self.target[0]
+            distance_sq *= distance_sq
+            dy = c["y"][index] - self.target[1]
+            dy *= dy
+            distance_sq += dy
+            closer = distance_sq <= self._limits_sq[0]
+        else:
+            closer = np.ones(len(rows), dtype=bool)
+        # Positions then take(): a boolean index over a mixed mask is several times slower
+        near = rows.take(np.flatnonzero(is_due & closer))
+        rest = rows.take(np.flatnonzero(is_due & ~closer))
+        # Keep a share for the rest, so distant enemies still get their turn
+        share = budget - min(len(rest), budget // (AI_WINDOW + 1))
+        if len(near) > share:
+            # Too many near enemies: they take turns
+            start = self._near_cursor % len(near)
+            self._near_cursor = start + share
+            near = np.take(near, np.arange(start, start + share), mode="wrap")
+        spare = budget - len(near)
+        if not spare or not len(rest):
+            return near
+
+        # Rank a rotating window of the rest, not all of them
+        start = self._cursor % len(rest)
+        window = np.take(rest, np.arange(start, start + min(len(rest), AI_WINDOW * spare)), mode="wrap")
+        self._cursor = start + len(window)
+        if len(window) > spare:
+            lateness = (tick - c["think_at"][window]) / c["think_every"][window]
+            window = window[np.argpartition(-lateness, spare - 1)[:spare]]
+        return np.concatenate([near, window])
+
+    def budget_use(self) -> float:
+        # Mean fraction of the budget spent per tick
+        ticks = self.stats["ticks"]
+        return self.stats["updates"] / (ticks * self.budget) if ticks and self.budget else 0.0
+
+    def tier_rates(self) -> Dict[str, float]:
+        # Steering updates per enemy per tick in each tier, from the gaps between
+        # updates; 1.0 is every tick
+        return {tier.name: updates / gaps if gaps else 0.0
+                for tier, updates, gaps in zip(self.tiers, self._tier_updates.tolist(),
+                                               self._tier_gaps.tolist())}
+
+    def summary(self) -> List[str]:
+        stats = self.stats
+        if not stats["ticks"]:
+            return []
+        rates = ", ".join(f"{name} {rate:.2f}" for name, rate in self.tier_rates().items())
+        return [f"AI budget {self.budget}/tick: {self.budget_use():.0%} used on average, "
+                f"peak {stats['peak_updates']}, {stats['deferred']} of {stats['due']} due updates deferred",
+                f"AI updates per enemy per tick: {rates}"]
@@ -0,0 +1,151 @@
+import logging
+import numpy as np
+import pygame
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SoundSpec(NamedTuple):
+    priority: int       # higher priority sounds may take a channel from lower ones
+    max_voices: int     # simultaneous plays of this sound
+    min_interval: int   # frames between plays of this sound
+    volume: float
+    # Synthesis parameters: a pitch sweep with optional noise and a decaying envelope
+    start_hz: float
+    end_hz: float
+    duration: float
+    noise: float
+
+
+SOUNDS: Dict[str, SoundSpec] = {
+    "cast": SoundSpec(2, 3, 3, 0.35, 660, 880, 0.12, 0.1),
+    "hit": SoundSpec(1, 4, 2, 0.3, 220, 110, 0.08, 0.6),
+    "kill": SoundSpec(3, 3, 2, 0.45, 330, 80, 0.25, 0.4),
+    "hurt": SoundSpec(4, 1, 10, 0.6, 140, 70, 0.3, 0.3),
+    "pickup": SoundSpec(3, 2, 0, 0.5, 520, 1040, 0.2, 0.0),
+    "level_up": SoundSpec(5, 1, 0, 0.6, 440, 1320, 0.5, 0.0),
+    "boss": SoundSpec(5, 1, 0, 0.7, 90, 45, 1.0, 0.2),
+    "door": SoundSpec(4, 1, 30, 0.5, 300, 600, 0.3, 0.05),
+}
+
+
+def synthesize(spec: SoundSpec, rate: int, seed: int = 0) -> np.ndarray:
+    samples = max(1, int(spec.duration * rate))
+    t = np.arange(samples) / rate
+    freq = np.linspace(spec.start_hz, spec.end_hz, samples)
+    phase = 2 * np.pi * np.cumsum(freq) / rate
+    wave = np.sign(np.sin(phase)) * 0.5 + np.sin(phase) * 0.5
+    if spec.noise:
+        rng = np.random.default_rng(seed)
+        wave = wave * (1 - spec.noise) + rng.uniform(-1, 1, samples) * spec.noise
+    envelope = np.exp(-5 * t / spec.duration)
+    return wave * envelope
+
+
+class AudioManager:
+    """Sound effects played through a fixed pool of mixer channels.
+
+    Every sample is synthesized and converted to a ``pygame.mixer.Sound`` once at
+    startup. Game code calls ``trigger()`` as often as it likes; identical
+    triggers within a frame are merged into one play, and ``update()`` (once per
+    frame) plays the merged events in priority order, subject to each sound's
+    voice cap and minimum interval. Nothing here waits on the audio device.
+    When no audio device is available the manager stays silent.
+    """
+
+    def __init__(self, enabled: bool = True, channels: int = 16, frequency: int = 22050):
+        self.enabled = False
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.stats = {"triggered": 0, "merged": 0, "played": 0, "throttled": 0, "dropped": 0}
+
+        self._pending: Dict[str, int] = {}
+        self._last_played: Dict[str, int] = {}
+        self._frame = 0
+        self._channels: List[pygame.mixer.Channel] = []
+        self._owners: List[Optional[str]] = []
+
+        if not enabled:
+            return
+        try:
+            pygame.mixer.init(frequency=frequency, size=-16, buffer=512)
+        except pygame.error as e:
+            logger.info("Audio disabled: %s", e)
+            return
+
+        rate, _, mixer_channels = pygame.mixer.get_init()
+        for seed, (name, spec) in enumerate(SOUNDS.items()):
+            wave = (synthesize(spec, rate, seed) * spec.volume * 32767).astype(np.int16)
+            if mixer_channels > 1:
+                wave = np.repeat(wave[:, None], mixer_channels, axis=1)
+            self.sounds[name] = pygame.sndarray.make_sound(np.ascontiguousarray(wave))
+
+        pygame.mixer.set_num_channels(channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self._owners = [None] * channels
+        self.enabled = True
+
+    def trigger(self, name: str):
+        if not self.enabled:
+            return
+        self.stats["triggered"] += 1
+        count = self._pending.get(name, 0)
+        if count:
+            self.stats["merged"] += 1
+        self._pending[name] = count + 1
+
+    def update(self):
+        if not self.enabled:
+            return
+        self._frame += 1
+        if not self._pending:
+            return
+
+        for name in sorted(self._pending, key=lambda n: SOUNDS[n].priority, reverse=True):
+            spec = SOUNDS[name]
+            last = self._last_played.get(name)
+            if last is not None and self._frame - last < spec.min_interval:
+                self.stats["throttled"] += 1
+                continue
+            if self._voices(name) >= spec.max_voices:
+                self.stats["throttled"] += 1
+                continue
+
+            channel = self._claim_channel(spec.priority)
+            if channel is None:
+                self.stats["dropped"] += 1
+                continue
+
+            # Merged triggers play once, a little louder
+            merged = self._pending[name]
+            self._channels[channel].set_volume(min(1.0, 0.7 + 0.1 * merged))
+            self._channels[channel].play(self.sounds[name])
+            self._owners[channel] = name
+            self._last_played[name] = self._frame
+            self.stats["played"] += 1
+
+        self._pending.clear()
+
+    def _voices(self, name: str) -> int:
+        return sum(1 for channel, owner in zip(self._channels, self._owners)
+                   if owner == name and channel.get_busy())
+
+    def _claim_channel(self, priority: int) -> Optional[int]:
+        # A free channel, else the busy one with the lowest priority below ours
+        steal = None
+        steal_priority = priority
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return i
+            owner_priority = SOUNDS[self._owners[i]].priority if self._owners[i] else 0
+            if owner_priority < steal_priority:
+                steal = i
+                steal_priority = owner_priority
+        if steal is not None:
+            self._channels[steal].stop()
+        return steal
+
+    def close(self):
+        if self.enabled:
+            pygame.mixer.quit()
+            self.enabled = False
@@ -0,0 +1,242 @@
+import math
+from abc import ABC, abstractmethod
+import numpy as np
+import pygame
+from typing import List, NamedTuple, Tuple
+
+# Bullet looks, indexed by style: (radius, color)
+BULLET_STYLES = [
+    (5, (255, 80, 80)),     # red orb
+    (4, (255, 0, 255)),     # magenta pellet
+    (7, (255, 200, 60)),    # large amber orb
+    (3, (200, 200, 255)),   # small needle
+]
+
+_sprites = {}
+
+
+def bullet_sprite(style: int, scale: float = 1.0) -> pygame.Surface:
+    # Pre-rendered once per style and render scale so drawing is a plain blit
+    sprite = _sprites.get((style, scale))
+    if sprite is None:
+        radius, color = BULLET_STYLES[style]
+        radius = max(1, round(radius * scale))
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        pygame.draw.circle(sprite, (255, 255, 255), (radius, radius), max(1, radius // 2))
+        _sprites[(style, scale)] = sprite
+    return sprite
+
+
+class BulletBatch(NamedTuple):
+    style: int
+    positions: np.ndarray  # (n, 2) int32 top-left blit positions
+
+
+class BulletPool:
+    """Enemy bullets stored as parallel arrays.
+
+    Live bullets are kept packed in ``[0, count)``, so motion, lifetime, culling
+    and the wizard hit test are each a single vectorized pass, however many
+    bullets are in flight. Bullets that don't fit in ``capacity`` are dropped.
+    """
+
+    def __init__(self, capacity: int = 8192, bounds: Tuple[int, int] = (1200, 800), margin: int = 20):
+        self.capacity = capacity
+        self.bounds = bounds
+        self.margin = margin
+        self.count = 0
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.style = np.zeros(capacity, dtype=np.int8)
+        self.damage = np.zeros(capacity, dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+
+        self._style_radius = np.array([radius for radius, _ in BULLET_STYLES], dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x: float, y: float, angles: np.ndarray, speeds, style: int = 0,
+             damage: float = 5, lifetime: int = 600):
+        n = min(len(angles), self.capacity - self.count)
+        if n <= 0:
+            return
+        angles = angles[:n]
+        s = slice(self.count, self.count + n)
+        speeds = np.broadcast_to(speeds, (len(angles),))
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = np.cos(angles) * speeds
+        self.vy[s] = np.sin(angles) * speeds
+        self.life[s] = lifetime
+        self.style[s] = style
+        self.damage[s] = damage
+        self.radius[s] = self._style_radius[style]
+        self.count += n
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        x += self.vx[:n]
+        y += self.vy[:n]
+        self.life[:n] -= 1
+
+        width, height = self.bounds
+        m = self.margin
+        keep = (self.life[:n] > 0) & (x > -m) & (x < width + m) & (y > -m) & (y < height + m)
+        self._compact(keep)
+
+    def collide(self, cx: float, cy: float, radius: float) -> float:
+        # Remove bullets touching the circle and return the damage they carry
+        n = self.count
+        if not n:
+            return 0.0
+        dx = self.x[:n] - cx
+        dy = self.y[:n] - cy
+        reach = self.radius[:n] + radius
+        hit = dx * dx + dy * dy < reach * reach
+        if not hit.any():
+            return 0.0
+        damage = float(self.damage[:n][hit].sum())
+        self._compact(~hit)
+        return damage
+
+    def _compact(self, keep: np.ndarray):
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        for arr in (self.x, self.y, self.vx, self.vy, self.life, self.style, self.damage, self.radius):
+            arr[:kept] = arr[:n][keep]
+        self.count = kept
+
+    def batches(self) -> Tuple[BulletBatch, ...]:
+        # Copy of the live bullets grouped by style, ready for draw_bullets
+        n = self.count
+        if not n:
+            return ()
+        styles = self.style[:n]
+        radius = self.radius[:n]
+        left = (self.x[:n] - radius).astype(np.int32)
+        top = (self.y[:n] - radius).astype(np.int32)
+        batches = []
+        for style in np.unique(styles):
+            mask = styles == style
+            positions = np.stack((left[mask], top[mask]), axis=1)
+            positions.flags.writeable = False
+            batches.append(BulletBatch(int(style), positions))
+        return tuple(batches)
+
+
+def draw_bullets(backend, batches: Tuple[BulletBatch, ...], scale: float = 1.0):
+    # One blits() submission per style
+    for style, positions in batches:
+        sprite = bullet_sprite(style, scale)
+        if scale != 1.0:
+            positions = (positions * scale).astype(np.int32)
+        backend.blits([(sprite, position) for position in positions.tolist()])
+
+
+class Emitter(ABC):
+    """Fires a bullet pattern into a pool every ``interval`` frames."""
+
+    def __init__(self, interval: int, speed: float = 3.0, style: int = 0, damage: float = 5,
+                 lifetime: int = 600):
+        self.interval = interval
+        self.speed = speed
+        self.style = style
+        self.damage = damage
+        self.lifetime = lifetime
+        self.timer = 0
+        self.shots = 0
+
+    def update(self, pool: BulletPool, x: float, y: float, target_x: float, target_y: float):
+        self.timer += 1
+        if self.timer < self.interval:
+            return
+        self.timer = 0
+        angles, speeds = self.pattern(x, y, target_x, target_y)
+        pool.emit(x, y, angles, speeds, self.style, self.damage, self.lifetime)
+        self.shots += 1
+
+    @abstractmethod
+    def pattern(self, x: float, y: float, target_x: float, target_y: float):
+        # (angles, speeds) of one volley; speeds may be a scalar
+        pass
+
+
+class RingEmitter(Emitter):
+    # Evenly spaced bullets in every direction, rotated a little each volley
+    def __init__(self, interval: int, count: int = 24, rotation: float = 0.1, **kwargs):
+        super().__init__(interval, **kwargs)
+        self.count = count
+        self.rotation = rotation
+
+    def pattern(self, x, y, target_x, target_y):
+        angles = np.arange(self.count) * (2 * math.pi / self.count) + self.shots * self.rotation
+        return angles, self.speed
+
+
+class SpiralEmitter(Emitter):
+    # A few arms that sweep around steadily, firing every few frames
+    def __init__(self, interval: int, arms: int = 3, turn: float = 0.25, **kwargs):
+        super().__init__(interval, **kwargs)
+        self.arms = arms
+        self.turn = turn
+
+    def pattern(self, x, y, target_x, target_y):
+        angles = np.arange(self.arms) * (2 * math.pi / self.arms) + self.shots * self.turn
+        return angles, self.speed
+
+
+class AimedEmitter(Emitter):
+    # A fan aimed at the target, with the outer bullets slightly slower
+    def __init__(self, interval: int, count: int = 5, spread: float = 0.5, **kwargs):
+        super().__init__(interval, **kwargs)
+        self.count = count
+        self.spread = spread
+
+    def pattern(self, x, y, target_x, target_y):
+        aim = math.atan2(target_y - y, target_x - x)
+        offsets = np.linspace(-self.spread / 2, self.spread / 2, self.count)
+        speeds = self.speed * (1 - 0.3 * np.abs(offsets) / max(self.spread, 1e-9))
+        return aim + offsets, speeds
+
+
+class WaveEmitter(Emitter):
+    # Streams whose heading swings back and forth around the target
+    def __init__(self, interval: int, streams: int = 4, amplitude: float = 0.8,
+                 frequency: float = 0.15, **kwargs):
+        super().__init__(interval, **kwargs)
+        self.streams = streams
+        self.amplitude = amplitude
+        self.frequency = frequency
+
+    def pattern(self, x, y, target_x, target_y):
+        aim = math.atan2(target_y - y, target_x - x)
+        swing = self.amplitude * math.sin(self.shots * self.frequency)
+        angles = aim + swing + np.arange(self.streams) * (2 * math.pi / self.streams)
+        return angles, self.speed
+
+
+def boss_phases() -> List[Tuple[float, List[Emitter]]]:
+    # Fresh emitters for one boss: (health ratio the phase starts below, emitters)
+    return [
+        (1.01, [RingEmitter(45, count=24, speed=2.5, style=0),
+                AimedEmitter(60, count=5, spread=0.6, speed=4.0, style=1)]),
+        (0.66, [SpiralEmitter(4, arms=4, turn=0.21, speed=3.0, style=3),
+                AimedEmitter(50, count=7, spread=0.8, speed=4.5, style=1)]),
+        (0.33, [SpiralEmitter(3, arms=5, turn=-0.17, speed=3.5, style=3),
+                WaveEmitter(6, streams=6, speed=3.0, style=2),
+                RingEmitter(40, count=36, speed=2.0, style=0)]),
+    ]
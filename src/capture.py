@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Tuple
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FORMATS = ("bmp", "png", "jpg", "tga")
+
+
+class FrameCapture:
+    """Records presented frames to a numbered image sequence without stalling the game.
+
+    ``capture()`` copies the display into one of ``buffers`` surfaces allocated
+    up front and queues it; a writer thread encodes and saves queued frames and
+    hands the surfaces back. When every buffer is still waiting to be written
+    the frame is dropped and counted instead of blocking. Time spent in
+    ``capture()`` on the calling thread is accumulated in ``overhead_ms``.
+    """
+
+    def __init__(self, directory: str, size: Tuple[int, int], buffers: int = 8, every: int = 1,
+                 image_format: str = "bmp"):
+        if image_format not in CAPTURE_FORMATS:
+            raise ValueError(f"image_format must be one of {CAPTURE_FORMATS}")
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.every = every
+        self.image_format = image_format
+        self.frames_seen = 0
+        self.frames_captured = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.overhead_ms = 0.0
+
+        self._buffers = [pygame.Surface(size) for _ in range(buffers)]
+        self._free = deque(range(buffers))
+        self._queued = deque()  # (buffer index, sequence number)
+        self._ready = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop, name="capture", daemon=True)
+        self._thread.start()
+
+    def capture(self, surface: pygame.Surface):
+        start = time.perf_counter()
+        self.frames_seen += 1
+        if (self.frames_seen - 1) % self.every:
+            return
+        with self._ready:
+            index = self._free.popleft() if self._free else None
+        if index is None:
+            self.frames_dropped += 1
+        else:
+            self._buffers[index].blit(surface, (0, 0))
+            with self._ready:
+                self._queued.append((index, self.frames_captured))
+                self._ready.notify()
+            self.frames_captured += 1
+        self.overhead_ms += (time.perf_counter() - start) * 1000
+
+    def _write_loop(self):
+        while True:
+            with self._ready:
+                self._ready.wait_for(lambda: self._queued or not self._running)
+                if not self._queued:
+                    return
+                index, number = self._queued.popleft()
+
+            path = os.path.join(self.directory, f"frame_{number:06d}.{self.image_format}")
+            try:
+                pygame.image.save(self._buffers[index], path)
+                self.frames_written += 1
+            except (pygame.error, OSError) as e:
+                logger.warning("Could not write %s: %s", path, e)
+
+            with self._ready:
+                self._free.append(index)
+
+    def close(self):
+        # Write out everything already queued, then stop the writer
+        if self._thread is None:
+            return
+        with self._ready:
+            self._running = False
+            self._ready.notify_all()
+        self._thread.join()
+        self._thread = None
+        per_frame = self.overhead_ms / max(1, self.frames_seen)
+        logger.info("Captured %d frames to %s (%d dropped, %.2f ms/frame on the game thread)",
+                    self.frames_written, self.directory, self.frames_dropped, per_frame)
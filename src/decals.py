@@ -0,0 +1,175 @@
+import random
+import numpy as np
+import pygame
+from enum import IntEnum
+from typing import NamedTuple, Tuple
+
+from spells import SpellType
+
+class Decal(IntEnum):
+    SCORCH = 0
+    FROST = 1
+    BLOOD = 2
+
+class DecalStyle(NamedTuple):
+    color: Tuple[int, int, int]
+    alpha: int      # opacity of each blob of the stamp
+    spread: float   # stamp radius as a multiple of the impact radius
+    blobs: int
+
+DECAL_STYLES = {
+    Decal.SCORCH: DecalStyle((90, 50, 25), 110, 2.0, 7),
+    Decal.FROST: DecalStyle((110, 160, 210), 80, 1.8, 5),
+    Decal.BLOOD: DecalStyle((120, 0, 0), 150, 1.3, 9),
+}
+
+# Ice leaves frost; fire, lightning and arcane hits scorch
+SPELL_DECALS = {
+    SpellType.ICE_SHARD: Decal.FROST,
+    SpellType.ICE_STORM: Decal.FROST,
+}
+
+# Pre-rendered shapes per decal type, picked by impact position
+DECAL_VARIANTS = 4
+
+# Largest impact radius a mark is sized from, so area spells don't paint the arena
+DECAL_MAX_RADIUS = 16
+
+# Brightness the ground keeps when the level changes, out of 255; 0 wipes it
+DECAL_FADE = 96
+
+GROUND = (0, 0, 0)
+
+def spell_decal(spell_type: SpellType) -> Decal:
+    return SPELL_DECALS.get(spell_type, Decal.SCORCH)
+
+_stamps = {}
+
+def decal_stamp(decal: Decal, variant: int, radius: int) -> pygame.Surface:
+    # Pre-rendered once per look (radius already scaled): overlapping soft blobs
+    # laid out by a generator seeded with the variant, so each variant always
+    # looks the same
+    key = (decal, variant, radius)
+    stamp = _stamps.get(key)
+    if stamp is None:
+        style = DECAL_STYLES[decal]
+        size = max(2, round(radius * style.spread))
+        stamp = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        rng = random.Random(variant * len(Decal) + decal)
+        color = (*style.color, style.alpha)
+        pygame.draw.circle(stamp, color, (size, size), max(1, size // 2))
+        for _ in range(style.blobs):
+            distance = rng.uniform(0.2, 0.6) * size
+            angle = rng.uniform(0, 2 * np.pi)
+            blob = max(1, round(rng.uniform(0.15, 0.4) * size))
+            pygame.draw.circle(stamp, color, (round(size + np.cos(angle) * distance),
+                                              round(size + np.sin(angle) * distance)), blob)
+        if decal == Decal.FROST:
+            # Crystal spikes
+            for spike in range(6):
+                angle = spike * np.pi / 3 + rng.uniform(-0.3, 0.3)
+                end = (round(size + np.cos(angle) * (size - 1)), round(size + np.sin(angle) * (size - 1)))
+                pygame.draw.line(stamp, (*style.color, style.alpha * 2), (size, size), end)
+        _stamps[key] = stamp
+    return stamp
+
+class DecalState(NamedTuple):
+    generation: int      # bumped every time the ground fades or is cleared
+    cleared: int         # generation of the last clear
+    keep: int            # brightness the latest fade kept, out of 255
+    stamps: np.ndarray   # (n, 5) float32 rows of this generation: decal, variant, x, y, radius
+
+class DecalLog:
+    """Marks left on the ground, recorded by the simulation.
+
+    Hits and kills append a row per mark; rows below the current count are
+    never written again and growing or fading moves to a fresh array, so
+    ``state()`` hands the renderer a read-only view instead of a copy, and a
+    ``DecalLayer`` stamps only the rows it hasn't seen yet. Nothing is ever
+    removed, so the marks of a whole wave cost the renderer nothing extra.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.generation = 0
+        self.cleared = 0
+        self.keep = DECAL_FADE
+        self._rows = np.empty((capacity, 5), dtype=np.float32)
+        self.count = 0
+
+    def stamp(self, decal: Decal, x: float, y: float, radius: float):
+        if self.count == len(self._rows):
+            rows = np.empty((len(self._rows) * 2, 5), dtype=np.float32)
+            rows[:self.count] = self._rows[:self.count]
+            self._rows = rows
+        variant = (int(x) * 7 + int(y) * 13) % DECAL_VARIANTS
+        self._rows[self.count] = (decal, variant, x, y, min(radius, DECAL_MAX_RADIUS))
+        self.count += 1
+
+    def fade(self, keep: int = DECAL_FADE):
+        # Dim everything stamped so far; new marks start a new generation
+        self.generation += 1
+        self.keep = keep
+        if keep <= 0:
+            self.cleared = self.generation
+        self._rows = np.empty((self.capacity, 5), dtype=np.float32)
+        self.count = 0
+
+    def clear(self):
+        self.fade(0)
+
+    def state(self) -> DecalState:
+        stamps = self._rows[:self.count]
+        stamps.flags.writeable = False
+        return DecalState(self.generation, self.cleared, self.keep, stamps)
+
+class DecalLayer:
+    """The ground, with every decal of the level baked in.
+
+    New stamps are blitted into a persistent surface once, with one blits()
+    call per frame that has any, and the surface is drawn as the world's background, so a frame
+    costs one background blit however many decals have piled up. The surface
+    follows the world render scale, resampling what is already on it when
+    the scale changes. Used only by whichever thread renders.
+    """
+
+    def __init__(self):
+        self.surface = None
+        self.generation = 0
+        self.applied = 0
+        self.version = object()  # new whenever the surface changes
+
+    def draw(self, backend, decals: DecalState, scale: float = 1.0):
+        ground = self.surface
+        size = backend.target_size
+        if ground is None or ground.get_size() != size:
+            resized = pygame.Surface(size)
+            if ground is None:
+                resized.fill(GROUND)
+            else:
+                pygame.transform.smoothscale(ground, size, resized)
+            ground = self.surface = resized
+            self.version = object()
+
+        if decals.generation != self.generation:
+            if decals.cleared > self.generation:
+                ground.fill(GROUND)
+            else:
+                ground.fill((decals.keep,) * 3, special_flags=pygame.BLEND_RGB_MULT)
+            self.generation = decals.generation
+            self.applied = 0
+            self.version = object()
+
+        stamps = decals.stamps
+        if len(stamps) > self.applied:
+            rows = stamps[self.applied:]
+            self.applied = len(stamps)
+            sprites = []
+            for decal, variant, x, y, radius in rows.tolist():
+                stamp = decal_stamp(Decal(int(decal)), int(variant), max(1, round(radius * scale)))
+                half = stamp.get_width() // 2
+                sprites.append((stamp, (round(x * scale) - half, round(y * scale) - half)))
+            ground.blits(sprites, doreturn=False)
+            self.version = object()
+
+        backend.sprite(ground, (0, 0), version=self.version)
@@ -0,0 +1,376 @@
+import time
+from abc import ABC, abstractmethod
+from enum import IntEnum
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class Kind(IntEnum):
+    WALL = 0
+    DOOR = 1
+    ENEMY = 2
+    PROJECTILE = 3
+    POWER_UP = 4
+    PARTICLE = 5
+    WIZARD_PARTICLE = 6
+    LIGHT = 7
+
+
+# Component name -> its fields: (column name, dtype, per-entity shape)
+COMPONENTS = {
+    "position": (("x", np.float64, ()), ("y", np.float64, ())),
+    "velocity": (("vx", np.float64, ()), ("vy", np.float64, ())),
+    "collider": (("radius", np.float64, ()),),
+    "extent": (("width", np.float64, ()), ("height", np.float64, ())),
+    "health": (("health", np.float64, ()), ("max_health", np.float64, ())),
+    "lifetime": (("life", np.int32, ()), ("max_life", np.int32, ())),
+    "renderable": (("color", np.uint8, (3,)),),
+    "chase": (("speed", np.float64, ()), ("hover", np.float64, ())),  # steer towards a target
+    "sight": (("seen_x", np.float64, ()), ("seen_y", np.float64, ())),  # chase where it was last seen
+    "spell": (("spell", np.int8, ()),),  # index into spells.SPELL_TYPES
+    "think": (("think_at", np.float64, ()), ("think_every", np.float64, ())),  # steering schedule in ticks
+    "cull": (),  # destroyed on leaving the world bounds
+}
+COMPONENT_BITS = {name: 1 << i for i, name in enumerate(COMPONENTS)}
+
+
+class World:
+    """Entities stored as dense component columns.
+
+    Every component field is a column indexed by row, and live rows are kept
+    packed in ``[0, count)`` with a bitmask of the components each row has, so a
+    system selects its rows with one mask test and updates them in bulk.
+    Entity ids stay stable while rows move; ids are recycled with a new
+    generation so stale handles are detected. ``destroy_rows()`` only marks rows,
+    and ``flush()`` (run by the scheduler after the last system) compacts them
+    away in one pass, so rows never move while systems are running.
+    """
+
+    def __init__(self, capacity: int = 1024, bounds: Tuple[int, int] = (1200, 800)):
+        self.bounds = bounds
+        self.capacity = 0
+        self.count = 0
+        self.columns: Dict[str, np.ndarray] = {}
+        for fields in COMPONENTS.values():
+            for name, dtype, shape in fields:
+                self.columns[name] = np.zeros((0, *shape), dtype=dtype)
+        self.mask = np.zeros(0, dtype=np.uint32)
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.handles = np.empty(0, dtype=object)
+        self.doomed = np.zeros(0, dtype=bool)
+
+        self._rows = np.zeros(0, dtype=np.int64)        # id -> row, -1 when free
+        self._generation = np.zeros(0, dtype=np.int64)  # id -> generation
+        self._free_ids: List[int] = []
+        self._counts = np.zeros(len(Kind), dtype=np.int64)  # live, non-doomed rows per kind
+        self._grow(capacity)
+
+    def _grow(self, capacity: int):
+        old = self.capacity
+
+        def resized(array, fill=0):
+            grown = np.full((capacity, *array.shape[1:]), fill, dtype=array.dtype)
+            grown[:old] = array
+            return grown
+
+        self.columns = {name: resized(column) for name, column in self.columns.items()}
+        self.mask = resized(self.mask)
+        self.kind = resized(self.kind)
+        self.ids = resized(self.ids)
+        self.handles = resized(self.handles, None)
+        self.doomed = resized(self.doomed, False)
+        self._rows = resized(self._rows, -1)
+        self._generation = resized(self._generation)
+        self._free_ids.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def spawn(self, kind: Kind, handle=None, **components) -> int:
+        # One entity; returns its id. Multi-field components take a tuple, or one
+        # value for every field (health=30 sets health and max_health)
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        row = self.count
+        entity = self._free_ids.pop()
+        mask = 0
+        for name, value in components.items():
+            mask |= COMPONENT_BITS[name]
+            fields = COMPONENTS[name]
+            if len(fields) > 1 and isinstance(value, tuple):
+                for (field, _, _), field_value in zip(fields, value):
+                    self.columns[field][row] = field_value
+            else:
+                for field, _, _ in fields:
+                    self.columns[field][row] = value
+        self.mask[row] = mask
+        self.kind[row] = kind
+        self.ids[row] = entity
+        self.handles[row] = handle
+        self.doomed[row] = False
+        self._rows[entity] = row
+        self._counts[kind] += 1
+        self.count += 1
+        return entity
+
+    def spawn_many(self, kind: Kind, n: int, **components):
+        # n handle-less entities at once; values are scalars or length-n arrays
+        if n <= 0:
+            return
+        while self.count + n > self.capacity:
+            self._grow(self.capacity * 2)
+        rows = slice(self.count, self.count + n)
+        mask = 0
+        for name, value in components.items():
+            mask |= COMPONENT_BITS[name]
+            fields = COMPONENTS[name]
+            if len(fields) > 1 and isinstance(value, tuple):
+                for (field, _, _), field_value in zip(fields, value):
+                    self.columns[field][rows] = field_value
+            else:
+                for field, _, _ in fields:
+                    self.columns[field][rows] = value
+        ids = np.array(self._free_ids[-n:][::-1], dtype=np.int64)
+        del self._free_ids[-n:]
+        self.mask[rows] = mask
+        self.kind[rows] = kind
+        self.ids[rows] = ids
+        self.handles[rows] = None
+        self.doomed[rows] = False
+        self._rows[ids] = np.arange(self.count, self.count + n)
+        self._counts[kind] += n
+        self.count += n
+
+    def select(self, *components: str, kind: Optional[Kind] = None) -> np.ndarray:
+        # Rows that have every listed component (and the kind, if given), excluding doomed rows
+        n = self.count
+        bits = 0
+        for name in components:
+            bits |= COMPONENT_BITS[name]
+        match = ~self.doomed[:n]
+        if bits:
+            match &= (self.mask[:n] & bits) == bits
+        if kind is not None:
+            match &= self.kind[:n] == kind
+        return np.flatnonzero(match)
+
+    def entities(self, kind: Kind) -> list:
+        # Handles of the live entities of one kind, in spawn order
+        return self.handles[self.select(kind=kind)].tolist()
+
+    def count_of(self, kind: Kind) -> int:
+        return int(self._counts[kind])
+
+    def row(self, entity: int, generation: int) -> int:
+        if self._generation[entity] != generation:
+            return -1
+        return int(self._rows[entity])
+
+    def generation(self, entity: int) -> int:
+        return int(self._generation[entity])
+
+    def destroy_rows(self, rows: np.ndarray):
+        rows = np.asarray(rows)
+        if not len(rows):
+            return
+        fresh = rows[~self.doomed[rows]]
+        self.doomed[fresh] = True
+        self._counts -= np.bincount(self.kind[fresh], minlength=len(Kind))
+
+    def clear(self, kinds: Optional[Iterable[Kind]] = None):
+        n = self.count
+        if kinds is None:
+            self.destroy_rows(np.arange(n))
+        else:
+            self.destroy_rows(np.flatnonzero(np.isin(self.kind[:n], list(kinds))))
+        self.flush()
+
+    def flush(self):
+        # Compact away doomed rows and retire their ids
+        n = self.count
+        doomed = self.doomed[:n]
+        if not doomed.any():
+            return
+        freed = self.ids[:n][doomed]
+        self._rows[freed] = -1
+        self._generation[freed] += 1
+        self._free_ids.extend(freed.tolist())
+
+        keep = ~doomed
+        kept = n - len(freed)
+        for column in self.columns.values():
+            column[:kept] = column[:n][keep]
+        for array in (self.mask, self.kind, self.ids, self.handles):
+            array[:kept] = array[:n][keep]
+        self.handles[kept:n] = None
+        self.doomed[:n] = False
+        self._rows[self.ids[:kept]] = np.arange(kept)
+        self.count = kept
+
+
+def component_field(name: str, cast=float):
+    # Property reading and writing one column of a handle's row
+    def get(self):
+        return cast(self.world.columns[name][self.row])
+
+    def set(self, value):
+        self.world.columns[name][self.row] = value
+
+    return property(get, set)
+
+
+class Entity:
+    """A handle on one world row, for entities that also carry per-object data."""
+    kind: Kind
+
+    def __init__(self, world: World, **components):
+        self.world = world
+        self.id = world.spawn(self.kind, self, **components)
+        self._generation = world.generation(self.id)
+
+    @property
+    def row(self) -> int:
+        row = self.world.row(self.id, self._generation)
+        if row < 0:
+            raise ReferenceError(f"{type(self).__name__} {self.id} no longer exists")
+        return row
+
+    @property
+    def alive(self) -> bool:
+        row = self.world.row(self.id, self._generation)
+        return row >= 0 and not self.world.doomed[row]
+
+    def destroy(self):
+        if self.alive:
+            self.world.destroy_rows(np.array([self.row]))
+
+
+# Pseudo-component for which rows exist: systems that call destroy_rows()
+# write it, and the scheduler treats every system as reading it
+ENTITIES = "entities"
+
+
+class System(ABC):
+    """Bulk update over the rows holding a set of components.
+
+    ``reads`` and ``writes`` name the components the system touches; the
+    scheduler uses them to order systems. Systems destroy entities only through
+    ``World.destroy_rows``, which is deferred until the end of the tick, and
+    declare it by writing ``ENTITIES``, so they are ordered after every system
+    declared before them.
+    """
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+
+    @abstractmethod
+    def run(self, world: World):
+        pass
+
+
+class Scheduler:
+    """Runs systems once per tick, grouped into stages by their declared access.
+
+    Each system goes into the stage after the last one containing a system it
+    conflicts with (one writes a component the other reads or writes), so
+    declared order is kept wherever it matters, and systems sharing a stage
+    touch disjoint data. Stages run one after another on the calling thread;
+    afterwards the world is flushed. Per-system time is kept in ``timings_ms``.
+    """
+
+    def __init__(self, systems: Sequence[System]):
+        self.systems = list(systems)
+        self.stages: List[List[System]] = []
+        for system in self.systems:
+            stage = 0
+            for i, existing in enumerate(self.stages):
+                if any(self._conflict(system, other) for other in existing):
+                    stage = i + 1
+            if stage == len(self.stages):
+                self.stages.append([])
+            self.stages[stage].append(system)
+        self.timings_ms = {type(system).__name__: 0.0 for system in self.systems}
+
+    @staticmethod
+    def _conflict(a: System, b: System) -> bool:
+        return bool(a.writes & (b.reads | b.writes | {ENTITIES}) or b.writes & (a.reads | {ENTITIES}))
+
+    def run(self, world: World):
+        for stage in self.stages:
+            for system in stage:
+                start = time.perf_counter()
+                system.run(world)
+                self.timings_ms[type(system).__name__] += (time.perf_counter() - start) * 1000
+        world.flush()
+
+
+class ChaseSystem(System):
+    # Velocity straight at the target until within each entity's hover distance;
+    # entities with sight head for where they last saw it instead
+    reads = frozenset({"position", "chase", "sight"})
+    writes = frozenset({"velocity"})
+
+    def __init__(self):
+        self.target = (0.0, 0.0)
+
+    def run(self, world):
+        self.steer(world, world.select("position", "velocity", "chase"))
+
+    def steer(self, world, rows: np.ndarray):
+        if not len(rows):
+            return
+        c = world.columns
+        target_x = np.full(len(rows), self.target[0])
+        target_y = np.full(len(rows), self.target[1])
+        sighted = (world.mask[rows] & COMPONENT_BITS["sight"]) != 0
+        target_x[sighted] = c["seen_x"][rows[sighted]]
+        target_y[sighted] = c["seen_y"][rows[sighted]]
+        dx = target_x - c["x"][rows]
+        dy = target_y - c["y"][rows]
+        distance = np.sqrt(dx * dx + dy * dy)
+        moving = distance > c["hover"][rows]
+        step = np.where(moving, c["speed"][rows] / np.where(moving, distance, 1), 0)
+        c["vx"][rows] = dx * step
+        c["vy"][rows] = dy * step
+
+
+class MovementSystem(System):
+    reads = frozenset({"velocity"})
+    writes = frozenset({"position"})
+
+    def run(self, world):
+        rows = world.select("position", "velocity")
+        c = world.columns
+        c["x"][rows] += c["vx"][rows]
+        c["y"][rows] += c["vy"][rows]
+
+
+class LifetimeSystem(System):
+    reads = frozenset({"lifetime"})
+    writes = frozenset({"lifetime", ENTITIES})
+
+    def run(self, world):
+        rows = world.select("lifetime")
+        life = world.columns["life"]
+        life[rows] -= 1
+        world.destroy_rows(rows[life[rows] <= 0])
+
+
+class CullSystem(System):
+    reads = frozenset({"position", "cull"})
+    writes = frozenset({ENTITIES})
+
+    def run(self, world):
+        rows = world.select("position", "cull")
+        x = world.columns["x"][rows]
+        y = world.columns["y"][rows]
+        width, height = world.bounds
+        world.destroy_rows(rows[(x < 0) | (x > width) | (y < 0) | (y > height)])
+
+
+class DeathSystem(System):
+    reads = frozenset({"health"})
+    writes = frozenset({ENTITIES})
+
+    def run(self, world):
+        rows = world.select("health")
+        world.destroy_rows(rows[world.columns["health"][rows] <= 0])
@@ -0,0 +1,590 @@
+import os
+import math
+import random
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# The environments never open a visible window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from game import Game, GameState, SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_WAVES, SPELL_UNLOCKS, default_level
+from game_objects import EnemyType, ENEMY_STATS, POWER_UP_RADIUS
+from ecs import Kind, World
+from level import Level, sample_points
+from spells import SpellManager, SpellType, SPELL_TYPES, PROJECTILE_LIFETIMES, DEFAULT_PROJECTILE_LIFETIME
+from wizard import Wizard
+
+# Spell slots in the same order as the 1-6 hotkeys. Action spell index 0 means
+# "don't cast", index i casts SPELL_ORDER[i - 1].
+SPELL_ORDER = [
+    SpellType.FIREBALL,
+    SpellType.LIGHTNING,
+    SpellType.ICE_SHARD,
+    SpellType.MAGIC_MISSILE,
+    SpellType.FIRE_NOVA,
+    SpellType.TELEPORT,
+]
+ENEMY_ORDER = list(EnemyType)
+# The world's spell column -> SPELL_ORDER index, -1 for spells without a slot
+WORLD_SPELL_INDEX = np.array([SPELL_ORDER.index(s) if s in SPELL_ORDER else -1 for s in SPELL_TYPES])
+POWER_UP_ORDER = ["health", "mana", "speed"]
+
+# Action layout: [move_x, move_y, spell, aim_x, aim_y]. Movement is clipped to
+# -1..1, aim is the cast target relative to the wizard in pixels.
+ACTION_SIZE = 5
+
+# Observation feature layouts
+WIZARD_FEATURES = ["x", "y", "health", "max_health", "mana", "max_mana",
+                   "invulnerability", "speed", "level", "wave"]
+ENEMY_FEATURES = ["dx", "dy", "distance", "health", "radius", "type", "present"]
+PROJECTILE_FEATURES = ["dx", "dy", "vx", "vy", "lifetime", "spell", "present"]
+
+SPEED_BOOST_FRAMES = 300  # 5 seconds at 60 FPS
+NOVA_DIRECTIONS = 12
+
+
+def used_columns(alive: np.ndarray) -> int:
+    # Slots fill from the left, so columns past the last one live in any
+    # environment can be skipped
+    used = np.flatnonzero(alive.any(axis=0))
+    return int(used[-1]) + 1 if len(used) else 0
+
+
+def build_observation(wizard: np.ndarray,
+                      enemy_x: np.ndarray, enemy_y: np.ndarray, enemy_health: np.ndarray,
+                      enemy_radius: np.ndarray, enemy_type: np.ndarray, enemy_alive: np.ndarray,
+                      proj_x: np.ndarray, proj_y: np.ndarray, proj_vx: np.ndarray,
+                      proj_vy: np.ndarray, proj_life: np.ndarray, proj_spell: np.ndarray,
+                      proj_alive: np.ndarray, cooldowns: np.ndarray, unlocked: np.ndarray,
+                      n_enemies: int, n_projectiles: int) -> Dict[str, np.ndarray]:
+    # Every input is batched over environments on axis 0
+    num_envs = wizard.shape[0]
+    wx = wizard[:, 0:1]
+    wy = wizard[:, 1:2]
+
+    # Nearest N enemies, padded with zero rows
+    enemies = np.zeros((num_envs, n_enemies, len(ENEMY_FEATURES)), dtype=np.float32)
+    if enemy_x.shape[1]:
+        dx = enemy_x - wx
+        dy = enemy_y - wy
+        dist = np.sqrt(dx * dx + dy * dy)
+        order = np.argsort(np.where(enemy_alive, dist, np.inf), axis=1, kind='stable')[:, :n_enemies]
+        take = order.shape[1]
+        # Flat indices computed once serve every feature
+        order += np.arange(num_envs)[:, None] * dx.shape[1]
+        for col, values in enumerate((dx, dy, dist, enemy_health, enemy_radius, enemy_type, enemy_alive)):
+            enemies[:, :take, col] = values.ravel().take(order)
+        enemies[:, :take, :-1] *= enemies[:, :take, -1:]
+
+    # First N live projectiles
+    projectiles = np.zeros((num_envs, n_projectiles, len(PROJECTILE_FEATURES)), dtype=np.float32)
+    if proj_x.shape[1]:
+        order = np.argsort(~proj_alive, axis=1, kind='stable')[:, :n_projectiles]
+        take = order.shape[1]
+        order += np.arange(num_envs)[:, None] * proj_x.shape[1]
+        for col, values in enumerate((proj_x - wx, proj_y - wy, proj_vx, proj_vy,
+                                      proj_life, proj_spell, proj_alive)):
+            projectiles[:, :take, col] = values.ravel().take(order)
+        projectiles[:, :take, :-1] *= projectiles[:, :take, -1:]
+
+    return {
+        "wizard": wizard.astype(np.float32),
+        "enemies": enemies,
+        "projectiles": projectiles,
+        "cooldowns": cooldowns.astype(np.float32),
+        "unlocked": unlocked.astype(np.float32),
+    }
+
+
+class WizardEnv:
+    """Gym-style wrapper around a headless ``Game``.
+
+    ``step`` applies one action, advances the real game by one tick and returns
+    ``(observation, reward, done, info)``. The reward is score gained minus
+    health lost.
+    """
+
+    def __init__(self, n_enemies: int = 8, n_projectiles: int = 16, seed: Optional[int] = None):
+        self.n_enemies = n_enemies
+        self.n_projectiles = n_projectiles
+        self.seed = seed
+        self.game: Optional[Game] = None
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        if self.seed is not None:
+            random.seed(self.seed)
+        if self.game is None:
+            # Nothing is drawn here, so hits needn't leave marks
+            self.game = Game(audio=False, decals=False)
+        else:
+            self.game.reset()
+        self.game.state = GameState.PLAYING
+        return self.observe()
+
+    def step(self, action) -> Tuple[Dict[str, np.ndarray], float, bool, dict]:
+        game = self.game
+        wizard = game.wizard
+        score = game.score
+        health = wizard.health
+
+        move_x, move_y, spell, aim_x, aim_y = action
+        spell = int(spell)
+        if 0 < spell <= len(SPELL_ORDER):
+            spell_type = SPELL_ORDER[spell - 1]
+            if spell_type in wizard.spell_manager.unlocked_spells:
+                wizard.current_spell = spell_type
+                wizard.cast_spell(wizard.x + aim_x, wizard.y + aim_y)
+
+        # Speed boosts expire through a pygame timer, same as in Game.run
+        for _ in pygame.event.get(pygame.USEREVENT):
+            wizard.speed = wizard.base_speed
+
+        wizard.move_direction(float(np.clip(move_x, -1, 1)), float(np.clip(move_y, -1, 1)), game.level)
+        done = not game.update()
+        if done:
+            game.state = GameState.GAME_OVER
+
+        reward = (game.score - score) - max(0, health - wizard.health)
+        info = {"score": game.score, "wave": game.wave}
+        return self.observe(), float(reward), done, info
+
+    def observe(self) -> Dict[str, np.ndarray]:
+        game = self.game
+        wizard = game.wizard
+        manager = wizard.spell_manager
+
+        wizard_state = np.array([[wizard.x, wizard.y, wizard.health, wizard.max_health,
+                                  wizard.mana, wizard.max_mana, wizard.invulnerability_timer
+                                  if wizard.invulnerable else 0, wizard.speed, wizard.level,
+                                  game.wave]], dtype=np.float64)
+
+        enemies = game.enemies
+        enemy = np.array([[e.x, e.y, e.health, e.radius, ENEMY_ORDER.index(e.enemy_type), e.active]
+                          for e in enemies], dtype=np.float64).reshape(-1, 6).T[:, None, :]
+
+        rows = game.world.select("position", "velocity", "lifetime", "spell", kind=Kind.PROJECTILE)
+        c = game.world.columns
+        proj = np.stack([c["x"][rows], c["y"][rows], c["vx"][rows], c["vy"][rows], c["life"][rows],
+                         WORLD_SPELL_INDEX[c["spell"][rows]], np.ones(len(rows))]).astype(np.float64)[:, None, :]
+
+        cooldowns = np.array([[manager.spells[s].current_cooldown for s in SPELL_ORDER]])
+        unlocked = np.array([[s in manager.unlocked_spells for s in SPELL_ORDER]])
+
+        return build_observation(wizard_state,
+                                 enemy[0], enemy[1], enemy[2], enemy[3], enemy[4], enemy[5] > 0,
+                                 proj[0], proj[1], proj[2], proj[3], proj[4], proj[5], proj[6] > 0,
+                                 cooldowns, unlocked, self.n_enemies, self.n_projectiles)
+
+
+class VectorWizardEnv:
+    """K independent games advanced in lockstep with batched array math.
+
+    The simulation follows ``Game.update`` for wizard movement with wall
+    collisions, spell casting and cooldowns, projectile motion and lifetime,
+    enemy spawning and chasing, projectile/enemy and wizard/enemy hits, score and
+    experience per kill (from ``ENEMY_STATS``, like the game), power-ups and the
+    exit door. Left out:
+
+    - bosses, so every ``BOSS_WAVE_INTERVAL``-th wave has no boss and no bullets;
+    - line of sight and AI time-slicing: every enemy steers straight at the
+      wizard every tick;
+    - the swarm, and the quality governor's cap on live enemies;
+    - particles, lights, decals and audio, none of which affect play.
+
+    Speed boosts last ``SPEED_BOOST_FRAMES`` ticks rather than five seconds of
+    wall-clock time, and randomness comes from one NumPy generator, so the same
+    seed does not give the same spawns as a ``WizardEnv``. Entity storage is
+    fixed per environment (``max_enemies``, ``max_projectiles``,
+    ``max_power_ups``); spawns that don't fit are dropped. Environments that
+    finish are reset automatically and report their final score in ``info``.
+    """
+
+    def __init__(self, num_envs: int, max_enemies: int = 32, max_projectiles: int = 32,
+                 max_power_ups: int = 4, n_enemies: int = 8, n_projectiles: int = 16,
+                 seed: Optional[int] = None, level: Optional[Level] = None):
+        self.num_envs = num_envs
+        self.layout = level or default_level()
+        self.max_enemies = max_enemies
+        self.max_projectiles = max_projectiles
+        self.max_power_ups = max_power_ups
+        self.n_enemies = n_enemies
+        self.n_projectiles = n_projectiles
+        self.rng = np.random.default_rng(seed)
+        self._setup_tables()
+        self._allocate()
+
+    def _setup_tables(self):
+        # Read the rules off the real game objects so both simulations agree
+        wizard = Wizard(0, 0, World(capacity=1))
+        self.wizard_radius = wizard.radius
+        self.base_speed = wizard.base_speed
+        self.start_health = wizard.max_health
+        self.start_mana = wizard.max_mana
+        self.mana_regen = wizard.mana_regen
+        self.start_experience_to_next = wizard.experience_to_next
+
+        manager = SpellManager()
+        spells = [manager.spells[s] for s in SPELL_ORDER]
+        self.spell_damage = np.array([s.damage for s in spells], dtype=np.float64)
+        self.spell_speed = np.array([s.speed for s in spells], dtype=np.float64)
+        self.spell_cooldown = np.array([s.cooldown for s in spells], dtype=np.int32)
+        self.spell_mana = np.array([s.mana_cost for s in spells], dtype=np.float64)
+        self.spell_radius = np.array([s.radius for s in spells], dtype=np.float32)
+        self.spell_lifetime = np.array([PROJECTILE_LIFETIMES.get(s, DEFAULT_PROJECTILE_LIFETIME)
+                                        for s in SPELL_ORDER], dtype=np.int32)
+        self.start_unlocked = np.array([s in manager.unlocked_spells for s in SPELL_ORDER])
+        self.nova_slot = SPELL_ORDER.index(SpellType.FIRE_NOVA)
+        self.teleport_slot = SPELL_ORDER.index(SpellType.TELEPORT)
+        self.unlock_waves = {wave: SPELL_ORDER.index(s) for wave, s in SPELL_UNLOCKS.items()}
+
+        enemies = [ENEMY_STATS[t] for t in ENEMY_ORDER]
+        self.enemy_health = np.array([e.health for e in enemies], dtype=np.float64)
+        self.enemy_speed = np.array([e.speed for e in enemies], dtype=np.float64)
+        self.enemy_radius = np.array([e.radius for e in enemies], dtype=np.float32)
+        self.enemy_damage = np.array([e.damage for e in enemies], dtype=np.float64)
+        self.enemy_score = np.array([e.score for e in enemies], dtype=np.int64)
+        self.enemy_experience = np.array([e.experience for e in enemies], dtype=np.int64)
+
+        # Spawn tables: one row of enemy type indices per wave tier
+        self.tier_waves = np.array([w for w, _ in ENEMY_WAVES[:-1]])
+        width = max(len(types) for _, types in ENEMY_WAVES)
+        self.tier_types = np.zeros((len(ENEMY_WAVES), width), dtype=np.int64)
+        self.tier_counts = np.array([len(types) for _, types in ENEMY_WAVES])
+        for i, (_, types) in enumerate(ENEMY_WAVES):
+            self.tier_types[i, :len(types)] = [ENEMY_ORDER.index(t) for t in types]
+
+        self.power_up_radius = POWER_UP_RADIUS
+        self.doors = self.layout.doors[:, :4].astype(np.float64)
+
+    def _allocate(self):
+        K, M, P, U = self.num_envs, self.max_enemies, self.max_projectiles, self.max_power_ups
+        self.wx = np.zeros(K)
+        self.wy = np.zeros(K)
+        self.health = np.zeros(K)
+        self.max_health = np.zeros(K)
+        self.mana = np.zeros(K)
+        self.max_mana = np.zeros(K)
+        self.invulnerable = np.zeros(K, dtype=np.int32)
+        self.speed_boost = np.zeros(K, dtype=np.int32)
+        self.level = np.zeros(K, dtype=np.int32)
+        self.experience = np.zeros(K, dtype=np.int64)
+        self.experience_to_next = np.zeros(K, dtype=np.int64)
+        self.score = np.zeros(K, dtype=np.int64)
+        self.wave = np.zeros(K, dtype=np.int32)
+        self.spawn_timer = np.zeros(K, dtype=np.int32)
+        self.spawn_delay = np.zeros(K, dtype=np.int32)
+        self.power_up_timer = np.zeros(K, dtype=np.int32)
+        self.cooldowns = np.zeros((K, len(SPELL_ORDER)), dtype=np.int32)
+        self.unlocked = np.zeros((K, len(SPELL_ORDER)), dtype=bool)
+
+        self.ex = np.zeros((K, M), dtype=np.float32)
+        self.ey = np.zeros((K, M), dtype=np.float32)
+        self.ehealth = np.zeros((K, M), dtype=np.float32)
+        self.etype = np.zeros((K, M), dtype=np.int64)
+        self.ealive = np.zeros((K, M), dtype=bool)
+
+        self.px = np.zeros((K, P), dtype=np.float32)
+        self.py = np.zeros((K, P), dtype=np.float32)
+        self.pvx = np.zeros((K, P), dtype=np.float32)
+        self.pvy = np.zeros((K, P), dtype=np.float32)
+        self.plife = np.zeros((K, P), dtype=np.int32)
+        self.pspell = np.zeros((K, P), dtype=np.int64)
+        self.palive = np.zeros((K, P), dtype=bool)
+
+        self.ux = np.zeros((K, U))
+        self.uy = np.zeros((K, U))
+        self.utype = np.zeros((K, U), dtype=np.int64)
+        self.ualive = np.zeros((K, U), dtype=bool)
+
+        self._env_index = np.arange(K)
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self.observe()
+
+    def _reset_envs(self, mask: np.ndarray):
+        self.wx[mask] = SCREEN_WIDTH // 2
+        self.wy[mask] = SCREEN_HEIGHT // 2
+        self.health[mask] = self.start_health
+        self.max_health[mask] = self.start_health
+        self.mana[mask] = self.start_mana
+        self.max_mana[mask] = self.start_mana
+        self.invulnerable[mask] = 0
+        self.speed_boost[mask] = 0
+        self.level[mask] = 1
+        self.experience[mask] = 0
+        self.experience_to_next[mask] = self.start_experience_to_next
+        self.score[mask] = 0
+        self.wave[mask] = 1
+        self.spawn_timer[mask] = 0
+        self.spawn_delay[mask] = 60
+        self.power_up_timer[mask] = 0
+        self.cooldowns[mask] = 0
+        self.unlocked[mask] = self.start_unlocked
+        self.ealive[mask] = False
+        self.palive[mask] = False
+        self.ualive[mask] = False
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, dict]:
+        actions = np.asarray(actions, dtype=np.float64).reshape(self.num_envs, ACTION_SIZE)
+        score = self.score.copy()
+        health = self.health.copy()
+
+        self._cast(actions)
+        self._move(np.clip(actions[:, 0], -1, 1), np.clip(actions[:, 1], -1, 1))
+        self._update_wizard()
+        self._update_enemies()
+        self._spawn()
+        done = self._collide()
+
+        reward = (self.score - score) - np.maximum(0, health - self.health)
+        info = {"score": self.score.copy(), "wave": self.wave.copy(), "final_score": np.where(done, self.score, 0)}
+        if done.any():
+            self._reset_envs(done)
+        return self.observe(), reward.astype(np.float32), done, info
+
+    def _cast(self, actions: np.ndarray):
+        slot = actions[:, 2].astype(np.int64) - 1
+        valid = (slot >= 0) & (slot < len(SPELL_ORDER))
+        slot = np.where(valid, slot, 0)
+        env = self._env_index
+        ready = (valid & self.unlocked[env, slot] & (self.cooldowns[env, slot] <= 0)
+                 & (self.mana >= self.spell_mana[slot]))
+        if not ready.any():
+            return
+
+        self.cooldowns[env[ready], slot[ready]] = self.spell_cooldown[slot[ready]]
+        self.mana -= np.where(ready, self.spell_mana[slot], 0)
+
+        aim_x = actions[:, 3]
+        aim_y = actions[:, 4]
+
+        # Teleport moves the wizard to the target
+        teleport = ready & (slot == self.teleport_slot)
+        self.wx = np.where(teleport, np.clip(self.wx + aim_x, 0, SCREEN_WIDTH), self.wx)
+        self.wy = np.where(teleport, np.clip(self.wy + aim_y, 0, SCREEN_HEIGHT), self.wy)
+
+        # Everything else claims free projectile slots: 12 for Fire Nova, 1 otherwise
+        shoot = ready & ~teleport
+        nova = slot == self.nova_slot
+        wanted = np.where(shoot, np.where(nova, NOVA_DIRECTIONS, 1), 0)
+        free = ~self.palive
+        rank = np.cumsum(free, axis=1) - 1
+        claim = free & (rank < wanted[:, None])
+        if not claim.any():
+            return
+
+        # Only the claimed slots are computed and written
+        k, p = np.nonzero(claim)
+        nova = nova[k]
+        angle = np.where(nova, rank[k, p] * (2 * math.pi / NOVA_DIRECTIONS), np.arctan2(aim_y[k], aim_x[k]))
+        speed = self.spell_speed[slot[k]]
+        # A zero-length aim never moves, matching spawn_projectiles' zero-direction case
+        still = (aim_x[k] == 0) & (aim_y[k] == 0) & ~nova
+        self.px[k, p] = self.wx[k]
+        self.py[k, p] = self.wy[k]
+        self.pvx[k, p] = np.where(still, 0.0, np.cos(angle) * speed)
+        self.pvy[k, p] = np.where(still, 0.0, np.sin(angle) * speed)
+        self.pspell[k, p] = slot[k]
+        self.plife[k, p] = self.spell_lifetime[slot[k]]
+        self.palive[k, p] = True
+
+    def _move(self, move_x: np.ndarray, move_y: np.ndarray):
+        r = self.wizard_radius
+        speed = np.where(self.speed_boost > 0, self.base_speed * 1.5, self.base_speed)
+        new_x = np.where(move_x != 0, np.clip(self.wx + move_x * speed, r, SCREEN_WIDTH - r), self.wx)
+        new_y = np.where(move_y != 0, np.clip(self.wy + move_y * speed, r, SCREEN_HEIGHT - r), self.wy)
+
+        blocked = self.layout.blocked_at(new_x, new_y)
+        self.wx = np.where(blocked, self.wx, new_x)
+        self.wy = np.where(blocked, self.wy, new_y)
+
+    def _update_wizard(self):
+        np.subtract(self.cooldowns, 1, out=self.cooldowns, where=self.cooldowns > 0)
+
+        q = used_columns(self.palive)
+        px, py, plife = self.px[:, :q], self.py[:, :q], self.plife[:, :q]
+        px += self.pvx[:, :q]
+        py += self.pvy[:, :q]
+        plife -= 1
+        self.palive[:, :q] &= ((plife > 0) & (px >= 0) & (px <= SCREEN_WIDTH)
+                               & (py >= 0) & (py <= SCREEN_HEIGHT))
+
+        np.subtract(self.invulnerable, 1, out=self.invulnerable, where=self.invulnerable > 0)
+        np.subtract(self.speed_boost, 1, out=self.speed_boost, where=self.speed_boost > 0)
+        self.mana = np.minimum(self.max_mana, self.mana + self.mana_regen)
+
+    def _update_enemies(self):
+        m = used_columns(self.ealive)
+        ex, ey = self.ex[:, :m], self.ey[:, :m]
+        dx = self.wx[:, None] - ex
+        dy = self.wy[:, None] - ey
+        dist = np.sqrt(dx * dx + dy * dy)
+        step = np.where(self.ealive[:, :m] & (dist > 0),
+                        self.enemy_speed[self.etype[:, :m]] / np.maximum(dist, 1e-9), 0)
+        ex += dx * step
+        ey += dy * step
+
+    def _spawn(self):
+        rng = self.rng
+
+        self.spawn_timer += 1
+        spawn = self.spawn_timer >= self.spawn_delay
+        self.spawn_timer[spawn] = 0
+        free = ~self.ealive
+        spawn &= free.any(axis=1)
+        if spawn.any():
+            env = self._env_index[spawn]
+            slot = free[spawn].argmax(axis=1)
+            n = len(env)
+
+            # Pick a spawn zone, then a point in it
+            x, y = sample_points(self.layout.enemy_spawns, rng, n)
+
+            tier = np.searchsorted(self.tier_waves, self.wave[env], side='right')
+            choice = (rng.random(n) * self.tier_counts[tier]).astype(np.int64)
+            etype = self.tier_types[tier, choice]
+
+            self.ex[env, slot] = x
+            self.ey[env, slot] = y
+            self.etype[env, slot] = etype
+            self.ehealth[env, slot] = self.enemy_health[etype]
+            self.ealive[env, slot] = True
+
+        self.power_up_timer += 1
+        drop = self.power_up_timer >= 600
+        self.power_up_timer[drop] = 0
+        self._spawn_power_ups(drop.astype(np.int64))
+
+    def _spawn_power_ups(self, counts: np.ndarray):
+        free = ~self.ualive
+        rank = np.cumsum(free, axis=1) - 1
+        claim = free & (rank < counts[:, None])
+        n = int(claim.sum())
+        if not n:
+            return
+        self.ux[claim], self.uy[claim] = sample_points(self.layout.power_up_spawns, self.rng, n)
+        self.utype[claim] = self.rng.integers(0, len(POWER_UP_ORDER), n)
+        self.ualive |= claim
+
+    def _collide(self) -> np.ndarray:
+        # Enemies are tested over the columns in use only
+        K = self.num_envs
+        M = used_columns(self.ealive)
+        env = self._env_index
+        ex, ey, ealive, ehealth, etype = (self.ex[:, :M], self.ey[:, :M], self.ealive[:, :M],
+                                          self.ehealth[:, :M], self.etype[:, :M])
+        radius = self.enemy_radius[etype]
+
+        # Projectile-enemy: each live projectile hits the first enemy it overlaps.
+        # Only live projectiles are tested, against the enemies of their own env.
+        k, p = np.nonzero(self.palive)
+        if len(k):
+            spell = self.pspell[k, p]
+            dist2 = self.px[k, p][:, None] - ex[k]
+            dist2 *= dist2
+            ddy = self.py[k, p][:, None] - ey[k]
+            ddy *= ddy
+            dist2 += ddy
+            reach = radius[k]
+            reach += self.spell_radius[spell][:, None]
+            reach *= reach
+            hit = dist2 < reach
+            hit &= ealive[k]
+            hits_any = hit.any(axis=1)
+        if len(k) and hits_any.any():
+            k, p, spell, hit = k[hits_any], p[hits_any], spell[hits_any], hit[hits_any]
+            flat = k * M + hit.argmax(axis=1)
+            damage = np.bincount(flat, weights=self.spell_damage[spell], minlength=K * M)
+            ehealth -= damage.reshape(K, M)
+            self.palive[k, p] = False
+
+            killed = ealive & (ehealth <= 0)
+            ealive &= ~killed
+            self.score += (killed * self.enemy_score[etype]).sum(axis=1)
+            self.experience += (killed * self.enemy_experience[etype]).sum(axis=1)
+            self._level_up()
+
+            # 10% chance per kill to drop a power up
+            drops = killed.nonzero()[0]
+            drops = drops[self.rng.random(len(drops)) < 0.1]
+            self._spawn_power_ups(np.bincount(drops, minlength=K))
+
+        # Wizard-enemy: the first overlapping enemy deals its damage
+        dx = self.wx[:, None] - ex
+        dy = self.wy[:, None] - ey
+        reach = self.wizard_radius + radius
+        touch = (dx * dx + dy * dy < reach * reach) & ealive
+        struck = touch.any(axis=1) & (self.invulnerable <= 0)
+        if struck.any():
+            first = touch.argmax(axis=1)
+            self.health -= np.where(struck, self.enemy_damage[etype[env, first]], 0)
+            self.invulnerable[struck] = 60
+        done = self.health <= 0
+
+        # Wizard-power up
+        dx = self.wx[:, None] - self.ux
+        dy = self.wy[:, None] - self.uy
+        reach = self.wizard_radius + self.power_up_radius
+        picked = (dx * dx + dy * dy < reach * reach) & self.ualive & ~done[:, None]
+        if picked.any():
+            for i, kind in enumerate(POWER_UP_ORDER):
+                got = (picked & (self.utype == i)).any(axis=1)
+                if kind == "health":
+                    self.health = np.where(got, np.minimum(self.max_health, self.health + 30), self.health)
+                elif kind == "mana":
+                    self.mana = np.where(got, np.minimum(self.max_mana, self.mana + 50), self.mana)
+                elif kind == "speed":
+                    self.speed_boost[got] = SPEED_BOOST_FRAMES
+            self.ualive &= ~picked
+
+        # Wizard-door
+        doors = self.doors
+        at_door = ((self.wx[:, None] >= doors[:, 0]) & (self.wx[:, None] < doors[:, 0] + doors[:, 2])
+                   & (self.wy[:, None] >= doors[:, 1]) & (self.wy[:, None] < doors[:, 1] + doors[:, 3])
+                   ).sum(axis=1) * ~done
+        if at_door.any():
+            self._next_level(at_door)
+
+        return done
+
+    def _level_up(self):
+        while True:
+            up = self.experience >= self.experience_to_next
+            if not up.any():
+                return
+            self.level += up
+            self.experience -= np.where(up, self.experience_to_next, 0)
+            self.experience_to_next = np.where(up, (self.experience_to_next * 1.5).astype(np.int64),
+                                               self.experience_to_next)
+            self.max_health += 10 * up
+            self.max_mana += 15 * up
+            self.health = np.where(up, self.max_health, self.health)
+            self.mana = np.where(up, self.max_mana, self.mana)
+
+    def _next_level(self, levels: np.ndarray):
+        # Each door the wizard stands in advances a wave, like Game.next_level
+        for _ in range(int(levels.max())):
+            advance = levels > 0
+            levels = levels - 1
+            self.wave += advance
+            self.spawn_delay = np.where(advance, np.maximum(20, self.spawn_delay - 5), self.spawn_delay)
+            self.ealive[advance] = False
+            self.ualive[advance] = False
+            for wave, slot in self.unlock_waves.items():
+                self.unlocked[advance & (self.wave == wave), slot] = True
+
+    def observe(self) -> Dict[str, np.ndarray]:
+        speed = np.where(self.speed_boost > 0, self.base_speed * 1.5, self.base_speed)
+        wizard = np.stack([self.wx, self.wy, self.health, self.max_health, self.mana, self.max_mana,
+                           self.invulnerable, speed, self.level, self.wave], axis=1)
+        m = used_columns(self.ealive)
+        q = used_columns(self.palive)
+        return build_observation(wizard,
+                                 self.ex[:, :m], self.ey[:, :m], self.ehealth[:, :m],
+                                 self.enemy_radius[self.etype[:, :m]], self.etype[:, :m], self.ealive[:, :m],
+                                 self.px[:, :q], self.py[:, :q], self.pvx[:, :q], self.pvy[:, :q],
+                                 self.plife[:, :q], self.pspell[:, :q], self.palive[:, :q],
+                                 self.cooldowns, self.unlocked, self.n_enemies, self.n_projectiles)
@@ -0,0 +1,125 @@
+import os
+import time
+import threading
+from collections import deque
+from typing import Callable, NamedTuple, Optional, Tuple
+
+
+class FrameSnapshot(NamedTuple):
+    """Everything needed to draw one frame, detached from the live game objects.
+
+    Entity fields hold tuples of each object's ``render_state()``, which are the
+    arguments of the matching ``draw_*`` function. Nothing in a snapshot is shared
+    with the simulation, so it can be drawn while the next tick is running.
+    """
+    frame: int  # input poll the snapshot was built from
+    state: object
+    score: int
+    wave: int
+    level: int
+    spell_name: str
+    unlocked_spells: int
+    quality: object  # QualityLevel the frame is drawn at
+    render_scale: float  # world render resolution as a fraction of the window
+    focus: Tuple[float, float]  # wizard position, even while flashing
+    walls: Tuple[tuple, ...]
+    doors: Tuple[tuple, ...]
+    wizard: Optional[tuple]  # None while the wizard is flashing
+    projectiles: Tuple[tuple, ...]
+    wizard_particles: Tuple[tuple, ...]
+    enemies: Tuple[tuple, ...]
+    bullets: Tuple[tuple, ...]  # BulletBatch per style
+    swarm: object  # (n, 2) array of swarm sprite positions
+    power_ups: Tuple[tuple, ...]
+    particles: Tuple[tuple, ...]
+    lights: object  # (n, 6) array of light_states() rows
+    fog: Optional[tuple]  # (darkness grid, tile size), None without fog of war
+    decals: object  # DecalState of the ground marks, None without decals
+
+
+def render_thread_helps() -> bool:
+    # Drawing on a thread only overlaps the next tick with a second CPU to run
+    # it; on one CPU the two threads take turns and fewer frames are presented
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) > 1
+    return (os.cpu_count() or 1) > 1
+
+
+class FramePipeline:
+    """Hands frame snapshots to a render function, inline or on a render thread.
+
+    In threaded mode up to ``buffers`` snapshots are in flight: one being drawn
+    and the rest queued. When the renderer falls behind, the oldest queued
+    snapshot is dropped so the simulation never waits on rendering. Synchronous
+    mode renders each snapshot immediately on the calling thread, which is easier
+    to debug and profile. ``render_ms`` is how long the latest frame took to
+    draw, on whichever thread drew it.
+    """
+
+    def __init__(self, render: Callable[[FrameSnapshot], None], threaded: bool = False,
+                 buffers: int = 2):
+        if buffers not in (2, 3):
+            raise ValueError("buffers must be 2 (double) or 3 (triple buffering)")
+        self.render = render
+        self.threaded = threaded
+        self.buffers = buffers
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self.render_ms = 0.0
+
+        self._pending = deque()
+        self._ready = threading.Condition()
+        self._idle = True
+        self._running = threaded
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._render_loop, name="render", daemon=True)
+            self._thread.start()
+
+    def submit(self, snapshot: FrameSnapshot):
+        if not self.threaded:
+            self._render(snapshot)
+            return
+
+        with self._ready:
+            # One slot belongs to the frame being drawn, the rest are queued
+            if len(self._pending) >= self.buffers - 1:
+                self._pending.popleft()
+                self.frames_dropped += 1
+            self._pending.append(snapshot)
+            self._ready.notify()
+
+    def wait_idle(self):
+        # Block until every submitted snapshot has been drawn
+        if not self.threaded:
+            return
+        with self._ready:
+            self._ready.wait_for(lambda: not self._pending and self._idle)
+
+    def close(self):
+        if self._thread is None:
+            return
+        with self._ready:
+            self._running = False
+            self._ready.notify_all()
+        self._thread.join()
+        self._thread = None
+
+    def _render_loop(self):
+        while True:
+            with self._ready:
+                self._idle = True
+                self._ready.notify_all()
+                self._ready.wait_for(lambda: self._pending or not self._running)
+                if not self._pending:
+                    return
+                snapshot = self._pending.popleft()
+                self._idle = False
+
+            self._render(snapshot)
+
+    def _render(self, snapshot: FrameSnapshot):
+        start = time.perf_counter()
+        self.render(snapshot)
+        self.render_ms = (time.perf_counter() - start) * 1000
+        self.frames_rendered += 1
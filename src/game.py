@@ -1,16 +1,35 @@
 import pygame
 import sys
+import logging
 import math
+import time
 import random
+import numpy as np
 from typing import List, Optional
 from enum import Enum
 
-from wizard import Wizard
-from game_objects import Enemy, EnemyType, PowerUp, Wall, Door, Particle
-from spells import SpellType
+from wizard import Wizard, draw_wizard
+from game_objects import (Enemy, EnemyType, Boss, PowerUp, Wall, Door, emit_particles,
+                          enemy_render_states, power_up_render_states, particle_render_states,
+                          draw_enemy, draw_power_up, draw_particle, draw_wall, draw_door)
+from bullets import BulletPool, draw_bullets
+from ecs import World, Kind, Scheduler, MovementSystem, LifetimeSystem, CullSystem, DeathSystem
+from ai import AIScheduler, AI_BUDGET
+from swarm import Swarm, SWARM_RADIUS, SWARM_DAMAGE, draw_swarm
+from audio import AudioManager
+from spells import SpellType, SPELL_TYPES, projectile_batches, draw_projectiles
+from frame_pipeline import FramePipeline, FrameSnapshot
+from quality import QualityGovernor, QualityLevel, emission_count
+from latency import LatencyTracker
+from level import Level, TILE_SIZE
+from visibility import Visibility, SightSystem
+from lighting import LightMap, LIGHT_RESOLUTION, emit_light, light_states
+from render_backend import RenderBackend, SurfaceBackend
+from decals import Decal, DecalLog, DecalLayer, spell_decal
+from telemetry import TelemetryRecorder
+from capture import FrameCapture
 
-# Initialize Pygame
-pygame.init()
+logger = logging.getLogger(__name__)
 
 # Constants
 SCREEN_WIDTH = 1200
@@ -28,6 +47,68 @@ PURPLE = (128, 0, 128)
 ORANGE = (255, 165, 0)
 CYAN = (0, 255, 255)
 
+# Internal world render scales, cycled with F3; the UI is always drawn at full size
+RENDER_SCALES = (1.0, 0.75, 0.5)
+
+# Level layout: walls for cover and the exit door
+LEVEL_WALLS = [
+    (200, 200, 100, 20),
+    (400, 300, 100, 20),
+    (600, 400, 100, 20),
+    (800, 200, 100, 20),
+    (300, 600, 100, 20),
+    (700, 600, 100, 20),
+]
+LEVEL_DOORS = [(SCREEN_WIDTH - 50, SCREEN_HEIGHT // 2, 40, 80, "next_level")]
+
+# Enemies come in just off one of the four edges; power-ups drop away from them
+ENEMY_SPAWN_ZONES = [
+    (0, -20, SCREEN_WIDTH, 0),
+    (0, SCREEN_HEIGHT + 20, SCREEN_WIDTH, 0),
+    (-20, 0, 0, SCREEN_HEIGHT),
+    (SCREEN_WIDTH + 20, 0, 0, SCREEN_HEIGHT),
+]
+POWER_UP_ZONES = [(50, 50, SCREEN_WIDTH - 100, SCREEN_HEIGHT - 100)]
+
+# Enemy types that can spawn, keyed by the wave they stop spawning at
+ENEMY_WAVES = [
+    (3, [EnemyType.GOBLIN]),
+    (6, [EnemyType.GOBLIN, EnemyType.SKELETON]),
+    (10, [EnemyType.GOBLIN, EnemyType.SKELETON, EnemyType.ORC]),
+    (None, [EnemyType.SKELETON, EnemyType.ORC, EnemyType.DEMON]),
+]
+
+# A boss arrives every this many waves
+BOSS_WAVE_INTERVAL = 5
+
+# Spells unlocked on reaching a wave
+SPELL_UNLOCKS = {
+    3: SpellType.LIGHTNING,
+    5: SpellType.ICE_SHARD,
+    8: SpellType.FIRE_NOVA,
+    12: SpellType.TELEPORT,
+}
+
+def default_level(tile_size: int = TILE_SIZE) -> Level:
+    # The built-in layout, used when no level file is given
+    return Level.from_layout((SCREEN_WIDTH, SCREEN_HEIGHT), LEVEL_WALLS, LEVEL_DOORS,
+                             ENEMY_SPAWN_ZONES, POWER_UP_ZONES, tile_size)
+
+# Fonts are loaded once per process and shared by every Game
+_fonts = {}
+
+def get_font(size: int) -> pygame.font.Font:
+    if not pygame.font.get_init():
+        # Fonts don't survive pygame.quit()
+        _fonts.clear()
+        pygame.font.init()
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+TITLE = "Wizard's Hack & Slash"
+
 class GameState(Enum):
     MENU = "menu"
     PLAYING = "playing"
@@ -35,18 +116,85 @@ class GameState(Enum):
     GAME_OVER = "game_over"
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Wizard's Hack & Slash")
+    def __init__(self, telemetry: Optional[TelemetryRecorder] = None,
+                 threaded_render: bool = False, render_buffers: int = 2,
+                 adaptive_quality: bool = True, audio: bool = True,
+                 swarm: Optional[Swarm] = None, low_latency: bool = False,
+                 capture: Optional[FrameCapture] = None, render_scale: float = 1.0,
+                 level: Optional[Level] = None, fog_of_war: bool = True,
+                 light_resolution: float = LIGHT_RESOLUTION, ai_budget: int = AI_BUDGET,
+                 backend: Optional[RenderBackend] = None, decals: bool = True):
+        # Everything is drawn through the backend; the default draws on the display surface
+        self.backend = backend or SurfaceBackend((SCREEN_WIDTH, SCREEN_HEIGHT), TITLE)
+        if threaded_render and not self.backend.threaded:
+            raise ValueError(f"the {self.backend.name} backend can't draw on a render thread")
         self.clock = pygame.time.Clock()
         
+        # Frames are drawn from snapshots, either inline or on a render thread
+        self.pipeline = FramePipeline(self.render, threaded_render, render_buffers)
+        
+        # Walls, doors, spawn zones and the collision grid
+        self.level = level or default_level()
+        
+        # Line of sight from the wizard: enemies lose track of it behind walls, and
+        # what it can't see is fogged
+        self.visibility = Visibility(self.level) if fog_of_war else None
+        
+        # Every enemy, projectile, power-up, particle, wall and door lives in the
+        # world; systems update them in bulk each tick, and enemy steering is
+        # time-sliced by distance under a per-tick budget
+        self.world = World(bounds=(SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.sight = SightSystem(self.visibility)
+        self.ai = AIScheduler(ai_budget)
+        self.scheduler = Scheduler([self.sight, self.ai, MovementSystem(), LifetimeSystem(),
+                                    CullSystem(), DeathSystem()])
+        self.bosses: List[Boss] = []
+        self.bullets = BulletPool(bounds=(SCREEN_WIDTH, SCREEN_HEIGHT))
+        
+        # Optional per-tick telemetry and capture of presented frames
+        self.telemetry = telemetry
+        self.capture = capture
+        
+        # Optional horde steered in worker processes, refilled on every restart
+        self.swarm = swarm
+        
+        # Sound effects, loaded once and kept across restarts
+        self.audio = AudioManager(audio)
+        
+        # Effects and spawning scale down when frames run over budget
+        self.governor = QualityGovernor(1000 / FPS)
+        self.adaptive_quality = adaptive_quality
+        
+        # Input-to-present latency, and whether to sleep before polling input
+        self.latency = LatencyTracker()
+        self.low_latency = low_latency
+        
+        # World render resolution, as a fraction of the window
+        self.render_scale = render_scale
+        
+        # Spell and explosion light, accumulated at a fraction of the resolution
+        self.lights = LightMap((SCREEN_WIDTH, SCREEN_HEIGHT), light_resolution) if light_resolution else None
+        
+        # Scorch, frost and blood marks baked into the ground; they fade on each new level
+        self.decals = DecalLog() if decals else None
+        self.ground = DecalLayer() if decals else None
+        
+        # Font
+        self.font = get_font(36)
+        self.small_font = get_font(24)
+        
+        self.reset()
+
+    def reset(self):
+        # Start a fresh run, keeping the display, fonts and entity lists
         self.state = GameState.MENU
-        self.wizard = Wizard(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        self.enemies: List[Enemy] = []
-        self.power_ups: List[PowerUp] = []
-        self.walls: List[Wall] = []
-        self.doors: List[Door] = []
-        self.particles: List[Particle] = []
+        self.world.clear()
+        self.wizard = Wizard(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, self.world)
+        self.wizard.quality = self.quality
+        
+        # Cancel a pending speed boost reset from the previous run
+        pygame.time.set_timer(pygame.USEREVENT, 0)
+        pygame.event.clear(pygame.USEREVENT)
         
         self.score = 0
         self.wave = 1
@@ -54,90 +202,119 @@ class Game:
         self.enemy_spawn_delay = 60
         self.power_up_timer = 0
         self.power_up_delay = 600  # 10 seconds
+        self.enemies_spawned = 0
+        self.enemies_killed = 0
         
-        # Font
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        if self.swarm:
+            self.swarm.clear()
+            self.swarm.spawn(self.swarm.capacity)
+        if self.decals:
+            self.decals.clear()
         
         # Initialize level
         self.setup_level()
 
     def setup_level(self):
         # Clear existing objects
-        self.enemies.clear()
-        self.power_ups.clear()
-        self.walls.clear()
-        self.doors.clear()
+        self.world.clear((Kind.ENEMY, Kind.POWER_UP, Kind.WALL, Kind.DOOR))
+        self.bosses.clear()
+        self.bullets.clear()
+        if self.visibility:
+            self.visibility.reset()
+        if self.decals:
+            self.decals.fade()
         
         # Add some walls for cover
-        self.walls.extend([
-            Wall(200, 200, 100, 20),
-            Wall(400, 300, 100, 20),
-            Wall(600, 400, 100, 20),
-            Wall(800, 200, 100, 20),
-            Wall(300, 600, 100, 20),
-            Wall(700, 600, 100, 20),
-        ])
+        for rect in self.level.walls.tolist():
+            Wall(self.world, *rect)
         
         # Add doors
-        self.doors.append(Door(SCREEN_WIDTH - 50, SCREEN_HEIGHT // 2, 40, 80, "next_level"))
+        for door in self.level.door_layout():
+            Door(self.world, *door)
+
+    @property
+    def enemies(self) -> List[Enemy]:
+        return self.world.entities(Kind.ENEMY)
+
+    @property
+    def power_ups(self) -> List[PowerUp]:
+        return self.world.entities(Kind.POWER_UP)
+
+    @property
+    def walls(self) -> List[Wall]:
+        return self.world.entities(Kind.WALL)
+
+    @property
+    def doors(self) -> List[Door]:
+        return self.world.entities(Kind.DOOR)
+
+    @property
+    def quality(self) -> QualityLevel:
+        return self.governor.settings
 
     def spawn_enemy(self):
-        # Spawn enemies from edges
-        side = random.choice(['top', 'bottom', 'left', 'right'])
-        
-        if side == 'top':
-            x = random.randint(0, SCREEN_WIDTH)
-            y = -20
-        elif side == 'bottom':
-            x = random.randint(0, SCREEN_WIDTH)
-            y = SCREEN_HEIGHT + 20
-        elif side == 'left':
-            x = -20
-            y = random.randint(0, SCREEN_HEIGHT)
-        else:  # right
-            x = SCREEN_WIDTH + 20
-            y = random.randint(0, SCREEN_HEIGHT)
+        # Hold off while the quality governor caps live enemies
+        max_enemies = self.quality.max_enemies
+        if max_enemies is not None and self.world.count_of(Kind.ENEMY) >= max_enemies:
+            return
+        
+        # Spawn enemies from the level's spawn zones
+        x, y = self.level.enemy_spawn()
         
         # Choose enemy type based on wave
-        if self.wave < 3:
-            enemy_type = EnemyType.GOBLIN
-        elif self.wave < 6:
-            enemy_type = random.choice([EnemyType.GOBLIN, EnemyType.SKELETON])
-        elif self.wave < 10:
-            enemy_type = random.choice([EnemyType.GOBLIN, EnemyType.SKELETON, EnemyType.ORC])
-        else:
-            enemy_type = random.choice([EnemyType.SKELETON, EnemyType.ORC, EnemyType.DEMON])
+        for last_wave, enemy_types in ENEMY_WAVES:
+            if last_wave is None or self.wave < last_wave:
+                enemy_type = random.choice(enemy_types)
+                break
         
-        self.enemies.append(Enemy(x, y, enemy_type))
+        Enemy(self.world, x, y, enemy_type)
+        self.enemies_spawned += 1
 
     def spawn_power_up(self):
-        x = random.randint(50, SCREEN_WIDTH - 50)
-        y = random.randint(50, SCREEN_HEIGHT - 50)
+        x, y = self.level.power_up_spawn()
         power_up_type = random.choice(["health", "mana", "speed"])
-        self.power_ups.append(PowerUp(x, y, power_up_type))
+        PowerUp(self.world, x, y, power_up_type)
 
     def check_collisions(self):
-        # Check projectile-enemy collisions
-        for projectile in self.wizard.projectiles[:]:
-            for enemy in self.enemies[:]:
-                if not enemy.active:
-                    continue
+        world = self.world
+        
+        # Check projectile-enemy collisions: every pair at once, then each hit in order
+        projectile_rows = world.select("position", "collider", "spell", kind=Kind.PROJECTILE)
+        spells = self.wizard.spell_manager.spells
+        enemy_rows = world.select("position", "collider", "health", kind=Kind.ENEMY)
+        if len(projectile_rows) and len(enemy_rows):
+            c = world.columns
+            dx = c["x"][projectile_rows, None] - c["x"][enemy_rows]
+            dy = c["y"][projectile_rows, None] - c["y"][enemy_rows]
+            reach = c["radius"][projectile_rows, None] + c["radius"][enemy_rows]
+            hits = dx * dx + dy * dy < reach * reach
+            
+            # Spawning below may grow the world, so columns are looked up per hit
+            for i in np.flatnonzero(hits.any(axis=1)):
+                for j in np.flatnonzero(hits[i]):
+                    enemy = world.handles[enemy_rows[j]]
+                    if not enemy.active:
+                        continue
                     
-                distance = math.sqrt((projectile.x - enemy.x)**2 + (projectile.y - enemy.y)**2)
-                if distance < projectile.spell.radius + enemy.radius:
-                    enemy.take_damage(projectile.spell.damage)
-                    projectile.active = False
+                    spell = spells[SPELL_TYPES[world.columns["spell"][projectile_rows[i]]]]
+                    enemy.take_damage(spell.damage)
+                    world.destroy_rows(projectile_rows[i:i + 1])
+                    self.audio.trigger("hit")
                     
                     # Create hit particles
-                    for _ in range(10):
-                        vx = random.uniform(-2, 2)
-                        vy = random.uniform(-2, 2)
-                        self.particles.append(Particle(enemy.x, enemy.y, vx, vy, projectile.spell.color, 20))
+                    count = emission_count(10, world.count_of(Kind.PARTICLE), self.quality)
+                    emit_particles(world, Kind.PARTICLE, enemy.x, enemy.y, count, spell.color, 20)
+                    emit_light(world, enemy.x, enemy.y, spell.radius * 6, spell.color, 12)
+                    if self.decals:
+                        self.decals.stamp(spell_decal(spell.spell_type), enemy.x, enemy.y, spell.radius)
                     
                     if not enemy.active:
-                        self.score += 10
-                        self.wizard.gain_experience(5)
+                        self.audio.trigger("kill")
+                        if self.decals:
+                            self.decals.stamp(Decal.BLOOD, enemy.x, enemy.y, enemy.radius)
+                        self.enemies_killed += 1
+                        self.score += enemy.score_value
+                        self.wizard.gain_experience(enemy.experience_value)
                         
                         # Chance to drop power up
                         if random.random() < 0.1:  # 10% chance
@@ -145,16 +322,42 @@ class Game:
                     break
         
         # Check wizard-enemy collisions
-        for enemy in self.enemies[:]:
-            if not enemy.active:
-                continue
-                
-            distance = math.sqrt((self.wizard.x - enemy.x)**2 + (self.wizard.y - enemy.y)**2)
-            if distance < self.wizard.radius + enemy.radius:
-                self.wizard.take_damage(enemy.damage)
+        enemy_rows = world.select("position", "collider", "health", kind=Kind.ENEMY)
+        if len(enemy_rows):
+            c = world.columns
+            dx = c["x"][enemy_rows] - self.wizard.x
+            dy = c["y"][enemy_rows] - self.wizard.y
+            reach = c["radius"][enemy_rows] + self.wizard.radius
+            touching = (dx * dx + dy * dy < reach * reach) & (c["health"][enemy_rows] > 0)
+            for row in enemy_rows[touching]:
+                self.wizard.take_damage(world.handles[row].damage)
                 if self.wizard.health <= 0:
                     return False  # Game over
         
+        # Check projectile and wizard collisions with the swarm
+        if self.swarm:
+            c = world.columns
+            for row in world.select("position", "collider", kind=Kind.PROJECTILE).tolist():
+                killed = self.swarm.kill_near(c["x"][row], c["y"][row], c["radius"][row] + SWARM_RADIUS)
+                if killed:
+                    if self.decals:
+                        self.decals.stamp(Decal.BLOOD, c["x"][row], c["y"][row], SWARM_RADIUS)
+                    world.destroy_rows(np.array([row]))
+                    self.enemies_killed += killed
+                    self.score += killed
+                    self.audio.trigger("kill")
+            if self.swarm.touching(self.wizard.x, self.wizard.y, self.wizard.radius + SWARM_RADIUS):
+                self.wizard.take_damage(SWARM_DAMAGE)
+                if self.wizard.health <= 0:
+                    return False  # Game over
+        
+        # Check wizard-bullet collisions
+        damage = self.bullets.collide(self.wizard.x, self.wizard.y, self.wizard.radius)
+        if damage:
+            self.wizard.take_damage(int(damage))
+            if self.wizard.health <= 0:
+                return False  # Game over
+        
         # Check wizard-power up collisions
         for power_up in self.power_ups[:]:
             if not power_up.active:
@@ -171,18 +374,18 @@ class Game:
                     # Reset speed after 5 seconds
                     pygame.time.set_timer(pygame.USEREVENT, 5000)
                 
-                power_up.active = False
-                self.power_ups.remove(power_up)
+                power_up.destroy()
+                self.audio.trigger("pickup")
                 
                 # Create pickup particles
-                for _ in range(15):
-                    vx = random.uniform(-1, 1)
-                    vy = random.uniform(-1, 1)
-                    self.particles.append(Particle(power_up.x, power_up.y, vx, vy, power_up.color, 30))
+                count = emission_count(15, world.count_of(Kind.PARTICLE), self.quality)
+                emit_particles(world, Kind.PARTICLE, power_up.x, power_up.y, count,
+                               power_up.color, 30, spread=1)
         
         # Check wizard-door collisions
         for door in self.doors:
             if door.rect.collidepoint(self.wizard.x, self.wizard.y):
+                self.audio.trigger("door")
                 self.next_level()
         
         return True  # Game continues
@@ -192,19 +395,25 @@ class Game:
         self.enemy_spawn_delay = max(20, self.enemy_spawn_delay - 5)  # Faster spawning
         self.setup_level()
         
+        if self.wave % BOSS_WAVE_INTERVAL == 0:
+            self.bosses.append(Boss(self.world, SCREEN_WIDTH // 2, -60, self.bullets))
+            self.enemies_spawned += 1
+            self.audio.trigger("boss")
+        
         # Unlock new spells based on level
-        if self.wave == 3:
-            self.wizard.unlock_spell(SpellType.LIGHTNING)
-        elif self.wave == 5:
-            self.wizard.unlock_spell(SpellType.ICE_SHARD)
-        elif self.wave == 8:
-            self.wizard.unlock_spell(SpellType.FIRE_NOVA)
-        elif self.wave == 12:
-            self.wizard.unlock_spell(SpellType.TELEPORT)
+        if self.wave in SPELL_UNLOCKS:
+            self.wizard.unlock_spell(SPELL_UNLOCKS[self.wave])
+
+    def cycle_render_scale(self):
+        scales = list(RENDER_SCALES)
+        if self.render_scale not in scales:
+            scales.append(self.render_scale)
+        self.render_scale = scales[(scales.index(self.render_scale) + 1) % len(scales)]
+        logger.info("Render scale %.2f", self.render_scale)
 
     def handle_input(self):
         keys = pygame.key.get_pressed()
-        self.wizard.move(keys, self.walls)
+        self.wizard.move(keys, self.level)
         
         # Spell switching
         if keys[pygame.K_1] and SpellType.FIREBALL in self.wizard.spell_manager.unlocked_spells:
@@ -223,17 +432,24 @@ class Game:
     def update(self):
         self.wizard.update(SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Update enemies
-        for enemy in self.enemies[:]:
-            enemy.update(self.wizard.x, self.wizard.y)
-            if not enemy.active:
-                self.enemies.remove(enemy)
+        # Steer, move, age and cull every entity in bulk; line of sight is only
+        # recomputed when the wizard changes tile
+        if self.visibility:
+            self.visibility.update(self.wizard.x, self.wizard.y)
+        self.sight.target = self.ai.target = (self.wizard.x, self.wizard.y)
+        self.scheduler.run(self.world)
         
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.active:
-                self.particles.remove(particle)
+        # Bosses pick and fire their bullet patterns individually
+        self.bosses = [boss for boss in self.bosses if boss.alive]
+        for boss in self.bosses:
+            boss.update(self.wizard.x, self.wizard.y)
+        
+        # Update enemy bullets
+        self.bullets.update()
+        
+        # Steer the swarm; returns once every worker has finished the tick
+        if self.swarm:
+            self.swarm.step(self.wizard.x, self.wizard.y)
         
         # Spawn enemies
         self.enemy_spawn_timer += 1
@@ -248,16 +464,26 @@ class Game:
             self.power_up_timer = 0
         
         # Check collisions
-        return self.check_collisions()
+        health = self.wizard.health
+        level = self.wizard.level
+        alive = self.check_collisions()
+        if self.wizard.health < health:
+            self.audio.trigger("hurt")
+        if self.wizard.level > level:
+            self.audio.trigger("level_up")
+        
+        # Play this frame's merged sound events
+        self.audio.update()
+        return alive
+
+    def draw_centred(self, font: pygame.font.Font, text: str, color, y: int):
+        self.backend.text(font, text, color, (SCREEN_WIDTH // 2 - font.size(text)[0] // 2, y))
 
     def draw_menu(self):
-        self.screen.fill(BLACK)
-        
-        title = self.font.render("Wizard's Hack & Slash", True, WHITE)
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 200))
+        self.backend.clear(BLACK)
         
-        start_text = self.font.render("Press SPACE to start", True, WHITE)
-        self.screen.blit(start_text, (SCREEN_WIDTH // 2 - start_text.get_width() // 2, 300))
+        self.draw_centred(self.font, TITLE, WHITE, 200)
+        self.draw_centred(self.font, "Press SPACE to start", WHITE, 300)
         
         controls = [
             "Controls:",
@@ -268,47 +494,75 @@ class Game:
         ]
         
         for i, control in enumerate(controls):
-            text = self.small_font.render(control, True, WHITE)
-            self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, 400 + i * 30))
+            self.draw_centred(self.small_font, control, WHITE, 400 + i * 30)
 
-    def draw_game(self):
-        self.screen.fill(BLACK)
+    def draw_game(self, snapshot: FrameSnapshot):
+        scale = snapshot.render_scale
+        world = self.backend
+        world.begin_world(scale)
+        if snapshot.decals is not None:
+            # The ground covers the whole world, so drawing it is the clear
+            self.ground.draw(world, snapshot.decals, scale)
+        else:
+            world.clear(BLACK)
         
         # Draw walls
-        for wall in self.walls:
-            wall.draw(self.screen)
+        for wall in snapshot.walls:
+            draw_wall(world, *wall, scale=scale)
         
         # Draw doors
-        for door in self.doors:
-            door.draw(self.screen)
+        for door in snapshot.doors:
+            draw_door(world, *door, scale=scale)
         
         # Draw wizard
-        self.wizard.draw(self.screen)
+        quality = snapshot.quality
+        if snapshot.wizard is not None:
+            draw_wizard(world, *snapshot.wizard, scale=scale)
+            draw_projectiles(world, snapshot.projectiles, quality.lightning_alpha, scale)
+            for particle in snapshot.wizard_particles:
+                draw_particle(world, *particle, scale=scale)
+        
+        # Draw enemies, skipping health bars far from the wizard at low quality
+        bar_range = quality.health_bar_range
+        if bar_range is None:
+            for enemy in snapshot.enemies:
+                draw_enemy(world, *enemy, scale=scale)
+        else:
+            focus_x, focus_y = snapshot.focus
+            bar_range_sq = bar_range * bar_range
+            for enemy in snapshot.enemies:
+                near = (enemy[0] - focus_x) ** 2 + (enemy[1] - focus_y) ** 2 <= bar_range_sq
+                draw_enemy(world, *enemy, near, scale)
         
-        # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        # Draw enemy bullets
+        draw_bullets(world, snapshot.bullets, scale)
+        draw_swarm(world, snapshot.swarm, scale)
         
         # Draw power ups
-        for power_up in self.power_ups:
-            power_up.draw(self.screen)
+        for power_up in snapshot.power_ups:
+            draw_power_up(world, *power_up, scale=scale)
         
         # Draw particles
-        for particle in self.particles:
-            particle.draw(self.screen)
+        for particle in snapshot.particles:
+            draw_particle(world, *particle, scale=scale)
         
-        # Draw UI
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
+        # Add spell and explosion light, coarser than configured below high quality
+        if self.lights:
+            self.lights.draw(world, snapshot.lights, scale, quality.coarse_lighting)
         
-        wave_text = self.font.render(f"Wave: {self.wave}", True, WHITE)
-        self.screen.blit(wave_text, (10, 50))
+        # Darken what the wizard can't see
+        if snapshot.fog is not None:
+            self.visibility.overlay.draw(world, *snapshot.fog, scale)
         
-        level_text = self.font.render(f"Level: {self.wizard.level}", True, WHITE)
-        self.screen.blit(level_text, (10, 90))
+        # Upscale the world into the window; the UI is drawn at native resolution
+        world.end_world()
         
-        spell_text = self.font.render(f"Spell: {self.wizard.current_spell.value}", True, WHITE)
-        self.screen.blit(spell_text, (10, 130))
+        # Draw UI
+        ui = self.backend
+        ui.text(self.font, f"Score: {snapshot.score}", WHITE, (10, 10))
+        ui.text(self.font, f"Wave: {snapshot.wave}", WHITE, (10, 50))
+        ui.text(self.font, f"Level: {snapshot.level}", WHITE, (10, 90))
+        ui.text(self.font, f"Spell: {snapshot.spell_name}", WHITE, (10, 130))
         
         # Draw spell info
         spell_info = [
@@ -321,71 +575,151 @@ class Game:
         ]
         
         for i, info in enumerate(spell_info):
-            if i < len(self.wizard.spell_manager.unlocked_spells):
+            if i < snapshot.unlocked_spells:
                 color = WHITE
             else:
                 color = (100, 100, 100)  # Grayed out
-            info_text = self.small_font.render(info, True, color)
-            self.screen.blit(info_text, (10, 170 + i * 20))
+            ui.text(self.small_font, info, color, (10, 170 + i * 20))
 
-    def draw_game_over(self):
-        self.screen.fill(BLACK)
-        
-        game_over_text = self.font.render("GAME OVER!", True, RED)
-        self.screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, 300))
-        
-        score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 350))
+    def draw_game_over(self, snapshot: FrameSnapshot):
+        self.backend.clear(BLACK)
         
-        wave_text = self.font.render(f"Waves Survived: {self.wave}", True, WHITE)
-        self.screen.blit(wave_text, (SCREEN_WIDTH // 2 - wave_text.get_width() // 2, 390))
-        
-        restart_text = self.font.render("Press R to restart or Q to quit", True, WHITE)
-        self.screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, 450))
+        self.draw_centred(self.font, "GAME OVER!", RED, 300)
+        self.draw_centred(self.font, f"Final Score: {snapshot.score}", WHITE, 350)
+        self.draw_centred(self.font, f"Waves Survived: {snapshot.wave}", WHITE, 390)
+        self.draw_centred(self.font, "Press R to restart or Q to quit", WHITE, 450)
 
-    def draw(self):
-        if self.state == GameState.MENU:
+    def snapshot(self) -> FrameSnapshot:
+        wizard = self.wizard
+        playing = self.state == GameState.PLAYING
+        return FrameSnapshot(
+            frame=self.latency.frame,
+            state=self.state,
+            score=self.score,
+            wave=self.wave,
+            level=wizard.level,
+            spell_name=wizard.current_spell.value,
+            unlocked_spells=len(wizard.spell_manager.unlocked_spells),
+            quality=self.quality,
+            render_scale=self.render_scale,
+            focus=(wizard.x, wizard.y),
+            walls=tuple(wall.render_state() for wall in self.walls) if playing else (),
+            doors=tuple(door.render_state() for door in self.doors) if playing else (),
+            wizard=None if wizard.flashing else wizard.render_state(),
+            projectiles=projectile_batches(self.world) if playing else (),
+            wizard_particles=particle_render_states(self.world, Kind.WIZARD_PARTICLE) if playing else (),
+            enemies=enemy_render_states(self.world) if playing else (),
+            bullets=self.bullets.batches() if playing else (),
+            swarm=self.swarm.blit_positions() if playing and self.swarm else (),
+            power_ups=power_up_render_states(self.world) if playing else (),
+            particles=particle_render_states(self.world, Kind.PARTICLE) if playing else (),
+            lights=light_states(self.world) if playing and self.lights and self.quality.lighting else (),
+            fog=(self.visibility.fog, self.visibility.tile_size) if playing and self.visibility else None,
+            decals=self.decals.state() if playing and self.decals else None,
+        )
+
+    def render(self, snapshot: FrameSnapshot):
+        # Only reads the snapshot, the backend and the fonts, so it is safe to
+        # run on the render thread while the next tick is simulated
+        if snapshot.state == GameState.MENU:
             self.draw_menu()
-        elif self.state == GameState.PLAYING:
-            self.draw_game()
-        elif self.state == GameState.GAME_OVER:
-            self.draw_game_over()
-        
-        pygame.display.flip()
+        elif snapshot.state == GameState.PLAYING:
+            self.draw_game(snapshot)
+        elif snapshot.state == GameState.GAME_OVER:
+            self.draw_game_over(snapshot)
+        
+        # Captured before presenting: a renderer's back buffer is undefined afterwards
+        if self.capture and snapshot.state == GameState.PLAYING:
+            self.capture.capture(self.backend.read_surface())
+        self.backend.present()
+        self.latency.presented(snapshot.frame)
 
-    def run(self):
+    def draw(self):
+        self.pipeline.submit(self.snapshot())
+
+    def run_frame(self) -> bool:
+        # One pass of the main loop; returns False once the player quits
         running = True
-        game_over = False
+        if self.low_latency:
+            # Sleep before polling so input is sampled as late as possible
+            self.clock.tick(FPS)
         
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+        frame_start = time.perf_counter()
+        events = pygame.event.get()
+        self.latency.poll()
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                self.latency.event("key")
+                if event.key == pygame.K_SPACE and self.state == GameState.MENU:
+                    self.state = GameState.PLAYING
+                elif event.key == pygame.K_r and self.state == GameState.GAME_OVER:
+                    self.reset()
+                    self.state = GameState.PLAYING
+                elif event.key == pygame.K_q and self.state == GameState.GAME_OVER:
                     running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and self.state == GameState.MENU:
-                        self.state = GameState.PLAYING
-                    elif event.key == pygame.K_r and self.state == GameState.GAME_OVER:
-                        self.__init__()
-                        self.state = GameState.PLAYING
-                    elif event.key == pygame.K_q and self.state == GameState.GAME_OVER:
-                        running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN and self.state == GameState.PLAYING:
-                    # Cast spell at mouse position
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    self.wizard.cast_spell(mouse_x, mouse_y)
-                elif event.type == pygame.USEREVENT:
-                    # Reset speed boost
-                    self.wizard.speed = self.wizard.base_speed
-            
-            if self.state == GameState.PLAYING:
-                self.handle_input()
-                game_over = not self.update()
-                if game_over:
-                    self.state = GameState.GAME_OVER
-            
-            self.draw()
+                elif event.key == pygame.K_F3:
+                    self.cycle_render_scale()
+            elif event.type == pygame.MOUSEBUTTONDOWN and self.state == GameState.PLAYING:
+                # Cast spell at mouse position
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                if self.wizard.cast_spell(mouse_x, mouse_y):
+                    self.latency.event("cast")
+                    self.audio.trigger("cast")
+            elif event.type == pygame.USEREVENT:
+                # Reset speed boost
+                self.wizard.speed = self.wizard.base_speed
+        
+        input_start = time.perf_counter()
+        if self.state == GameState.PLAYING:
+            self.handle_input()
+            update_start = time.perf_counter()
+            if not self.update():
+                self.state = GameState.GAME_OVER
+        else:
+            update_start = input_start
+        
+        draw_start = time.perf_counter()
+        self.draw()
+        draw_end = time.perf_counter()
+        
+        draw_ms = (draw_end - draw_start) * 1000
+        frame_ms = (draw_end - frame_start) * 1000
+        if self.pipeline.threaded:
+            # Here drawing only queued the snapshot; the render thread's latest
+            # frame time counts, and frames come no faster than the slower thread
+            draw_ms = self.pipeline.render_ms
+            frame_ms = max(frame_ms, draw_ms)
+        
+        if self.adaptive_quality and self.state == GameState.PLAYING:
+            if self.governor.record(frame_ms):
+                self.wizard.quality = self.quality
+        
+        if self.telemetry and self.state == GameState.PLAYING:
+            self.telemetry.record(self,
+                                  (update_start - frame_start) * 1000,
+                                  (draw_start - update_start) * 1000,
+                                  draw_ms, frame_ms)
+        if not self.low_latency:
             self.clock.tick(FPS)
-        
+        return running
+
+    def run(self):
+        while self.run_frame():
+            pass
+        
+        self.pipeline.close()
+        if self.capture:
+            self.capture.close()
+        for line in self.latency.summary() + self.ai.summary():
+            logger.info(line)
+        self.audio.close()
+        if self.swarm:
+            self.swarm.close()
+        if self.telemetry:
+            self.telemetry.close()
+        self.backend.close()
         pygame.quit()
         sys.exit()
 
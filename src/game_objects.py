@@ -1,8 +1,11 @@
 import pygame
 import math
-import random
+import numpy as np
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import NamedTuple, Tuple, Optional
+
+from bullets import BulletPool, boss_phases
+from ecs import Entity, Kind, World, component_field
 
 # Colors
 BLACK = (0, 0, 0)
@@ -21,148 +24,187 @@ class EnemyType(Enum):
     ORC = "orc"
     SKELETON = "skeleton"
     DEMON = "demon"
+    BOSS = "boss"
 
-class Enemy:
-    def __init__(self, x: float, y: float, enemy_type: EnemyType):
-        self.x = x
-        self.y = y
+class EnemyStats(NamedTuple):
+    health: int
+    speed: float
+    radius: int
+    color: Tuple[int, int, int]
+    damage: int
+    score: int       # awarded for the kill
+    experience: int
+
+ENEMY_STATS = {
+    EnemyType.GOBLIN: EnemyStats(30, 2.0, 15, GREEN, 5, 10, 5),
+    EnemyType.ORC: EnemyStats(60, 1.5, 25, ORANGE, 10, 10, 5),
+    EnemyType.SKELETON: EnemyStats(40, 2.5, 18, GRAY, 8, 10, 5),
+    EnemyType.DEMON: EnemyStats(100, 1.0, 30, RED, 15, 10, 5),
+    EnemyType.BOSS: EnemyStats(1500, 0.8, 45, PURPLE, 25, 100, 50),
+}
+
+POWER_UP_RADIUS = 12
+POWER_UP_COLORS = {"health": GREEN, "mana": CYAN, "speed": YELLOW}
+
+class Enemy(Entity):
+    # Chases the wizard through the AI scheduler, by line of sight unless
+    # blind_chase; health and position live in the world
+    kind = Kind.ENEMY
+    x = component_field("x")
+    y = component_field("y")
+    health = component_field("health")
+    max_health = component_field("max_health")
+    speed = component_field("speed")
+    radius = component_field("radius", int)
+
+    def __init__(self, world: World, x: float, y: float, enemy_type: EnemyType, hover: float = 0,
+                 blind_chase: bool = False):
+        stats = ENEMY_STATS[enemy_type]
+        components = dict(position=(x, y), velocity=0.0, collider=stats.radius, health=stats.health,
+                          renderable=stats.color, chase=(stats.speed, hover),
+                          think=(-np.inf, 1))  # steer on the first tick
+        if not blind_chase:
+            components["sight"] = np.nan  # SightSystem fills in the wizard's position
+        super().__init__(world, **components)
         self.enemy_type = enemy_type
-        self.active = True
-        
-        # Set stats based on enemy type
-        if enemy_type == EnemyType.GOBLIN:
-            self.health = 30
-            self.max_health = 30
-            self.speed = 2.0
-            self.radius = 15
-            self.color = GREEN
-            self.damage = 5
-        elif enemy_type == EnemyType.ORC:
-            self.health = 60
-            self.max_health = 60
-            self.speed = 1.5
-            self.radius = 25
-            self.color = ORANGE
-            self.damage = 10
-        elif enemy_type == EnemyType.SKELETON:
-            self.health = 40
-            self.max_health = 40
-            self.speed = 2.5
-            self.radius = 18
-            self.color = GRAY
-            self.damage = 8
-        elif enemy_type == EnemyType.DEMON:
-            self.health = 100
-            self.max_health = 100
-            self.speed = 1.0
-            self.radius = 30
-            self.color = RED
-            self.damage = 15
+        self.color = stats.color
+        self.damage = stats.damage
+        self.score_value = stats.score
+        self.experience_value = stats.experience
 
-    def update(self, player_x: float, player_y: float):
-        if not self.active:
-            return
-            
-        # Move towards player
-        dx = player_x - self.x
-        dy = player_y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        if distance > 0:
-            self.x += (dx / distance) * self.speed
-            self.y += (dy / distance) * self.speed
+    @property
+    def active(self) -> bool:
+        return self.alive and self.world.columns["health"][self.row] > 0
 
     def take_damage(self, damage: int):
         self.health -= damage
-        if self.health <= 0:
-            self.active = False
 
-    def draw(self, screen):
+    def render_state(self) -> tuple:
+        return (self.x, self.y, self.radius, self.color, self.health / self.max_health)
+
+    def draw(self, backend):
         if not self.active:
             return
             
-        # Draw enemy
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        draw_enemy(backend, *self.render_state())
+
+class Boss(Enemy):
+    def __init__(self, world: World, x: float, y: float, bullets: BulletPool):
+        # Closes in to hover distance through ChaseSystem, then holds position; a
+        # boss always knows where the wizard is
+        super().__init__(world, x, y, EnemyType.BOSS, hover=250, blind_chase=True)
+        self.bullets = bullets
+        self.phases = boss_phases()
+
+    def update(self, player_x: float, player_y: float):
+        # Shooting is the one thing a boss does per object
+        if not self.active:
+            return
         
-        # Draw health bar
+        # Only fire once on screen
+        x, y = self.x, self.y
+        width, height = self.bullets.bounds
+        if not (0 <= x <= width and 0 <= y <= height):
+            return
+        
+        # Later phases start as health drops
         health_ratio = self.health / self.max_health
-        bar_width = 40
-        bar_height = 5
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - self.radius - 10
+        emitters = self.phases[0][1]
+        for start_below, phase_emitters in self.phases:
+            if health_ratio < start_below:
+                emitters = phase_emitters
         
-        # Background
-        pygame.draw.rect(screen, BLACK, (bar_x, bar_y, bar_width, bar_height))
-        # Health
-        pygame.draw.rect(screen, GREEN, (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
+        for emitter in emitters:
+            emitter.update(self.bullets, x, y, player_x, player_y)
 
-class PowerUp:
-    def __init__(self, x: float, y: float, power_up_type: str):
-        self.x = x
-        self.y = y
+class PowerUp(Entity):
+    kind = Kind.POWER_UP
+    x = component_field("x")
+    y = component_field("y")
+
+    def __init__(self, world: World, x: float, y: float, power_up_type: str):
         self.power_up_type = power_up_type
-        self.radius = 12
-        self.active = True
-        
-        if power_up_type == "health":
-            self.color = GREEN
-        elif power_up_type == "mana":
-            self.color = CYAN
-        elif power_up_type == "speed":
-            self.color = YELLOW
-
-    def draw(self, screen):
-        if not self.active:
-            return
-            
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius, 2)
+        self.radius = POWER_UP_RADIUS
+        self.color = POWER_UP_COLORS[power_up_type]
+        super().__init__(world, position=(x, y), collider=self.radius, renderable=self.color)
 
-class Particle:
-    def __init__(self, x: float, y: float, vx: float, vy: float, color: Tuple[int, int, int], lifetime: int):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.active = True
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.lifetime -= 1
-        
-        if self.lifetime <= 0:
-            self.active = False
+    @property
+    def active(self) -> bool:
+        return self.alive
+
+    def render_state(self) -> tuple:
+        return (self.x, self.y, self.radius, self.color)
 
-    def draw(self, screen):
+    def draw(self, backend):
         if not self.active:
             return
             
-        alpha = int(255 * (self.lifetime / self.max_lifetime))
-        color_with_alpha = (*self.color, alpha)
-        
-        # Create a surface with alpha
-        particle_surface = pygame.Surface((4, 4), pygame.SRCALPHA)
-        pygame.draw.circle(particle_surface, color_with_alpha, (2, 2), 2)
-        screen.blit(particle_surface, (int(self.x - 2), int(self.y - 2)))
+        draw_power_up(backend, *self.render_state())
+
+def emit_particles(world: World, kind: Kind, x, y, count: int, color: Tuple[int, int, int],
+                   lifetime: int, spread: float = 2.0, speed: Optional[Tuple[float, float]] = None):
+    # A burst of particles: velocities uniform in +-spread, or radial within a speed range
+    if count <= 0:
+        return
+    if speed is None:
+        vx = np.random.uniform(-spread, spread, count)
+        vy = np.random.uniform(-spread, spread, count)
+    else:
+        angle = np.random.uniform(0, 2 * math.pi, count)
+        magnitude = np.random.uniform(speed[0], speed[1], count)
+        vx = np.cos(angle) * magnitude
+        vy = np.sin(angle) * magnitude
+    world.spawn_many(kind, count, position=(x, y), velocity=(vx, vy), lifetime=lifetime,
+                     renderable=color)
+
+def enemy_render_states(world: World) -> tuple:
+    # draw_enemy arguments for every live enemy, read in bulk
+    rows = world.select("position", "collider", "health", "renderable", kind=Kind.ENEMY)
+    c = world.columns
+    health = c["health"][rows]
+    alive = health > 0
+    rows = rows[alive]
+    return tuple(zip(c["x"][rows].tolist(), c["y"][rows].tolist(),
+                     c["radius"][rows].astype(np.int32).tolist(),
+                     map(tuple, c["color"][rows].tolist()),
+                     (health[alive] / c["max_health"][rows]).tolist()))
+
+def power_up_render_states(world: World) -> tuple:
+    rows = world.select("position", "collider", "renderable", kind=Kind.POWER_UP)
+    c = world.columns
+    return tuple(zip(c["x"][rows].tolist(), c["y"][rows].tolist(),
+                     c["radius"][rows].astype(np.int32).tolist(),
+                     map(tuple, c["color"][rows].tolist())))
+
+def particle_render_states(world: World, kind: Kind) -> tuple:
+    # draw_particle arguments for every live particle of one kind, read in bulk
+    rows = world.select("position", "lifetime", "renderable", kind=kind)
+    c = world.columns
+    alpha = (255 * c["life"][rows] / c["max_life"][rows]).astype(np.int32)
+    return tuple(zip(c["x"][rows].tolist(), c["y"][rows].tolist(),
+                     map(tuple, c["color"][rows].tolist()), alpha.tolist()))
+
+class Wall(Entity):
+    kind = Kind.WALL
 
-class Wall:
-    def __init__(self, x: float, y: float, width: float, height: float):
+    def __init__(self, world: World, x: float, y: float, width: float, height: float):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.rect = pygame.Rect(x, y, width, height)
+        super().__init__(world, position=(x, y), extent=(width, height), renderable=GRAY)
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, GRAY, self.rect)
-        pygame.draw.rect(screen, WHITE, self.rect, 2)
+    def render_state(self) -> tuple:
+        return (tuple(self.rect),)
 
-class Door:
-    def __init__(self, x: float, y: float, width: float, height: float, leads_to: str):
+    def draw(self, backend):
+        draw_wall(backend, *self.render_state())
+
+class Door(Entity):
+    kind = Kind.DOOR
+
+    def __init__(self, world: World, x: float, y: float, width: float, height: float, leads_to: str):
         self.x = x
         self.y = y
         self.width = width
@@ -170,7 +212,88 @@ class Door:
         self.leads_to = leads_to
         self.rect = pygame.Rect(x, y, width, height)
         self.color = (139, 69, 19)  # Brown
+        super().__init__(world, position=(x, y), extent=(width, height), renderable=self.color)
+
+    def render_state(self) -> tuple:
+        return (tuple(self.rect), self.color)
+
+    def draw(self, backend):
+        draw_door(backend, *self.render_state())
+
+# Draw functions take plain values so that both live objects and frame
+# snapshots (see frame_pipeline.py) render through the same code.
+
+def draw_enemy(backend, x: float, y: float, radius: int, color: Tuple[int, int, int], health_ratio: float,
+               health_bar: bool = True, scale: float = 1.0):
+    bar_y = y - radius - 10
+    bar_width = 40
+    bar_height = 5
+    if scale != 1.0:
+        x *= scale
+        y *= scale
+        bar_y *= scale
+        radius = max(1, round(radius * scale))
+        bar_width = round(bar_width * scale)
+        bar_height = max(1, round(bar_height * scale))
+    
+    # Draw enemy
+    backend.circle(color, (int(x), int(y)), radius)
+    if not health_bar:
+        return
+    
+    # Draw health bar
+    bar_x = x - bar_width // 2
+    
+    # Background
+    backend.rect(BLACK, (bar_x, bar_y, bar_width, bar_height))
+    # Health
+    backend.rect(GREEN, (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
+
+def draw_power_up(backend, x: float, y: float, radius: int, color: Tuple[int, int, int],
+                  scale: float = 1.0):
+    outline = 2
+    if scale != 1.0:
+        x *= scale
+        y *= scale
+        radius = max(1, round(radius * scale))
+        outline = max(1, round(outline * scale))
+    backend.circle(color, (int(x), int(y)), radius)
+    backend.circle(WHITE, (int(x), int(y)), radius, outline)
+
+_particle_sprites = {}
+
+def particle_sprite(color: Tuple[int, int, int], alpha: int, radius: int) -> pygame.Surface:
+    # Pre-rendered per color, radius and fade step; 16 steps look the same as 256
+    alpha = min(255, (alpha | 15) + 1) if alpha else 0
+    key = (color, alpha, radius)
+    sprite = _particle_sprites.get(key)
+    if sprite is None:
+        sprite = _particle_sprites[key] = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+    return sprite
+
+def draw_particle(backend, x: float, y: float, color: Tuple[int, int, int], alpha: int,
+                  scale: float = 1.0):
+    radius = 2
+    if scale != 1.0:
+        x *= scale
+        y *= scale
+        radius = max(1, round(radius * scale))
+    backend.sprite(particle_sprite(color, alpha, radius), (int(x - radius), int(y - radius)))
+
+def scale_rect(rect: Tuple[int, int, int, int], scale: float) -> Tuple[int, int, int, int]:
+    if scale == 1.0:
+        return rect
+    x, y, width, height = rect
+    return (round(x * scale), round(y * scale), round(width * scale), round(height * scale))
+
+def draw_wall(backend, rect: Tuple[int, int, int, int], scale: float = 1.0):
+    rect = scale_rect(rect, scale)
+    backend.rect(GRAY, rect)
+    backend.rect(WHITE, rect, 2 if scale == 1.0 else max(1, round(2 * scale)))
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, self.rect)
-        pygame.draw.rect(screen, WHITE, self.rect, 2)
+def draw_door(backend, rect: Tuple[int, int, int, int], color: Tuple[int, int, int],
+              scale: float = 1.0):
+    rect = scale_rect(rect, scale)
+    backend.rect(color, rect)
+    backend.rect(WHITE, rect, 2 if scale == 1.0 else max(1, round(2 * scale)))
@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class LatencyTracker:
+    """Input-to-present latency samples, kept per kind of input.
+
+    Call ``poll()`` right after ``pygame.event.get()``, ``event()`` for each
+    input handled from that poll, and ``presented()`` once the frame built from
+    it has been flipped (from whichever thread presents). Events are attributed
+    to the frame of their poll; if that frame is dropped they count against the
+    next one presented.
+
+    pygame events carry no usable timestamp (SDL's, where exposed, count
+    milliseconds since SDL started), so unless the caller passes a
+    ``time.perf_counter()`` timestamp (synthetic and replayed input can) an
+    event is stamped at the midpoint between this poll and the previous one, the
+    expected arrival time of input landing at a random moment. Continuously
+    sampled input (held keys, the mouse position) is recorded every frame as
+    ``"sampled"``: the time from the poll to the present.
+    """
+
+    def __init__(self, window: int = 4096):
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.frame = 0
+
+        self._lock = threading.Lock()
+        self._polls = deque()    # (frame, poll time) not yet presented
+        self._pending = deque()  # (frame, kind, event time) not yet presented
+        self._previous_poll: Optional[float] = None
+        self._last_poll: Optional[float] = None
+
+    def poll(self, now: Optional[float] = None) -> int:
+        now = time.perf_counter() if now is None else now
+        self.frame += 1
+        self._previous_poll, self._last_poll = self._last_poll, now
+        with self._lock:
+            self._polls.append((self.frame, now))
+        return self.frame
+
+    def event(self, kind: str, timestamp: Optional[float] = None):
+        if timestamp is None:
+            start = self._previous_poll if self._previous_poll is not None else self._last_poll
+            timestamp = (start + self._last_poll) / 2
+        with self._lock:
+            self._pending.append((self.frame, kind, timestamp))
+
+    def presented(self, frame: int, now: Optional[float] = None):
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            while self._polls and self._polls[0][0] <= frame:
+                _, polled = self._polls.popleft()
+                self._add("sampled", now - polled)
+            while self._pending and self._pending[0][0] <= frame:
+                _, kind, timestamp = self._pending.popleft()
+                self._add(kind, now - timestamp)
+
+    def _add(self, kind: str, seconds: float):
+        samples = self.samples.get(kind)
+        if samples is None:
+            samples = self.samples[kind] = deque(maxlen=self.window)
+        samples.append(seconds * 1000)
+
+    def percentiles(self, kind: str, q: Sequence[float] = (50, 90, 99)) -> Dict[float, float]:
+        # Latency percentiles in milliseconds (empty if nothing was recorded)
+        with self._lock:
+            samples = np.array(self.samples.get(kind, ()), dtype=np.float64)
+        if not len(samples):
+            return {}
+        return dict(zip(q, np.percentile(samples, q).tolist()))
+
+    def summary(self) -> List[str]:
+        lines = []
+        for kind in sorted(self.samples):
+            stats = self.percentiles(kind)
+            if stats:
+                values = ", ".join(f"p{q:g} {ms:.1f} ms" for q, ms in stats.items())
+                lines.append(f"{kind} latency ({len(self.samples[kind])} samples): {values}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self._polls.clear()
+            self._pending.clear()
@@ -0,0 +1,200 @@
+import os
+import random
+import argparse
+import numpy as np
+from typing import List, Sequence, Tuple
+
+# Level files: a fixed header, then raw little-endian arrays at 8-byte aligned
+# offsets listed in the header's section table. Nothing is parsed per object, so
+# loading maps the file and takes array views of it.
+MAGIC = b"WZLV"
+VERSION = 1
+SECTIONS = ("tiles", "walls", "doors", "enemy_spawns", "power_up_spawns", "names")
+HEADER = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("tile_size", "<u2"),
+    ("width", "<u4"),
+    ("height", "<u4"),
+    ("grid_w", "<u4"),
+    ("grid_h", "<u4"),
+    ("layers", "<u4"),
+    ("sections", "<u8", (len(SECTIONS), 2)),  # (offset, bytes) per section
+])
+RECT = np.dtype("<i4")   # walls and spawn zones: rows of (x, y, width, height)
+DOOR_FIELDS = 6          # doors: (x, y, width, height, name offset, name length)
+
+# Tile layer 0 marks blocked tiles; further layers are free for decoration
+COLLISION_LAYER = 0
+TILE_SIZE = 20
+
+class Level:
+    """A level layout backed by flat arrays.
+
+    ``tiles`` holds one ``(grid_h, grid_w)`` uint8 layer per tile layer, and
+    walls, doors and spawn zones are int32 rows. Levels loaded with ``load()``
+    keep those arrays as read-only views of a memory map, so pages are only read
+    when touched. The collision grid is the collision layer compared with zero,
+    and is what wizard movement and enemy navigation test against. Spawn zones
+    are rectangles that points are drawn from uniformly; a zero-size zone is a
+    fixed spawn point.
+    """
+
+    def __init__(self, size: Tuple[int, int], tile_size: int, tiles: np.ndarray,
+                 walls: np.ndarray, doors: np.ndarray, names: np.ndarray,
+                 enemy_spawns: np.ndarray, power_up_spawns: np.ndarray):
+        self.size = size
+        self.tile_size = tile_size
+        self.tiles = tiles
+        self.walls = walls
+        self.doors = doors
+        self.enemy_spawns = enemy_spawns
+        self.power_up_spawns = power_up_spawns
+        self._names = names
+
+        # Collision and navigation grid, one vectorized pass over the raw layer
+        self.blocked = tiles[COLLISION_LAYER] != 0
+
+    @classmethod
+    def from_layout(cls, size: Tuple[int, int], walls: Sequence[Tuple[int, int, int, int]],
+                    doors: Sequence[Tuple[int, int, int, int, str]],
+                    enemy_spawns: Sequence[Tuple[int, int, int, int]],
+                    power_up_spawns: Sequence[Tuple[int, int, int, int]],
+                    tile_size: int = TILE_SIZE) -> 'Level':
+        # Build a level from rectangles, rasterizing walls into the collision layer
+        grid_w, grid_h = -(-size[0] // tile_size), -(-size[1] // tile_size)
+        _check_spawns("layout", enemy_spawns, power_up_spawns)
+        tiles = np.zeros((1, grid_h, grid_w), dtype=np.uint8)
+        for x, y, w, h in walls:
+            # Clamped at 0 so walls off the top or left edge mark nothing
+            top, bottom = max(0, y // tile_size), max(0, -(-(y + h) // tile_size))
+            left, right = max(0, x // tile_size), max(0, -(-(x + w) // tile_size))
+            if top < bottom and left < right:
+                tiles[COLLISION_LAYER, top:bottom, left:right] = 1
+
+        names = bytearray()
+        door_rows = []
+        for x, y, w, h, leads_to in doors:
+            encoded = leads_to.encode("utf-8")
+            door_rows.append((x, y, w, h, len(names), len(encoded)))
+            names += encoded
+        return cls(tuple(size), tile_size, tiles, _rects(walls),
+                   np.array(door_rows, dtype=RECT).reshape(-1, DOOR_FIELDS),
+                   np.frombuffer(bytes(names), dtype=np.uint8),
+                   _rects(enemy_spawns), _rects(power_up_spawns))
+
+    @classmethod
+    def load(cls, path: str) -> 'Level':
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(raw) < HEADER.itemsize:
+            raise ValueError(f"{path}: too short to be a level file")
+        header = raw[:HEADER.itemsize].view(HEADER)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError(f"{path}: not a level file")
+        if header["version"] != VERSION:
+            raise ValueError(f"{path}: level format version {header['version']}, "
+                             f"expected {VERSION}")
+
+        sections = {}
+        for name, (offset, length) in zip(SECTIONS, header["sections"].tolist()):
+            if offset + length > len(raw):
+                raise ValueError(f"{path}: {name} section runs past the end of the file")
+            sections[name] = raw[offset:offset + length]
+
+        _check_spawns(path, sections["enemy_spawns"], sections["power_up_spawns"])
+        grid_w, grid_h, layers = int(header["grid_w"]), int(header["grid_h"]), int(header["layers"])
+        return cls((int(header["width"]), int(header["height"])), int(header["tile_size"]),
+                   sections["tiles"].reshape(layers, grid_h, grid_w),
+                   sections["walls"].view(RECT).reshape(-1, 4),
+                   sections["doors"].view(RECT).reshape(-1, DOOR_FIELDS),
+                   sections["names"],
+                   sections["enemy_spawns"].view(RECT).reshape(-1, 4),
+                   sections["power_up_spawns"].view(RECT).reshape(-1, 4))
+
+    def save(self, path: str):
+        payloads = [np.ascontiguousarray(self.tiles, dtype=np.uint8),
+                    np.ascontiguousarray(self.walls, dtype=RECT),
+                    np.ascontiguousarray(self.doors, dtype=RECT),
+                    np.ascontiguousarray(self.enemy_spawns, dtype=RECT),
+                    np.ascontiguousarray(self.power_up_spawns, dtype=RECT),
+                    np.ascontiguousarray(self._names, dtype=np.uint8)]
+
+        header = np.zeros(1, dtype=HEADER)
+        layers, grid_h, grid_w = self.tiles.shape
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["tile_size"] = self.tile_size
+        header["width"], header["height"] = self.size
+        header["grid_w"], header["grid_h"], header["layers"] = grid_w, grid_h, layers
+        offset = _aligned(HEADER.itemsize)
+        for i, payload in enumerate(payloads):
+            header["sections"][0, i] = (offset, payload.nbytes)
+            offset = _aligned(offset + payload.nbytes)
+
+        with open(path, "wb") as f:
+            f.write(header.tobytes())
+            for i, payload in enumerate(payloads):
+                f.seek(int(header["sections"][0, i, 0]))
+                f.write(payload.tobytes())
+
+    def door_layout(self) -> List[Tuple[int, int, int, int, str]]:
+        # Doors as (x, y, width, height, leads_to)
+        names = self._names.tobytes()
+        return [(x, y, w, h, names[start:start + length].decode("utf-8"))
+                for x, y, w, h, start, length in self.doors.tolist()]
+
+    def blocked_at(self, x, y):
+        # Whether points (scalars or arrays) fall on a blocked tile; off-grid is open
+        grid_h, grid_w = self.blocked.shape
+        cx = np.floor_divide(x, self.tile_size).astype(np.int64)
+        cy = np.floor_divide(y, self.tile_size).astype(np.int64)
+        inside = (cx >= 0) & (cx < grid_w) & (cy >= 0) & (cy < grid_h)
+        return inside & self.blocked[np.clip(cy, 0, grid_h - 1), np.clip(cx, 0, grid_w - 1)]
+
+    def enemy_spawn(self) -> Tuple[int, int]:
+        return _random_point(self.enemy_spawns)
+
+    def power_up_spawn(self) -> Tuple[int, int]:
+        return _random_point(self.power_up_spawns)
+
+def _rects(rects) -> np.ndarray:
+    return np.array(rects, dtype=RECT).reshape(-1, 4)
+
+def _check_spawns(source: str, enemy_spawns, power_up_spawns):
+    # Spawning draws from these mid-game, so a level without them is unplayable
+    for kind, zones in (("enemy", enemy_spawns), ("power-up", power_up_spawns)):
+        if not len(zones):
+            raise ValueError(f"{source}: no {kind} spawn zones")
+
+def _aligned(offset: int) -> int:
+    return -(-offset // 8) * 8
+
+def _random_point(zones: np.ndarray) -> Tuple[int, int]:
+    # A uniform integer point (edges included) in a randomly chosen zone
+    x, y, w, h = zones[random.randrange(len(zones))].tolist()
+    return random.randint(x, x + w), random.randint(y, y + h)
+
+def sample_points(zones: np.ndarray, rng: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    # n points at once, drawn the same way as _random_point
+    chosen = zones[rng.integers(0, len(zones), n)].astype(np.int64)
+    x = rng.integers(chosen[:, 0], chosen[:, 0] + chosen[:, 2] + 1)
+    y = rng.integers(chosen[:, 1], chosen[:, 1] + chosen[:, 3] + 1)
+    return x, y
+
+def main(argv=None):
+    # Converter: write the built-in layout out as a level file
+    parser = argparse.ArgumentParser(description="Export the built-in level layout to a level file")
+    parser.add_argument("path", help="level file to write")
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE,
+                        help=f"collision tile size in pixels (default: {TILE_SIZE})")
+    args = parser.parse_args(argv)
+
+    from game import default_level
+    level = default_level(args.tile_size)
+    level.save(args.path)
+    print(f"Wrote {args.path}: {len(level.walls)} walls, {len(level.doors)} doors, "
+          f"{level.blocked.shape[1]}x{level.blocked.shape[0]} tiles, "
+          f"{os.path.getsize(args.path)} bytes")
+
+if __name__ == "__main__":
+    main()
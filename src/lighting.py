@@ -0,0 +1,164 @@
+import numpy as np
+import pygame
+from typing import Dict, Tuple
+
+from ecs import Kind, World
+from render_backend import Blend
+
+# Default light buffer resolution, as a fraction of the world resolution
+LIGHT_RESOLUTION = 0.25
+
+# Projectiles glow over a few times their own radius, up to a limit
+PROJECTILE_GLOW = 3.0
+PROJECTILE_GLOW_MARGIN = 24
+PROJECTILE_GLOW_MAX = 120
+PROJECTILE_INTENSITY = 0.4
+
+# An adaptive light buffer drops to half resolution while every light's kernel
+# there is still at least this many buffer pixels in radius: as coarse as a
+# 30 px light already is at 0.125 resolution
+LIGHT_KERNEL_MIN = 4
+
+# Radial falloff kernels, one per radius in light buffer pixels
+_kernels = {}
+
+def light_kernel(radius: int) -> np.ndarray:
+    # (2r-1, 2r-1) float32 weights, 1 at the centre falling smoothly to 0 at r;
+    # the pixels r away, which would all be 0, are left out
+    kernel = _kernels.get(radius)
+    if kernel is None:
+        offsets = np.arange(1 - radius, radius, dtype=np.float32) / radius
+        falloff = np.clip(1 - (offsets[:, None] ** 2 + offsets[None, :] ** 2), 0, 1)
+        kernel = _kernels[radius] = falloff * falloff
+    return kernel
+
+def emit_light(world: World, x: float, y: float, radius: float, color: Tuple[int, int, int],
+               lifetime: int):
+    # A flash that fades out over its lifetime
+    world.spawn(Kind.LIGHT, position=(x, y), collider=radius, lifetime=lifetime, renderable=color)
+
+def light_states(world: World) -> np.ndarray:
+    # Every light this frame as (n, 6) float32 rows: x, y, radius, then RGB
+    # already scaled by intensity; flying projectiles and fading flashes
+    c = world.columns
+    projectiles = world.select("position", "collider", "renderable", kind=Kind.PROJECTILE)
+    flashes = world.select("position", "collider", "lifetime", "renderable", kind=Kind.LIGHT)
+    rows = np.concatenate([projectiles, flashes])
+    lights = np.empty((len(rows), 6), dtype=np.float32)
+    lights[:, 0] = c["x"][rows]
+    lights[:, 1] = c["y"][rows]
+    lights[:, 2] = c["radius"][rows]
+    lights[:len(projectiles), 2] *= PROJECTILE_GLOW
+    lights[:len(projectiles), 2] += PROJECTILE_GLOW_MARGIN
+    np.minimum(lights[:len(projectiles), 2], PROJECTILE_GLOW_MAX, out=lights[:len(projectiles), 2])
+    intensity = np.empty(len(rows), dtype=np.float32)
+    intensity[:len(projectiles)] = PROJECTILE_INTENSITY
+    intensity[len(projectiles):] = c["life"][flashes] / c["max_life"][flashes]
+    lights[:, 3:] = c["color"][rows] * intensity[:, None]
+    return lights
+
+class LightMap:
+    """Additive light, accumulated at a fraction of the world resolution.
+
+    Each light adds a cached radial kernel, tinted by its color, into a float
+    buffer with one plane per RGB channel at ``resolution`` times the world
+    size, so a light costs its area in buffer pixels. It is drawn at
+    ``resolution`` unless ``draw()`` is asked to be ``adaptive``: the falloff is
+    smooth, so then, when every light this frame is large, the buffer drops to
+    half resolution, and again, while the smallest kernel keeps
+    ``LIGHT_KERNEL_MIN`` pixels of radius. Only the bounding box of this frame's lights is then written to a
+    surface, smoothly upscaled to half the world resolution, doubled and
+    add-blended over the scene, so the per-frame cost is bounded by the lit area
+    rather than by lights times screen pixels. Used only by whichever thread
+    renders.
+    """
+
+    def __init__(self, size: Tuple[int, int], resolution: float = LIGHT_RESOLUTION):
+        self.resolution = resolution
+        self.world_size = size
+        self._levels: Dict[int, tuple] = {}  # level -> (resolution, size, buffer, scratch, surface)
+        self.size = self._level(0)[1]
+        self.drawn_at = resolution  # the buffer resolution of the last frame
+        self._half = None  # upscaling targets, reused while the world size stays the same
+        self._glow = None
+
+    def _level(self, level: int) -> tuple:
+        # The buffer and surface at ``resolution`` halved ``level`` times
+        entry = self._levels.get(level)
+        if entry is None:
+            k = self.resolution / 2 ** level
+            size = (max(1, round(self.world_size[0] * k)), max(1, round(self.world_size[1] * k)))
+            # (rgb, x, y): each channel's stamp is a plain 2D slice
+            buffer = np.zeros((3, *size), dtype=np.float32)
+            entry = self._levels[level] = (k, size, buffer, np.empty_like(buffer), pygame.Surface(size))
+        return entry
+
+    def draw(self, backend, lights: np.ndarray, scale: float = 1.0, adaptive: bool = False):
+        if not len(lights):
+            return
+        # The coarsest level that keeps every kernel at LIGHT_KERNEL_MIN or more
+        level = 0
+        if adaptive:
+            smallest = float(lights[:, 2].min()) * self.resolution
+            while round(smallest / 2) >= LIGHT_KERNEL_MIN:
+                smallest /= 2
+                level += 1
+        k, (width, height), buffer, scratch, surface = self._level(level)
+        self.drawn_at = k
+
+        # Every light's kernel and where it lands, clipped to the buffer; a
+        # kernel reaches ``extent`` pixels from its centre
+        radius = np.maximum(np.round(lights[:, 2] * k), 1).astype(np.intp)
+        extent = radius - 1
+        cx = np.round(lights[:, 0] * k).astype(np.intp)
+        cy = np.round(lights[:, 1] * k).astype(np.intp)
+        x0, x1 = np.maximum(cx - extent, 0), np.minimum(cx + radius, width)
+        y0, y1 = np.maximum(cy - extent, 0), np.minimum(cy + radius, height)
+        shown = np.flatnonzero((x0 < x1) & (y0 < y1))
+        if not len(shown):
+            return
+        left, right = int(x0[shown].min()), int(x1[shown].max())
+        top, bottom = int(y0[shown].min()), int(y1[shown].max())
+        tints = lights[shown, 3:, None, None]  # (n, rgb, 1, 1), broadcast over each kernel
+        for r, x, y, a, b, c, d, tint in zip(radius[shown].tolist(), (cx - extent)[shown].tolist(),
+                                             (cy - extent)[shown].tolist(), x0[shown].tolist(), x1[shown].tolist(),
+                                             y0[shown].tolist(), y1[shown].tolist(), tints):
+            stamp = buffer[:, a:b, c:d]
+            stamp += light_kernel(r)[a - x:b - x, c - y:d - y] * tint
+
+        # Overlapping lights saturate softly instead of clipping to flat color:
+        # lit * 255 / (lit + 255), in place in the scratch buffer
+        lit = buffer[:, left:right, top:bottom]
+        shade = np.add(lit, 255, out=scratch[:, left:right, top:bottom])
+        np.divide(lit, shade, out=shade)
+        shade *= 255
+        pixels = pygame.surfarray.pixels3d(surface)
+        for channel in range(3):
+            pixels[left:right, top:bottom, channel] = shade[channel]
+        del pixels
+        lit.fill(0)
+
+        # Upscale just the lit area into the scene: smoothly to half the world
+        # resolution, then doubled, which costs a quarter of smoothing it all
+        size = backend.target_size
+        if self._glow is None or self._glow.get_size() != size:
+            self._glow = pygame.Surface(size)
+            self._half = pygame.Surface(((size[0] + 1) // 2, (size[1] + 1) // 2))
+        to_half = scale / k / 2
+        area = pygame.Rect(left, top, right - left, bottom - top)
+        half = pygame.Rect(round(left * to_half), round(top * to_half),
+                           max(1, round(area.width * to_half)),
+                           max(1, round(area.height * to_half))).clip(self._half.get_rect())
+        target = pygame.Rect(half.x * 2, half.y * 2, half.width * 2, half.height * 2).clip(self._glow.get_rect())
+        if not target.width or not target.height:
+            return
+        if to_half < 1:
+            # The buffer is finer than half the world: smooth it all the way
+            pygame.transform.smoothscale(surface.subsurface(area), target.size, self._glow.subsurface(target))
+        else:
+            source = surface.subsurface(area)
+            if half.size != area.size:
+                source = pygame.transform.smoothscale(source, half.size, self._half.subsurface(half))
+            pygame.transform.scale(source, target.size, self._glow.subsurface(target))
+        # A new version every frame: only the lit area is re-read
+        backend.sprite(self._glow, target.topleft, Blend.ADD, area=target, version=lights)
@@ -6,16 +6,121 @@ A magical hack and slash game with bullet hell and dungeon crawler elements.
 Run this file to start the game!
 """
 
-from game import Game
+import argparse
+import logging
 
-if __name__ == "__main__":
+from game import Game, SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, default_level
+from ai import AI_BUDGET
+from level import Level
+from swarm import Swarm
+from telemetry import TelemetryRecorder
+from capture import FrameCapture
+from render_backend import BACKENDS, create_backend
+from frame_pipeline import render_thread_helps
+
+logger = logging.getLogger(__name__)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wizard's Hack & Slash")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="record per-tick telemetry to a memory-mapped .npy file")
+    parser.add_argument("--threaded-render", action="store_true",
+                        help="draw frames on a render thread, overlapping the next simulation tick")
+    parser.add_argument("--render-buffers", type=int, choices=(2, 3), default=2,
+                        help="snapshots in flight when rendering on a thread (default: 2)")
+    parser.add_argument("--fixed-quality", action="store_true",
+                        help="don't scale effects and spawning down when frames run over budget")
+    parser.add_argument("--mute", action="store_true", help="disable sound effects")
+    parser.add_argument("--swarm", type=int, default=0, metavar="N",
+                        help="add a horde of N swarm enemies steered over shared memory")
+    parser.add_argument("--swarm-workers", type=int, default=0, metavar="P",
+                        help="worker processes steering the swarm (default: 0, in-process)")
+    parser.add_argument("--low-latency", action="store_true",
+                        help="sleep before polling input instead of after presenting each frame")
+    parser.add_argument("--capture", metavar="DIR",
+                        help="record gameplay frames to an image sequence in DIR")
+    parser.add_argument("--capture-every", type=int, default=1, metavar="N",
+                        help="capture every Nth frame (default: 1)")
+    parser.add_argument("--capture-format", choices=("bmp", "png", "jpg", "tga"), default="bmp",
+                        help="image format of captured frames (default: bmp, the cheapest to encode)")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="SCALE",
+                        help="render the world at this fraction of the window resolution, "
+                             "e.g. 0.5 or 0.75 (F3 cycles at runtime)")
+    parser.add_argument("--no-fog", action="store_true",
+                        help="disable line of sight: enemies always know where the wizard is")
+    parser.add_argument("--light-resolution", type=float, default=0.25, metavar="FRACTION",
+                        help="light map resolution as a fraction of the world's, 0 to disable "
+                             "spell lighting (default: 0.25)")
+    parser.add_argument("--ai-budget", type=int, default=AI_BUDGET, metavar="N",
+                        help="enemy steering updates per tick; distant enemies are updated "
+                             f"less often (default: {AI_BUDGET})")
+    parser.add_argument("--no-decals", action="store_true",
+                        help="don't leave scorch, frost and blood marks on the ground")
+    parser.add_argument("--backend", choices=tuple(BACKENDS), default="surface",
+                        help="draw with pygame surfaces, SDL2 textures, or not at all (default: surface)")
+    parser.add_argument("--level", metavar="PATH",
+                        help="play a level file (write the built-in layout with: python level.py PATH)")
+    args = parser.parse_args(argv)
+    if not 0 < args.render_scale <= 1:
+        parser.error("--render-scale must be in (0, 1]")
+    if not 0 <= args.light_resolution <= 1:
+        parser.error("--light-resolution must be in [0, 1]")
+    if args.ai_budget < 1:
+        parser.error("--ai-budget must be at least 1")
+    if args.swarm < 0:
+        parser.error("--swarm must not be negative")
+    if args.swarm_workers < 0:
+        parser.error("--swarm-workers must not be negative (0 steers the swarm in-process)")
+    if args.capture_every < 1:
+        parser.error("--capture-every must be at least 1")
+    if args.threaded_render and not BACKENDS[args.backend].threaded:
+        parser.error(f"the {args.backend} backend draws on the main thread only; drop --threaded-render")
+    
+    level = default_level()
+    if args.level:
+        try:
+            level = Level.load(args.level)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        if level.size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            parser.error(f"{args.level}: level is {level.size[0]}x{level.size[1]}, "
+                         f"the screen is {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+    
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    threaded_render = args.threaded_render
+    if threaded_render and not render_thread_helps():
+        # benchmarks/frame_pipeline.py: fewer frames presented than synchronous on one CPU
+        logger.warning("--threaded-render needs more than one CPU and would present fewer frames "
+                       "on this one; rendering synchronously")
+        threaded_render = False
+    
     print("Starting Wizard's Hack & Slash...")
     print("Controls:")
     print("- WASD: Move")
     print("- Mouse Click: Cast Spell")
     print("- 1-6: Switch Spells")
+    print("- F3: Cycle render resolution")
     print("- Survive as long as possible!")
     print()
     
-    game = Game()
+    telemetry = None
+    if args.telemetry:
+        telemetry = TelemetryRecorder(args.telemetry)
+    capture = None
+    if args.capture:
+        capture = FrameCapture(args.capture, (SCREEN_WIDTH, SCREEN_HEIGHT),
+                               every=args.capture_every, image_format=args.capture_format)
+    swarm = None
+    if args.swarm:
+        swarm = Swarm(args.swarm, args.swarm_workers, (SCREEN_WIDTH, SCREEN_HEIGHT), level.walls)
+    backend = create_backend(args.backend, (SCREEN_WIDTH, SCREEN_HEIGHT), TITLE)
+    game = Game(telemetry=telemetry, threaded_render=threaded_render,
+                render_buffers=args.render_buffers, adaptive_quality=not args.fixed_quality,
+                audio=not args.mute, swarm=swarm, low_latency=args.low_latency, capture=capture,
+                render_scale=args.render_scale, level=level, fog_of_war=not args.no_fog,
+                light_resolution=args.light_resolution, ai_budget=args.ai_budget,
+                backend=backend, decals=not args.no_decals)
     game.run()
+
+if __name__ == "__main__":
+    main()
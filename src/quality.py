@@ -0,0 +1,101 @@
+import logging
+from collections import deque
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QualityLevel(NamedTuple):
+    name: str
+    particle_rate: float            # fraction of requested particles that get emitted
+    max_particles: Optional[int]    # cap on live particles of each kind
+    lightning_alpha: bool           # fading alpha surfaces for lightning bolts
+    health_bar_range: Optional[float]  # only draw enemy health bars this close to the wizard
+    max_enemies: Optional[int]      # spawn_enemy stops spawning above this many live enemies
+    lighting: bool                  # light map pass for spells and explosions
+    coarse_lighting: bool           # let the light map drop below --light-resolution for large lights
+
+
+QUALITY_LEVELS = [
+    QualityLevel("high", 1.0, None, True, None, None, True, False),
+    QualityLevel("medium", 0.6, 600, True, 500, 150, True, True),
+    QualityLevel("low", 0.3, 250, False, 300, 100, False, True),
+    QualityLevel("minimum", 0.1, 100, False, 150, 60, False, True),
+]
+
+
+class QualityGovernor:
+    """Steps quality down when frames run over budget and back up when there is headroom.
+
+    The rolling average of the last ``window`` frame times is compared with the
+    budget. It has to stay over budget for ``patience`` frames before quality
+    drops, and under ``headroom * budget`` for four times as long before it
+    rises again, so a single spike or a brief lull doesn't cause flapping.
+    """
+
+    def __init__(self, budget_ms: float = 1000 / 60, window: int = 30,
+                 headroom: float = 0.75, patience: int = 30):
+        self.budget_ms = budget_ms
+        self.window = window
+        self.headroom = headroom
+        self.patience = patience
+        self.level = 0
+
+        self._samples = deque(maxlen=window)
+        self._total = 0.0
+        self._over = 0
+        self._under = 0
+
+    @property
+    def settings(self) -> QualityLevel:
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def average_ms(self) -> float:
+        return self._total / len(self._samples) if self._samples else 0.0
+
+    def record(self, frame_ms: float) -> bool:
+        if len(self._samples) == self.window:
+            self._total -= self._samples[0]
+        self._samples.append(frame_ms)
+        self._total += frame_ms
+        if len(self._samples) < self.window:
+            return False
+
+        average = self.average_ms
+        if average > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif average < self.budget_ms * self.headroom:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = 0
+            self._under = 0
+
+        if self._over >= self.patience and self.level < len(QUALITY_LEVELS) - 1:
+            self._change(self.level + 1, average)
+            return True
+        if self._under >= self.patience * 4 and self.level > 0:
+            self._change(self.level - 1, average)
+            return True
+        return False
+
+    def _change(self, level: int, average: float):
+        logger.info("Quality %s -> %s (average frame %.1f ms, budget %.1f ms)",
+                    self.settings.name, QUALITY_LEVELS[level].name, average, self.budget_ms)
+        self.level = level
+
+        # Judge the new level on fresh frames only
+        self._samples.clear()
+        self._total = 0.0
+        self._over = 0
+        self._under = 0
+
+
+def emission_count(requested: int, live: int, quality: QualityLevel) -> int:
+    # How many of the requested particles to emit alongside ``live`` existing ones at this quality
+    count = int(round(requested * quality.particle_rate))
+    if quality.max_particles is not None:
+        count = min(count, max(0, quality.max_particles - live))
+    return count
@@ -0,0 +1,359 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import pygame
+
+class Blend(Enum):
+    NORMAL = "normal"      # alpha blending, or a plain copy for opaque sprites
+    ADD = "add"            # light: destination + source
+    MULTIPLY = "multiply"  # shade: destination * source / 255
+
+# Cached text images, textures and shapes per backend; each cache is rebuilt
+# from scratch once this many pile up
+TEXT_CACHE_SIZE = 256
+TEXTURE_CACHE_SIZE = 1024
+SHAPE_CACHE_SIZE = 256
+
+class RenderBackend(ABC):
+    """Where frames are drawn.
+
+    Every ``draw_*`` function submits shapes, sprites and text through one of
+    these instead of touching a surface: world drawing goes between
+    ``begin_world(scale)`` and ``end_world()``, which renders at a fraction of
+    the window size and upscales, and the HUD is drawn after at native
+    resolution. Positions are in target pixels; callers scale world
+    coordinates themselves. Sprites are pygame Surfaces that backends may turn
+    into textures, so a sprite whose pixels change must be submitted with a
+    new ``version`` each time (anything compared by identity) to be re-read.
+    ``threaded`` says whether drawing may happen off the main thread.
+    """
+    name = "base"
+    threaded = True
+
+    def __init__(self, size: Tuple[int, int]):
+        self.size = size
+        self.scale = 1.0
+
+    @property
+    def target_size(self) -> Tuple[int, int]:
+        if self.scale == 1.0:
+            return self.size
+        return (round(self.size[0] * self.scale), round(self.size[1] * self.scale))
+
+    def begin_world(self, scale: float = 1.0):
+        self.scale = scale
+
+    def end_world(self):
+        self.scale = 1.0
+
+    @abstractmethod
+    def clear(self, color: Tuple[int, int, int]):
+        pass
+
+    @abstractmethod
+    def circle(self, color: Tuple[int, int, int], center: Tuple[int, int], radius: int, width: int = 0):
+        pass
+
+    @abstractmethod
+    def rect(self, color: Tuple[int, int, int], rect: Tuple[int, int, int, int], width: int = 0):
+        pass
+
+    @abstractmethod
+    def polygon(self, color: Tuple[int, int, int], points: Sequence[Tuple[float, float]]):
+        pass
+
+    @abstractmethod
+    def sprite(self, surface: pygame.Surface, position: Tuple[int, int], blend: Blend = Blend.NORMAL,
+               area: Optional[pygame.Rect] = None, version=None):
+        pass
+
+    def blits(self, sprites: Iterable[Tuple[pygame.Surface, Tuple[int, int]]]):
+        # Many (sprite, position) pairs at once, normal blending
+        for surface, position in sprites:
+            self.sprite(surface, position)
+
+    @abstractmethod
+    def text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int],
+             position: Tuple[int, int]):
+        pass
+
+    @abstractmethod
+    def present(self):
+        pass
+
+    @abstractmethod
+    def read_surface(self) -> pygame.Surface:
+        # The finished frame, for capture; valid until the next present()
+        pass
+
+    def close(self):
+        pass
+
+class SurfaceBackend(RenderBackend):
+    # pygame.draw and Surface.blit onto the display surface, or onto ``surface``
+    # when given (the caller then presents it)
+    name = "surface"
+    _FLAGS = {Blend.NORMAL: 0, Blend.ADD: pygame.BLEND_RGB_ADD, Blend.MULTIPLY: pygame.BLEND_RGB_MULT}
+
+    def __init__(self, size: Tuple[int, int], title: str = "", surface: Optional[pygame.Surface] = None):
+        super().__init__(size)
+        self.screen = surface if surface is not None else _display(size, title)
+        self.target = self.screen
+        self._world_surfaces: Dict[float, pygame.Surface] = {}
+        self._text: Dict[tuple, pygame.Surface] = {}
+
+    def begin_world(self, scale: float = 1.0):
+        # The world is drawn here and upscaled once; one surface per scale, kept for reuse
+        super().begin_world(scale)
+        if scale == 1.0:
+            self.target = self.screen
+            return
+        surface = self._world_surfaces.get(scale)
+        if surface is None:
+            surface = self._world_surfaces[scale] = pygame.Surface(self.target_size).convert(self.screen)
+        self.target = surface
+
+    def end_world(self):
+        if self.target is not self.screen:
+            pygame.transform.scale(self.target, self.size, self.screen)
+        self.target = self.screen
+        super().end_world()
+
+    def clear(self, color):
+        self.target.fill(color)
+
+    def circle(self, color, center, radius, width=0):
+        pygame.draw.circle(self.target, color, center, radius, width)
+
+    def rect(self, color, rect, width=0):
+        pygame.draw.rect(self.target, color, rect, width)
+
+    def polygon(self, color, points):
+        pygame.draw.polygon(self.target, color, points)
+
+    def sprite(self, surface, position, blend=Blend.NORMAL, area=None, version=None):
+        self.target.blit(surface, position, area, self._FLAGS[blend])
+
+    def blits(self, sprites):
+        self.target.blits(sprites, doreturn=False)
+
+    def text(self, font, text, color, position):
+        key = (font, text, color)
+        image = self._text.get(key)
+        if image is None:
+            if len(self._text) >= TEXT_CACHE_SIZE:
+                self._text.clear()
+            image = self._text[key] = font.render(text, True, color)
+        self.target.blit(image, position)
+
+    def present(self):
+        if self.screen is pygame.display.get_surface():
+            pygame.display.flip()
+
+    def read_surface(self):
+        return self.screen
+
+class RendererBackend(RenderBackend):
+    # pygame._sdl2 Renderer drawing into its own window. Sprites, circles,
+    # polygons and text become textures the first time they are drawn and are
+    # reused while their surface and version stay the same; SDL queues the
+    # copies and submits them in batches at present(). ``accelerated=False``
+    # forces the software renderer. The renderer belongs to the thread that
+    # created it, so drawing must stay on the main thread.
+    name = "sdl2"
+    threaded = False
+    _MODES = {Blend.ADD: 2, Blend.MULTIPLY: 4}  # SDL_BLENDMODE_ADD, _MOD
+
+    def __init__(self, size: Tuple[int, int], title: str = "", accelerated: Optional[bool] = None):
+        from pygame._sdl2 import video
+        super().__init__(size)
+        self._video = video
+        pygame.display.init()
+        self.window = video.Window(title, size=size)
+        self.renderer = video.Renderer(self.window, accelerated=-1 if accelerated is None else int(accelerated),
+                                       target_texture=True)
+        self._targets: Dict[float, object] = {}
+        self._textures: Dict[int, tuple] = {}  # id(surface) -> (surface, version, texture, normal mode)
+        self._shapes: Dict[tuple, pygame.Surface] = {}
+        self._text: Dict[tuple, object] = {}
+        self._readback = None  # read_surface() reads every frame into this one surface
+
+    def begin_world(self, scale=1.0):
+        super().begin_world(scale)
+        if scale == 1.0:
+            self.renderer.target = None
+            return
+        target = self._targets.get(scale)
+        if target is None:
+            target = self._targets[scale] = self._video.Texture(self.renderer, self.target_size, target=True)
+        self.renderer.target = target
+
+    def end_world(self):
+        target = self.renderer.target
+        if target is not None:
+            self.renderer.target = None
+            target.draw(dstrect=(0, 0, *self.size))
+        super().end_world()
+
+    def clear(self, color):
+        self.renderer.draw_color = (*color, 255)
+        self.renderer.clear()
+
+    def circle(self, color, center, radius, width=0):
+        # A circle is a cached sprite of itself
+        key = ("circle", color, radius, width)
+        shape = self._shapes.get(key)
+        if shape is None:
+            if len(self._shapes) >= SHAPE_CACHE_SIZE:
+                self._shapes.clear()
+            shape = self._shapes[key] = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(shape, color, (radius, radius), radius, width)
+        self.sprite(shape, (center[0] - radius, center[1] - radius))
+
+    def rect(self, color, rect, width=0):
+        renderer = self.renderer
+        renderer.draw_color = (*color, 255)
+        x, y, w, h = rect
+        if not width or width * 2 >= min(w, h):
+            renderer.fill_rect((x, y, w, h))
+            return
+        # Borders grow inwards, like pygame.draw.rect
+        renderer.fill_rect((x, y, w, width))
+        renderer.fill_rect((x, y + h - width, w, width))
+        renderer.fill_rect((x, y + width, width, h - 2 * width))
+        renderer.fill_rect((x + w - width, y + width, width, h - 2 * width))
+
+    def polygon(self, color, points):
+        # Rasterized once per shape relative to its bounding box, on whole
+        # pixels so a moving polygon keeps hitting the same cached shape
+        points = [(round(x), round(y)) for x, y in points]
+        left = min(x for x, _ in points)
+        top = min(y for _, y in points)
+        local = tuple((x - left, y - top) for x, y in points)
+        key = ("polygon", color, local)
+        shape = self._shapes.get(key)
+        if shape is None:
+            if len(self._shapes) >= SHAPE_CACHE_SIZE:
+                self._shapes.clear()
+            width = max(x for x, _ in local) + 1
+            height = max(y for _, y in local) + 1
+            shape = self._shapes[key] = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.polygon(shape, color, local)
+        self.sprite(shape, (left, top))
+
+    def _texture(self, surface: pygame.Surface, version=None, area: Optional[pygame.Rect] = None) -> tuple:
+        entry = self._textures.get(id(surface))
+        if entry is not None and entry[0] is surface:
+            if entry[1] is version:
+                return entry
+            texture, normal = entry[2], entry[3]
+            if area is None:
+                texture.update(surface)
+            else:
+                texture.update(surface.subsurface(area), area)
+        else:
+            if len(self._textures) >= TEXTURE_CACHE_SIZE:
+                self._textures.clear()
+            # SDL blends textures of surfaces with alpha or a colorkey and copies
+            # opaque ones, which is much cheaper on the software renderer
+            texture = self._video.Texture.from_surface(self.renderer, surface)
+            normal = texture.blend_mode
+        entry = self._textures[id(surface)] = (surface, version, texture, normal)
+        return entry
+
+    def sprite(self, surface, position, blend=Blend.NORMAL, area=None, version=None):
+        _, _, texture, normal = self._texture(surface, version, area)
+        texture.blend_mode = normal if blend is Blend.NORMAL else self._MODES[blend]
+        if area is None:
+            texture.draw(dstrect=position)
+        else:
+            area = pygame.Rect(area)
+            texture.draw(srcrect=area, dstrect=(*position, area.width, area.height))
+
+    def blits(self, sprites):
+        # Runs of the same sprite look their texture up once
+        last = texture = None
+        for surface, position in sprites:
+            if surface is not last:
+                last = surface
+                _, _, texture, normal = self._texture(surface)
+                texture.blend_mode = normal
+            texture.draw(dstrect=position)
+
+    def text(self, font, text, color, position):
+        key = (font, text, color)
+        texture = self._text.get(key)
+        if texture is None:
+            if len(self._text) >= TEXT_CACHE_SIZE:
+                self._text.clear()
+            texture = self._text[key] = self._video.Texture.from_surface(self.renderer,
+                                                                        font.render(text, True, color))
+        texture.draw(dstrect=position)
+
+    def present(self):
+        self.renderer.present()
+
+    def read_surface(self):
+        if self._readback is None:
+            self._readback = pygame.Surface(self.size)
+        return self.renderer.to_surface(surface=self._readback)
+
+    def close(self):
+        self._textures.clear()
+        self._shapes.clear()
+        self._text.clear()
+        self._targets.clear()
+        self.window.destroy()
+
+class NullBackend(RenderBackend):
+    # Accepts everything and draws nothing, to time the game without drawing
+    name = "null"
+
+    def __init__(self, size: Tuple[int, int], title: str = ""):
+        super().__init__(size)
+        pygame.display.init()  # input still needs the video subsystem
+        self._blank = None
+
+    def clear(self, color):
+        pass
+
+    def circle(self, color, center, radius, width=0):
+        pass
+
+    def rect(self, color, rect, width=0):
+        pass
+
+    def polygon(self, color, points):
+        pass
+
+    def sprite(self, surface, position, blend=Blend.NORMAL, area=None, version=None):
+        pass
+
+    def blits(self, sprites):
+        pass
+
+    def text(self, font, text, color, position):
+        pass
+
+    def present(self):
+        pass
+
+    def read_surface(self):
+        if self._blank is None:
+            self._blank = pygame.Surface(self.size)
+        return self._blank
+
+BACKENDS = {backend.name: backend for backend in (SurfaceBackend, RendererBackend, NullBackend)}
+
+def create_backend(name: str, size: Tuple[int, int], title: str = "") -> RenderBackend:
+    return BACKENDS[name](size, title)
+
+def _display(size: Tuple[int, int], title: str) -> pygame.Surface:
+    # Only the subsystems the game uses are started, and an existing window is reused
+    pygame.display.init()
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != size:
+        screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+    return screen
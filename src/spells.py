@@ -1,8 +1,10 @@
 import pygame
 import math
-import random
+import numpy as np
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import NamedTuple, Tuple
+
+from ecs import Kind, World
 
 # Colors
 BLACK = (0, 0, 0)
@@ -26,6 +28,13 @@ class SpellType(Enum):
     ICE_STORM = "ice_storm"
     TELEPORT = "teleport"
 
+# Frames a projectile lives for, by spell type
+PROJECTILE_LIFETIMES = {
+    SpellType.LIGHTNING: 30,
+    SpellType.ICE_SHARD: 60,
+}
+DEFAULT_PROJECTILE_LIFETIME = 120
+
 class Spell:
     def __init__(self, spell_type: SpellType, damage: int, speed: float, cooldown: int, 
                  mana_cost: int, color: Tuple[int, int, int], radius: int = 8):
@@ -38,68 +47,92 @@ class Spell:
         self.radius = radius
         self.current_cooldown = 0
 
-class Projectile:
-    def __init__(self, x: float, y: float, target_x: float, target_y: float, spell: Spell):
-        self.x = x
-        self.y = y
-        self.spell = spell
-        self.active = True
-        
-        # Calculate direction
-        dx = target_x - x
-        dy = target_y - y
-        distance = math.sqrt(dx**2 + dy**2)
-        self.dx = (dx / distance) * spell.speed if distance > 0 else 0
-        self.dy = (dy / distance) * spell.speed if distance > 0 else 0
-        
-        # Special effects based on spell type
-        if spell.spell_type == SpellType.LIGHTNING:
-            self.lifetime = 30
-            self.max_lifetime = 30
-        elif spell.spell_type == SpellType.ICE_SHARD:
-            self.lifetime = 60
-            self.max_lifetime = 60
-        else:
-            self.lifetime = 120
-            self.max_lifetime = 120
+# Spell types by their index in the world's spell column
+SPELL_TYPES = list(SpellType)
 
-    def update(self, screen_width: int, screen_height: int):
-        self.x += self.dx
-        self.y += self.dy
-        
-        # Update lifetime
-        if hasattr(self, 'lifetime'):
-            self.lifetime -= 1
-            if self.lifetime <= 0:
-                self.active = False
-        
-        # Deactivate if off screen
-        if self.x < 0 or self.x > screen_width or self.y < 0 or self.y > screen_height:
-            self.active = False
-
-    def draw(self, screen):
-        if not self.active:
-            return
-            
-        # Draw based on spell type
-        if self.spell.spell_type == SpellType.LIGHTNING:
-            # Lightning effect
-            alpha = int(255 * (self.lifetime / self.max_lifetime))
-            lightning_surface = pygame.Surface((self.spell.radius * 2, self.spell.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(lightning_surface, (*self.spell.color, alpha), 
-                             (self.spell.radius, self.spell.radius), self.spell.radius)
-            screen.blit(lightning_surface, (int(self.x - self.spell.radius), int(self.y - self.spell.radius)))
-        elif self.spell.spell_type == SpellType.ICE_SHARD:
+# Fire Nova fans out in twelve directions, Ice Storm in a five-shard cone
+NOVA_ANGLES = np.radians(np.arange(0, 360, 30))
+STORM_ANGLES = np.radians(np.arange(-2, 3) * 15)
+
+def spawn_projectiles(world: World, spell: Spell, x: float, y: float, dx, dy) -> int:
+    # One projectile per direction (arrays of any length, not necessarily unit
+    # vectors), written as a single block of rows; a zero direction stays put
+    dx = np.asarray(dx, dtype=np.float64)
+    dy = np.asarray(dy, dtype=np.float64)
+    distance = np.hypot(dx, dy)
+    speed = np.divide(spell.speed, distance, out=np.zeros_like(distance), where=distance > 0)
+    lifetime = PROJECTILE_LIFETIMES.get(spell.spell_type, DEFAULT_PROJECTILE_LIFETIME)
+    world.spawn_many(Kind.PROJECTILE, len(distance), position=(x, y), velocity=(dx * speed, dy * speed),
+                     collider=spell.radius, lifetime=lifetime, renderable=spell.color,
+                     spell=SPELL_TYPES.index(spell.spell_type), cull=True)
+    return len(distance)
+
+class ProjectileBatch(NamedTuple):
+    spell_type: SpellType
+    radius: int
+    color: Tuple[int, int, int]
+    centres: np.ndarray  # (n, 2) float32 positions
+    alphas: np.ndarray   # (n,) int32 fade, 255 when fresh
+
+def projectile_batches(world: World) -> Tuple[ProjectileBatch, ...]:
+    # Copy of the live projectiles grouped by spell type, ready for draw_projectiles
+    rows = world.select("position", "collider", "lifetime", "renderable", "spell", kind=Kind.PROJECTILE)
+    if not len(rows):
+        return ()
+    c = world.columns
+    spells = c["spell"][rows]
+    centres = np.stack((c["x"][rows], c["y"][rows]), axis=1).astype(np.float32)
+    alphas = (255 * c["life"][rows] // c["max_life"][rows]).astype(np.int32)
+    batches = []
+    for spell in np.unique(spells):
+        mask = spells == spell
+        first = rows[np.argmax(mask)]  # every row of a spell shares its radius and color
+        batches.append(ProjectileBatch(SPELL_TYPES[spell], int(c["radius"][first]),
+                                       tuple(c["color"][first].tolist()), centres[mask], alphas[mask]))
+    return tuple(batches)
+
+_sprites = {}
+
+def projectile_sprite(spell_type: SpellType, radius: int, color: Tuple[int, int, int],
+                      alpha: int = 255) -> pygame.Surface:
+    # Pre-rendered once per look (radius already scaled) so drawing is a plain blit
+    key = (spell_type, radius, color, alpha)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        if alpha < 255:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        else:
+            # Opaque shapes blit fastest colorkeyed and run-length encoded
+            sprite = pygame.Surface((radius * 2, radius * 2))
+            sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+        if spell_type == SpellType.ICE_SHARD:
             # Ice shard effect
             points = [
-                (self.x, self.y - self.spell.radius),
-                (self.x - self.spell.radius//2, self.y + self.spell.radius//2),
-                (self.x + self.spell.radius//2, self.y + self.spell.radius//2)
+                (radius, 0),
+                (radius - radius//2, radius + radius//2),
+                (radius + radius//2, radius + radius//2)
             ]
-            pygame.draw.polygon(screen, self.spell.color, points)
+            pygame.draw.polygon(sprite, color, points)
+        else:
+            # Standard projectile, or a fading lightning bolt
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+        _sprites[key] = sprite
+    return sprite
+
+def draw_projectiles(backend, batches: Tuple[ProjectileBatch, ...], alpha_effects: bool = True,
+                     scale: float = 1.0):
+    # One blits() submission per spell type
+    for spell_type, radius, color, centres, alphas in batches:
+        if scale != 1.0:
+            radius = max(1, round(radius * scale))
+        positions = (centres * scale - radius).astype(np.int32).tolist()
+        if spell_type == SpellType.LIGHTNING and alpha_effects:
+            # Lightning fades out; the fade has one sprite per alpha level
+            sprites = [projectile_sprite(spell_type, radius, color, alpha) for alpha in alphas.tolist()]
+            backend.blits(zip(sprites, positions))
         else:
-            # Standard projectile
-            pygame.draw.circle(screen, self.spell.color, (int(self.x), int(self.y)), self.spell.radius)
+            sprite = projectile_sprite(spell_type, radius, color)
+            backend.blits([(sprite, position) for position in positions])
 
 class SpellManager:
     def __init__(self):
@@ -117,43 +150,36 @@ class SpellManager:
         self.unlocked_spells = {SpellType.FIREBALL, SpellType.MAGIC_MISSILE}
         self.current_spell = SpellType.FIREBALL
 
-    def cast_spell(self, caster_x: float, caster_y: float, target_x: float, target_y: float, 
-                   mana: int) -> List[Projectile]:
+    def cast_spell(self, world: World, caster_x: float, caster_y: float, target_x: float,
+                   target_y: float, mana: int) -> int:
+        # Returns how many projectiles were launched
         spell = self.spells[self.current_spell]
         
         if spell.current_cooldown > 0 or mana < spell.mana_cost:
-            return []
-        
-        projectiles = []
+            return 0
         
         if spell.spell_type == SpellType.FIRE_NOVA:
             # Cast fire nova in all directions
-            for angle in range(0, 360, 30):
-                rad = math.radians(angle)
-                target_x = caster_x + math.cos(rad) * 100
-                target_y = caster_y + math.sin(rad) * 100
-                projectiles.append(Projectile(caster_x, caster_y, target_x, target_y, spell))
+            launched = spawn_projectiles(world, spell, caster_x, caster_y,
+                                         np.cos(NOVA_ANGLES), np.sin(NOVA_ANGLES))
         
         elif spell.spell_type == SpellType.ICE_STORM:
             # Cast multiple ice shards in a cone
-            base_angle = math.atan2(target_y - caster_y, target_x - caster_x)
-            for i in range(-2, 3):
-                angle = base_angle + math.radians(i * 15)
-                target_x = caster_x + math.cos(angle) * 100
-                target_y = caster_y + math.sin(angle) * 100
-                projectiles.append(Projectile(caster_x, caster_y, target_x, target_y, spell))
+            angles = math.atan2(target_y - caster_y, target_x - caster_x) + STORM_ANGLES
+            launched = spawn_projectiles(world, spell, caster_x, caster_y, np.cos(angles), np.sin(angles))
         
         elif spell.spell_type == SpellType.TELEPORT:
             # Teleport to target location
             # This will be handled by the wizard class
-            pass
+            launched = 0
         
         else:
             # Standard single projectile
-            projectiles.append(Projectile(caster_x, caster_y, target_x, target_y, spell))
+            launched = spawn_projectiles(world, spell, caster_x, caster_y,
+                                         (target_x - caster_x,), (target_y - caster_y,))
         
         spell.current_cooldown = spell.cooldown
-        return projectiles
+        return launched
 
     def update_cooldowns(self):
         for spell in self.spells.values():
@@ -0,0 +1,348 @@
+import multiprocessing as mp
+import signal
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+# Steering grid and tuning
+CELL_SIZE = 20
+SEPARATION = 0.6    # push away from crowded cells
+INERTIA = 0.8       # fraction of last tick's velocity kept
+SWARM_RADIUS = 6
+SWARM_DAMAGE = 3
+SWARM_COLOR = (200, 120, 40)
+
+# Control slots shared with the workers
+TARGET_X, TARGET_Y, STOP = range(3)
+
+# Seconds close() waits for each worker to exit before terminating it
+CLOSE_TIMEOUT = 2.0
+
+
+def _layout(capacity: int, cells: int, partitions: int) -> List[Tuple[str, np.dtype, tuple]]:
+    return [
+        ("x", np.float32, (capacity,)),
+        ("y", np.float32, (capacity,)),
+        ("vx", np.float32, (capacity,)),
+        ("vy", np.float32, (capacity,)),
+        ("speed", np.float32, (capacity,)),
+        ("alive", np.bool_, (capacity,)),
+        ("flow_x", np.float32, (cells,)),
+        ("flow_y", np.float32, (cells,)),
+        ("blocked", np.bool_, (cells,)),
+        ("density", np.float32, (partitions, cells)),
+        ("control", np.float64, (4,)),
+    ]
+
+
+def _views(buffer, layout) -> Dict[str, np.ndarray]:
+    views = {}
+    offset = 0
+    for name, dtype, shape in layout:
+        dtype = np.dtype(dtype)
+        offset = (offset + 7) // 8 * 8
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += dtype.itemsize * int(np.prod(shape))
+    return views
+
+
+def _size(layout) -> int:
+    offset = 0
+    for _, dtype, shape in layout:
+        offset = (offset + 7) // 8 * 8 + np.dtype(dtype).itemsize * int(np.prod(shape))
+    return offset
+
+
+def _cells(arrays, lo: int, hi: int, grid: Tuple[int, int]) -> np.ndarray:
+    grid_w, grid_h = grid
+    cx = np.clip((arrays["x"][lo:hi] // CELL_SIZE).astype(np.int32), 0, grid_w - 1)
+    cy = np.clip((arrays["y"][lo:hi] // CELL_SIZE).astype(np.int32), 0, grid_h - 1)
+    return cy * grid_w + cx
+
+
+def _count(arrays, part: int, lo: int, hi: int, grid: Tuple[int, int]):
+    # Phase 1: this partition's contribution to the crowd density grid
+    cells = _cells(arrays, lo, hi, grid)
+    alive = arrays["alive"][lo:hi]
+    arrays["density"][part] = np.bincount(cells[alive], minlength=grid[0] * grid[1])
+
+
+def _steer(arrays, lo: int, hi: int, grid: Tuple[int, int]):
+    # Phase 2: follow the flow field, push away from crowds, integrate
+    grid_w, grid_h = grid
+    density = arrays["density"].sum(axis=0).reshape(grid_h, grid_w)
+    grad_y, grad_x = np.gradient(density)
+    grad_x = grad_x.ravel()
+    grad_y = grad_y.ravel()
+
+    x, y = arrays["x"][lo:hi], arrays["y"][lo:hi]
+    vx, vy = arrays["vx"][lo:hi], arrays["vy"][lo:hi]
+    speed = arrays["speed"][lo:hi]
+    alive = arrays["alive"][lo:hi]
+    cells = _cells(arrays, lo, hi, grid)
+
+    # Near the target (or off the field) head straight for it
+    control = arrays["control"]
+    dx = control[TARGET_X] - x
+    dy = control[TARGET_Y] - y
+    dist = np.sqrt(dx * dx + dy * dy) + 1e-6
+    fx = arrays["flow_x"][cells]
+    fy = arrays["flow_y"][cells]
+    direct = (dist < CELL_SIZE * 2) | ((fx == 0) & (fy == 0))
+    fx = np.where(direct, dx / dist, fx)
+    fy = np.where(direct, dy / dist, fy)
+
+    desired_x = fx * speed - grad_x[cells] * SEPARATION
+    desired_y = fy * speed - grad_y[cells] * SEPARATION
+    norm = np.sqrt(desired_x * desired_x + desired_y * desired_y) + 1e-6
+    limit = np.minimum(1.0, speed * 1.5 / norm)
+
+    new_vx = vx * INERTIA + desired_x * limit * (1 - INERTIA)
+    new_vy = vy * INERTIA + desired_y * limit * (1 - INERTIA)
+    new_x = x + new_vx
+    new_y = y + new_vy
+
+    # Don't step into walls
+    new_cx = np.clip((new_x // CELL_SIZE).astype(np.int32), 0, grid_w - 1)
+    new_cy = np.clip((new_y // CELL_SIZE).astype(np.int32), 0, grid_h - 1)
+    move = alive & ~arrays["blocked"][new_cy * grid_w + new_cx]
+    vx[:] = np.where(move, new_vx, 0)
+    vy[:] = np.where(move, new_vy, 0)
+    x[:] = np.where(move, new_x, x)
+    y[:] = np.where(move, new_y, y)
+
+
+def _worker(name: str, layout, grid, part: int, lo: int, hi: int, start, middle, done):
+    # Forked after pygame.init(), which catches SIGTERM; restore it so terminate() works
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Attach once; every tick afterwards is barrier handoffs over shared arrays
+    shm = shared_memory.SharedMemory(name=name)
+    arrays = _views(shm.buf, layout)
+    try:
+        while True:
+            start.wait()
+            if arrays["control"][STOP]:
+                break
+            _count(arrays, part, lo, hi, grid)
+            middle.wait()
+            _steer(arrays, lo, hi, grid)
+            done.wait()
+    finally:
+        del arrays
+        shm.close()
+
+
+class Swarm:
+    """A very large enemy swarm steered over shared-memory arrays.
+
+    Enemy state lives in one ``multiprocessing.shared_memory`` block. With
+    ``workers`` > 0 the enemies are split into contiguous partitions, one per
+    worker process; each tick the workers count their partition into a shared
+    density grid, meet at a barrier, then steer and move their own enemies
+    (flow field towards the target around walls, plus separation away from
+    crowded cells). ``step()`` returns once every worker has finished. Nothing is
+    pickled after startup. With ``workers=0`` the same kernels run in-process.
+    """
+
+    def __init__(self, capacity: int, workers: int = 0, bounds: Tuple[int, int] = (1200, 800),
+                 walls: Sequence[Tuple[int, int, int, int]] = (), seed: Optional[int] = None):
+        self.capacity = capacity
+        self.bounds = bounds
+        self.workers = workers
+        self.rng = np.random.default_rng(seed)
+        self.grid = (-(-bounds[0] // CELL_SIZE), -(-bounds[1] // CELL_SIZE))
+        grid_w, grid_h = self.grid
+        partitions = max(1, workers)
+
+        self._layout = _layout(capacity, grid_w * grid_h, partitions)
+        self._shm = shared_memory.SharedMemory(create=True, size=_size(self._layout))
+        self.arrays = _views(self._shm.buf, self._layout)
+        for array in self.arrays.values():
+            array[...] = 0
+
+        self._mark_walls(walls)
+        self._flow_cell = None
+        self._distance = np.full(grid_w * grid_h, -1, dtype=np.int32)
+
+        bounds_list = np.linspace(0, capacity, partitions + 1).astype(int)
+        self._partitions = list(zip(bounds_list[:-1], bounds_list[1:]))
+        self._processes = []
+        if workers:
+            self._start = mp.Barrier(workers + 1)
+            self._middle = mp.Barrier(workers)
+            self._done = mp.Barrier(workers + 1)
+            for part, (lo, hi) in enumerate(self._partitions):
+                process = mp.Process(target=_worker, daemon=True,
+                                     args=(self._shm.name, self._layout, self.grid, part, lo, hi,
+                                           self._start, self._middle, self._done))
+                process.start()
+                self._processes.append(process)
+
+    def _mark_walls(self, walls):
+        grid_w, grid_h = self.grid
+        blocked = self.arrays["blocked"].reshape(grid_h, grid_w)
+        for x, y, w, h in walls:
+            blocked[int(y) // CELL_SIZE:-(-int(y + h) // CELL_SIZE),
+                    int(x) // CELL_SIZE:-(-int(x + w) // CELL_SIZE)] = True
+
+    @property
+    def alive(self) -> int:
+        return int(np.count_nonzero(self.arrays["alive"]))
+
+    def spawn(self, count: int, speed: Tuple[float, float] = (1.5, 2.5)):
+        # Fill free slots with enemies along the screen edges
+        free = np.flatnonzero(~self.arrays["alive"])[:count]
+        n = len(free)
+        if not n:
+            return
+        width, height = self.bounds
+        side = self.rng.integers(0, 4, n)
+        along_x = self.rng.uniform(0, width, n)
+        along_y = self.rng.uniform(0, height, n)
+        a = self.arrays
+        a["x"][free] = np.select([side == 0, side == 1, side == 2], [along_x, along_x, 0], width - 1)
+        a["y"][free] = np.select([side == 0, side == 1, side == 2], [0, height - 1, along_y], along_y)
+        a["vx"][free] = 0
+        a["vy"][free] = 0
+        a["speed"][free] = self.rng.uniform(speed[0], speed[1], n)
+        a["alive"][free] = True
+
+    def clear(self):
+        self.arrays["alive"][:] = False
+
+    def step(self, target_x: float, target_y: float):
+        control = self.arrays["control"]
+        control[TARGET_X] = target_x
+        control[TARGET_Y] = target_y
+        self._update_flow(target_x, target_y)
+
+        if self._processes:
+            self._start.wait()
+            self._done.wait()
+            return
+        for part, (lo, hi) in enumerate(self._partitions):
+            _count(self.arrays, part, lo, hi, self.grid)
+        for lo, hi in self._partitions:
+            _steer(self.arrays, lo, hi, self.grid)
+
+    def _update_flow(self, target_x: float, target_y: float):
+        # Breadth-first distances from the target's cell, rebuilt only when it changes cell
+        grid_w, grid_h = self.grid
+        cx = min(max(int(target_x) // CELL_SIZE, 0), grid_w - 1)
+        cy = min(max(int(target_y) // CELL_SIZE, 0), grid_h - 1)
+        cell = cy * grid_w + cx
+        if cell == self._flow_cell:
+            return
+        self._flow_cell = cell
+
+        blocked = self.arrays["blocked"]
+        distance = self._distance
+        distance.fill(-1)
+        distance[cell] = 0
+        queue = deque([cell])
+        while queue:
+            current = queue.popleft()
+            x, y = current % grid_w, current // grid_w
+            step = distance[current] + 1
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < grid_w and 0 <= ny < grid_h:
+                    neighbor = ny * grid_w + nx
+                    if distance[neighbor] < 0 and not blocked[neighbor]:
+                        distance[neighbor] = step
+                        queue.append(neighbor)
+
+        # Each cell points at its closest neighbour (8-way) towards the target
+        dist = np.where(distance < 0, np.iinfo(np.int32).max, distance).reshape(grid_h, grid_w)
+        padded = np.pad(dist, 1, constant_values=np.iinfo(np.int32).max)
+        offsets = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+        neighbors = np.stack([padded[1 + oy:1 + oy + grid_h, 1 + ox:1 + ox + grid_w]
+                              for ox, oy in offsets])
+        best = neighbors.argmin(axis=0)
+        improves = neighbors.min(axis=0) < dist
+        directions = np.array(offsets, dtype=np.float32)
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        self.arrays["flow_x"][:] = np.where(improves, directions[best, 0], 0).ravel()
+        self.arrays["flow_y"][:] = np.where(improves, directions[best, 1], 0).ravel()
+
+    def kill_near(self, x: float, y: float, radius: float) -> int:
+        a = self.arrays
+        dx = a["x"] - x
+        dy = a["y"] - y
+        hit = a["alive"] & (dx * dx + dy * dy < radius * radius)
+        killed = int(np.count_nonzero(hit))
+        if killed:
+            a["alive"][hit] = False
+        return killed
+
+    def touching(self, x: float, y: float, radius: float) -> bool:
+        a = self.arrays
+        dx = a["x"] - x
+        dy = a["y"] - y
+        return bool((a["alive"] & (dx * dx + dy * dy < radius * radius)).any())
+
+    def positions(self) -> np.ndarray:
+        # Copy of live enemy positions as an (n, 2) array
+        a = self.arrays
+        alive = a["alive"]
+        return np.stack((a["x"][alive], a["y"][alive]), axis=1)
+
+    def blit_positions(self) -> np.ndarray:
+        # Read-only top-left sprite positions for draw_swarm
+        positions = (self.positions() - SWARM_RADIUS).astype(np.int32)
+        positions.flags.writeable = False
+        return positions
+
+    def close(self):
+        if self._shm is None:
+            return
+        if self._processes:
+            # Every live worker is parked on the start barrier between steps
+            self.arrays["control"][STOP] = 1
+            if all(process.is_alive() for process in self._processes):
+                self._start.wait()
+                for process in self._processes:
+                    process.join(CLOSE_TIMEOUT)
+            self._stop_workers()
+        self._release()
+
+    def _stop_workers(self):
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    def _release(self):
+        self.arrays = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __del__(self):
+        # No barriers here: waiting on one, or breaking it, blocks on workers that
+        # never arrive. Kill the workers and hand back the shared memory.
+        if getattr(self, "_shm", None) is None:
+            return
+        try:
+            self._stop_workers()
+            self._release()
+        except Exception:
+            pass
+
+
+_sprites = {}
+
+
+def draw_swarm(backend, positions: np.ndarray, scale: float = 1.0):
+    # One blits() submission for the whole swarm
+    sprite = _sprites.get(scale)
+    if sprite is None:
+        radius = max(1, round(SWARM_RADIUS * scale))
+        sprite = _sprites[scale] = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, SWARM_COLOR, (radius, radius), radius)
+    if len(positions):
+        if scale != 1.0:
+            positions = (positions * scale).astype(np.int32)
+        backend.blits([(sprite, position) for position in positions.tolist()])
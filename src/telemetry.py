@@ -0,0 +1,166 @@
+import time
+import numpy as np
+from typing import Dict
+
+from ecs import Kind
+
+# One fixed-size record per tick. Counters for spawned/killed enemies are
+# running totals so per-tick deltas survive the ring buffer wrapping. New
+# fields go at the end, with TELEMETRY_VERSION bumped and the old layout added
+# to TELEMETRY_LAYOUTS so load_session can still read its files.
+TELEMETRY_VERSION = 4
+TELEMETRY_DTYPE = np.dtype([
+    ('tick', np.int64),
+    ('time', np.float64),
+    ('wave', np.int32),
+    ('enemies', np.int32),
+    ('projectiles', np.int32),
+    ('particles', np.int32),
+    ('power_ups', np.int32),
+    ('wizard_health', np.float32),
+    ('wizard_mana', np.float32),
+    ('enemies_spawned', np.int32),
+    ('enemies_killed', np.int32),
+    ('input_ms', np.float32),
+    ('update_ms', np.float32),
+    ('draw_ms', np.float32),
+    ('frame_ms', np.float32),
+    ('quality', np.int32),   # version 2
+    ('bullets', np.int32),   # version 3, mid-record there
+    ('version', np.int32),   # version 4: TELEMETRY_VERSION in every row
+])
+
+# Field names of the layouts written before the version column, by version
+TELEMETRY_LAYOUTS = {
+    1: TELEMETRY_DTYPE.names[:15],
+    2: TELEMETRY_DTYPE.names[:16],
+    3: TELEMETRY_DTYPE.names[:5] + ('bullets',) + TELEMETRY_DTYPE.names[5:16],
+}
+
+# Value of columns a session's layout doesn't have
+MISSING = -1
+
+# One hour at 60 FPS
+DEFAULT_CAPACITY = 60 * 60 * 60
+
+
+class TelemetryRecorder:
+    """Per-tick telemetry written into a preallocated, memory-mapped .npy file.
+
+    The file is a fixed-size ring of ``capacity`` records, so disk usage never
+    exceeds ``capacity * TELEMETRY_DTYPE.itemsize`` bytes no matter how long the
+    session runs. Rows are committed by writing their ``tick`` last, which lets
+    external readers (``np.load(path, mmap_mode='r')``) follow along while the
+    game is running without any locking.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY, interval: int = 1):
+        self.path = path
+        self.capacity = capacity
+        self.interval = max(1, interval)
+        self.tick = 0
+        self.start_time = time.perf_counter()
+
+        self._data = np.lib.format.open_memmap(path, mode='w+', dtype=TELEMETRY_DTYPE,
+                                               shape=(capacity,))
+        self._data['tick'] = -1
+        self._data['version'] = TELEMETRY_VERSION
+
+        # Bind column views once so the hot path is plain item assignment
+        self._tick = self._data['tick']
+        self._time = self._data['time']
+        self._wave = self._data['wave']
+        self._enemies = self._data['enemies']
+        self._projectiles = self._data['projectiles']
+        self._bullets = self._data['bullets']
+        self._particles = self._data['particles']
+        self._power_ups = self._data['power_ups']
+        self._health = self._data['wizard_health']
+        self._mana = self._data['wizard_mana']
+        self._spawned = self._data['enemies_spawned']
+        self._killed = self._data['enemies_killed']
+        self._input_ms = self._data['input_ms']
+        self._update_ms = self._data['update_ms']
+        self._draw_ms = self._data['draw_ms']
+        self._frame_ms = self._data['frame_ms']
+        self._quality = self._data['quality']
+
+    def record(self, game, input_ms: float, update_ms: float, draw_ms: float, frame_ms: float):
+        tick = self.tick
+        self.tick += 1
+        if tick % self.interval:
+            return
+
+        i = (tick // self.interval) % self.capacity
+        wizard = game.wizard
+
+        # Invalidate the row while it is being rewritten
+        self._tick[i] = -1
+        self._time[i] = time.perf_counter() - self.start_time
+        self._wave[i] = game.wave
+        world = game.world
+        self._enemies[i] = world.count_of(Kind.ENEMY)
+        self._projectiles[i] = world.count_of(Kind.PROJECTILE)
+        self._bullets[i] = len(game.bullets)
+        self._particles[i] = world.count_of(Kind.PARTICLE) + world.count_of(Kind.WIZARD_PARTICLE)
+        self._power_ups[i] = world.count_of(Kind.POWER_UP)
+        self._health[i] = wizard.health
+        self._mana[i] = wizard.mana
+        self._spawned[i] = game.enemies_spawned
+        self._killed[i] = game.enemies_killed
+        self._input_ms[i] = input_ms
+        self._update_ms[i] = update_ms
+        self._draw_ms[i] = draw_ms
+        self._frame_ms[i] = frame_ms
+        self._quality[i] = game.governor.level
+        self._tick[i] = tick
+
+    def flush(self):
+        self._data.flush()
+
+    def close(self):
+        if self._data is not None:
+            self._data.flush()
+            self._data = None
+
+
+def session_version(data: np.ndarray) -> int:
+    # Format version of a loaded telemetry file, from its version column or, in
+    # files written before there was one, from its field names
+    names = data.dtype.names or ()
+    if 'version' in names:
+        return int(data['version'][0]) if len(data) else TELEMETRY_VERSION
+    for version, layout in TELEMETRY_LAYOUTS.items():
+        if names == layout:
+            return version
+    raise ValueError(f"not a telemetry session: unrecognized fields {names}")
+
+
+def load_session(path: str) -> Dict[str, np.ndarray]:
+    """Load a telemetry file into one array per column, ordered by tick.
+
+    Safe to call on a file that is still being written; rows that are in the
+    middle of being rewritten are skipped. Files from older versions load
+    too, with ``MISSING`` in the columns they didn't record; files from a
+    newer version raise ValueError.
+    """
+    data = np.load(path, mmap_mode='r')
+    try:
+        version = session_version(data)
+    except ValueError as error:
+        raise ValueError(f"{path}: {error}") from None
+    if version > TELEMETRY_VERSION:
+        raise ValueError(f"{path}: telemetry version {version} is newer than this build reads "
+                         f"(up to {TELEMETRY_VERSION})")
+    valid = np.flatnonzero(data['tick'] >= 0)
+    order = valid[np.argsort(data['tick'][valid], kind='stable')]
+    records = np.array(data[order])
+    columns = {}
+    for name in TELEMETRY_DTYPE.names:
+        if name in records.dtype.names:
+            columns[name] = records[name]
+        else:
+            columns[name] = np.full(len(records), MISSING, dtype=TELEMETRY_DTYPE[name])
+    columns['version'][:] = version
+    return columns
+
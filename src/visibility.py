@@ -0,0 +1,276 @@
+import numpy as np
+import pygame
+from typing import List, Optional, Tuple
+
+from ecs import System, World
+from level import Level
+from render_backend import Blend
+
+# How far the wizard sees, in tiles
+SIGHT_RADIUS = 18
+
+# Fog darkness per tile: 0 is clear, 255 is black
+FOG_VISIBLE = 0
+FOG_EXPLORED = 150
+FOG_UNEXPLORED = 225
+_FOG_LEVELS = np.array([FOG_UNEXPLORED, FOG_EXPLORED, FOG_VISIBLE], dtype=np.uint8)
+
+# Tiles per side of the fog overlay blocks that are rescaled independently
+FOG_BLOCK = 4
+
+# Octant transforms for shadowcasting: (xx, xy, yx, yy)
+_OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+# Tiles within the sight radius around the origin, one mask per radius
+_discs = {}
+
+def _disc(radius: int) -> np.ndarray:
+    disc = _discs.get(radius)
+    if disc is None:
+        offsets = np.arange(-radius, radius + 1)
+        disc = _discs[radius] = (offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius * radius).astype(np.uint8)
+    return disc
+
+class Visibility:
+    """Line of sight from the wizard over the level's collision tiles.
+
+    ``update()`` recomputes the visible tiles with recursive shadowcasting, but
+    only when the wizard has moved to a different tile, so most frames cost a
+    single tile lookup. The scan walks per-octant tables of tile offsets and
+    slopes built once per level, over a collision grid padded with open ground
+    so no tile needs a bounds check. ``visible`` is then a boolean tile grid:
+    what the wizard can see is also what can see the wizard, so ``can_see()``
+    answers for any number of enemies with one array lookup each. ``fog`` is a
+    fresh uint8 darkness grid after each recompute (never modified in place), so
+    frame snapshots can hold on to it, and ``overlay`` turns it into the shade
+    drawn over the world. Off the grid is open ground and always visible.
+    """
+
+    def __init__(self, level: Level, radius: int = SIGHT_RADIUS):
+        self.radius = radius
+        self.recomputes = 0
+        self.overlay = FogOverlay()
+        self.set_level(level)
+
+    def set_level(self, level: Level):
+        self.tile_size = level.tile_size
+        self.grid_h, self.grid_w = level.blocked.shape
+        # Padded by two sight radii of open ground: the origin may be up to a
+        # radius off the grid and the scan reaches a radius beyond it
+        pad = self._pad = 2 * self.radius
+        self._stride = self.grid_w + 2 * pad
+        blocked = np.zeros((self.grid_h + 2 * pad, self._stride), dtype=np.uint8)
+        blocked[pad:pad + self.grid_h, pad:pad + self.grid_w] = level.blocked
+        self._blocked = blocked.ravel().tolist()
+        self._rows = self._octant_rows()
+        # Lookups for can_see(): the visible grid with a border of open ground
+        self._sight = np.ones((self.grid_h + 2, self.grid_w + 2), dtype=bool)
+        self.reset()
+
+    def reset(self):
+        # Forget explored tiles and recompute on the next update
+        self.cell: Optional[Tuple[int, int]] = None
+        self.visible = np.zeros((self.grid_h, self.grid_w), dtype=bool)
+        self.explored = np.zeros((self.grid_h, self.grid_w), dtype=bool)
+        self.fog = np.full((self.grid_h, self.grid_w), FOG_UNEXPLORED, dtype=np.uint8)
+        self._sight[1:-1, 1:-1] = False
+
+    def _octant_rows(self) -> List[List[List[Tuple[float, float, int]]]]:
+        # Per octant, per distance from the origin: the row's tiles from the
+        # outer edge inwards as (left slope, right slope, offset from the origin
+        # in the padded grid); slopes only depend on the tile's place in the row
+        stride = self._stride
+        tables = []
+        for xx, xy, yx, yy in _OCTANTS:
+            rows: List[List[Tuple[float, float, int]]] = [[]]
+            for distance in range(1, self.radius + 1):
+                dy = -distance
+                rows.append([((dx - 0.5) / (dy + 0.5), (dx + 0.5) / (dy - 0.5),
+                              (dx * yx + dy * yy) * stride + dx * xx + dy * xy)
+                             for dx in range(-distance, 1)])
+            tables.append(rows)
+        return tables
+
+    def update(self, x: float, y: float) -> bool:
+        # Returns whether the visible tiles were recomputed
+        cell = (int(x // self.tile_size), int(y // self.tile_size))
+        if cell == self.cell:
+            return False
+        self.cell = cell
+        self.visible = self._shadowcast(*cell)
+        self.explored |= self.visible
+        # 0 unexplored, 1 explored, 2 visible (visible tiles are explored)
+        self.fog = _FOG_LEVELS.take(self.explored.view(np.uint8) + self.visible.view(np.uint8))
+        self._sight[1:-1, 1:-1] = self.visible
+        self.recomputes += 1
+        return True
+
+    def can_see(self, x, y):
+        # Whether points (scalars or arrays) and the wizard see each other. Tile
+        # coordinates are shifted onto the bordered grid and clamped to its
+        # border, then looked up by flat index
+        column = np.minimum(np.maximum(np.divide(x, self.tile_size) + 1, 0), self.grid_w + 1).astype(np.intp)
+        row = np.minimum(np.maximum(np.divide(y, self.tile_size) + 1, 0), self.grid_h + 1).astype(np.intp)
+        return self._sight.ravel().take(row * (self.grid_w + 2) + column)
+
+    def _shadowcast(self, ox: int, oy: int) -> np.ndarray:
+        width, height = self.grid_w, self.grid_h
+        radius, pad, stride = self.radius, self._pad, self._stride
+        visible = np.zeros((height, width), dtype=bool)
+        if not (-radius <= ox < width + radius and -radius <= oy < height + radius):
+            return visible  # nothing on the grid is within reach
+        blocked = self._blocked
+        lit = bytearray(len(blocked))
+        origin = (oy + pad) * stride + ox + pad
+
+        def cast(rows, row, start, end, reach):
+            # Scan rows outwards from the origin between two slopes, recursing
+            # past each run of blocking tiles (Bergstrom's recursive shadowcasting)
+            if start < end:
+                return
+            new_start = start
+            for distance in range(row, reach + 1):
+                in_shadow = False
+                for left, right, offset in rows[distance]:
+                    if start < right:
+                        continue
+                    if end > left:
+                        break
+                    index = origin + offset
+                    lit[index] = 1
+                    if in_shadow:
+                        if blocked[index]:
+                            new_start = right
+                        else:
+                            in_shadow = False
+                            start = new_start
+                    elif blocked[index] and distance < reach:
+                        in_shadow = True
+                        cast(rows, distance + 1, start, left, reach)
+                        new_start = right
+                if in_shadow:
+                    return
+
+        lit[origin] = 1
+        for (xx, xy, yx, yy), rows in zip(_OCTANTS, self._rows):
+            # Rows run along the octant's major axis; stop where they leave the grid
+            if xy:
+                edge = ox if xy > 0 else width - 1 - ox
+            else:
+                edge = oy if yy > 0 else height - 1 - oy
+            reach = min(radius, edge)
+            if reach > 0:
+                cast(rows, 1, 1.0, 0.0, reach)
+
+        # Keep what is within the sight radius and on the grid
+        lit = np.frombuffer(lit, dtype=np.uint8).reshape(-1, stride)
+        around = lit[oy + pad - radius:oy + pad + radius + 1, ox + pad - radius:ox + pad + radius + 1]
+        around &= _disc(radius)
+        visible[...] = lit[pad:pad + height, pad:pad + width]
+        return visible
+
+class SightSystem(System):
+    # Enemies with the sight component remember where they last saw the wizard.
+    # Without a visibility (fog of war off) they always know.
+    reads = frozenset({"position"})
+    writes = frozenset({"sight"})
+
+    def __init__(self, visibility: Optional[Visibility] = None):
+        self.visibility = visibility
+        self.target = (0.0, 0.0)
+
+    def run(self, world: World):
+        rows = world.select("position", "sight")
+        if not len(rows):
+            return
+        c = world.columns
+        if self.visibility is None:
+            c["seen_x"][rows] = self.target[0]
+            c["seen_y"][rows] = self.target[1]
+            return
+        if rows[-1] + 1 - rows[0] == len(rows):
+            # Contiguous, as enemies packed together in the columns are: read
+            # and write views of the columns instead of gathering
+            index = slice(rows[0], rows[-1] + 1)
+            seen_x, seen_y = c["seen_x"][index], c["seen_y"][index]
+        else:
+            index = rows
+            seen_x, seen_y = c["seen_x"][rows], c["seen_y"][rows]
+        seen = np.isnan(seen_x)  # newcomers are told where the wizard is
+        seen |= self.visibility.can_see(c["x"][index], c["y"][index])
+        np.copyto(seen_x, self.target[0], where=seen)
+        np.copyto(seen_y, self.target[1], where=seen)
+        if index is rows:
+            c["seen_x"][rows] = seen_x
+            c["seen_y"][rows] = seen_y
+
+class FogOverlay:
+    """The fog grid as a smooth shade, multiply-blended over the world.
+
+    The shade is the fog grid, padded by one tile of its edge values and
+    bilinearly upscaled so each value sits at its tile's centre. It is built in
+    blocks of ``block`` tiles: smoothscale maps a block of n + 1 tiles onto n
+    tiles' worth of pixels at exactly one tile per tile size, so blocks meet
+    without seams and a new fog grid only rescales the blocks whose tiles
+    changed. Moving one tile changes the rim of the sight radius, so that is a
+    fraction of the screen. Used only by whichever thread renders.
+    """
+
+    def __init__(self, block: int = FOG_BLOCK):
+        self.block = block
+        self.fog: Optional[np.ndarray] = None
+        self.surface: Optional[pygame.Surface] = None
+
+    def draw(self, backend, fog: np.ndarray, tile_size: int, scale: float = 1.0):
+        step = tile_size * scale  # pixels per tile
+        height, width = fog.shape
+        size = (round((width + 1) * step), round((height + 1) * step))
+        if self.surface is None or self.surface.get_size() != size or self.fog.shape != fog.shape:
+            self.surface = pygame.Surface(size)
+            self._shade = pygame.Surface((width + 2, height + 2))
+            self._padded = None
+            self._edges = [[round(min(i * self.block, n + 1) * step) for i in range(-(-(n + 1) // self.block) + 1)]
+                           for n in (width, height)]
+            self._rebuild(fog)
+        elif self.fog is not fog:
+            self._rebuild(fog)
+        self.fog = fog
+        # Shifted by half a tile so the shade's tile centres meet the world's.
+        # The shade only changes with the fog array, so that is its version
+        offset = -round(step / 2)
+        backend.sprite(self.surface, (offset, offset), Blend.MULTIPLY, version=fog)
+
+    def _rebuild(self, fog: np.ndarray):
+        padded = np.pad(255 - fog, 1, mode="edge")
+        block = self.block
+        columns, rows = self._edges
+        if self._padded is None:
+            dirty = np.ones((len(rows) - 1, len(columns) - 1), dtype=bool)
+        else:
+            # Changed tiles per block, from sums over the padded grid; a block
+            # reads one tile past its own on each axis
+            changed = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.int32)
+            np.cumsum(np.cumsum(padded != self._padded, axis=0), axis=1, out=changed[1:, 1:])
+            starts_y = np.arange(len(rows) - 1) * block
+            starts_x = np.arange(len(columns) - 1) * block
+            ends_y = np.minimum(starts_y + block + 1, padded.shape[0])
+            ends_x = np.minimum(starts_x + block + 1, padded.shape[1])
+            dirty = (changed[np.ix_(ends_y, ends_x)] - changed[np.ix_(starts_y, ends_x)]
+                     - changed[np.ix_(ends_y, starts_x)] + changed[np.ix_(starts_y, starts_x)]) > 0
+        self._padded = padded
+        pixels = pygame.surfarray.pixels3d(self._shade)
+        pixels[...] = padded.T[..., None]
+        del pixels
+        for j, i in zip(*np.nonzero(dirty)):
+            x0, x1 = columns[i], columns[i + 1]
+            y0, y1 = rows[j], rows[j + 1]
+            if x0 >= x1 or y0 >= y1:
+                continue
+            source = pygame.Rect(i * block, j * block, 0, 0)
+            source.width = min(block, padded.shape[1] - 1 - source.x) + 1
+            source.height = min(block, padded.shape[0] - 1 - source.y) + 1
+            pygame.transform.smoothscale(self._shade.subsurface(source), (x1 - x0, y1 - y0),
+                                         self.surface.subsurface((x0, y0, x1 - x0, y1 - y0)))
@@ -1,9 +1,9 @@
 import pygame
-import math
-from typing import List, Tuple
-from spells import SpellManager, SpellType, Projectile
-from game_objects import Particle
-import random
+from spells import SpellManager, SpellType
+from game_objects import emit_particles
+from ecs import Kind, World
+from quality import QUALITY_LEVELS, emission_count
+from lighting import emit_light
 
 # Colors
 BLACK = (0, 0, 0)
@@ -17,7 +17,8 @@ ORANGE = (255, 165, 0)
 CYAN = (0, 255, 255)
 
 class Wizard:
-    def __init__(self, x: float, y: float):
+    def __init__(self, x: float, y: float, world: World):
+        self.world = world
         self.x = x
         self.y = y
         self.radius = 25
@@ -34,14 +35,13 @@ class Wizard:
         self.level = 1
         self.experience_to_next = 100
         
-        # Spell management
+        # Spell management; projectiles and effect particles live in the world
         self.spell_manager = SpellManager()
-        self.projectiles: List[Projectile] = []
         
         # Effects
-        self.particles: List[Particle] = []
         self.invulnerable = False
         self.invulnerability_timer = 0
+        self.quality = QUALITY_LEVELS[0]
         
         # Stats
         self.stats = {
@@ -52,82 +52,83 @@ class Wizard:
             'spell_power': 0
         }
 
-    def move(self, keys, walls=None):
-        new_x = self.x
-        new_y = self.y
+    def move(self, keys, level=None):
+        dx = 0
+        dy = 0
         
         if keys[pygame.K_w] or keys[pygame.K_UP]:
-            new_y = max(self.radius, new_y - self.speed)
+            dy -= 1
         if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            new_y = min(800 - self.radius, new_y + self.speed)
+            dy += 1
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            new_x = max(self.radius, new_x - self.speed)
+            dx -= 1
         if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            new_x = min(1200 - self.radius, new_x + self.speed)
-        
-        # Check wall collisions
-        if walls:
-            can_move = True
-            for wall in walls:
-                if wall.rect.collidepoint(new_x, new_y):
-                    can_move = False
-                    break
-            
-            if can_move:
-                self.x = new_x
-                self.y = new_y
-        else:
-            self.x = new_x
-            self.y = new_y
-
-    def cast_spell(self, target_x: float, target_y: float):
-        if self.current_spell == SpellType.TELEPORT:
-            self.teleport(target_x, target_y)
+            dx += 1
+        
+        self.move_direction(dx, dy, level)
+
+    def move_direction(self, dx: float, dy: float, level=None):
+        new_x = self.x
+        new_y = self.y
+        
+        if dx:
+            new_x = min(1200 - self.radius, max(self.radius, new_x + dx * self.speed))
+        if dy:
+            new_y = min(800 - self.radius, max(self.radius, new_y + dy * self.speed))
+        
+        # Check wall collisions against the level's collision grid
+        if level is not None and level.blocked_at(new_x, new_y):
             return
+        self.x = new_x
+        self.y = new_y
+
+    def cast_spell(self, target_x: float, target_y: float) -> bool:
+        if self.current_spell == SpellType.TELEPORT:
+            return self.teleport(target_x, target_y)
         
-        new_projectiles = self.spell_manager.cast_spell(
-            self.x, self.y, target_x, target_y, self.mana
+        launched = self.spell_manager.cast_spell(
+            self.world, self.x, self.y, target_x, target_y, self.mana
         )
         
-        if new_projectiles:
-            self.projectiles.extend(new_projectiles)
+        if launched:
             spell = self.spell_manager.spells[self.current_spell]
             self.mana -= spell.mana_cost
             
-            # Create casting particles
+            # Create casting particles, and a flash for Fire Nova
             self.create_casting_particles()
+            if spell.spell_type == SpellType.FIRE_NOVA:
+                emit_light(self.world, self.x, self.y, 160, spell.color, 20)
+            return True
+        return False
 
-    def teleport(self, target_x: float, target_y: float):
+    def teleport(self, target_x: float, target_y: float) -> bool:
         spell = self.spell_manager.spells[SpellType.TELEPORT]
         
         if spell.current_cooldown <= 0 and self.mana >= spell.mana_cost:
             # Create teleport particles at current location
-            for _ in range(20):
-                vx = random.uniform(-3, 3)
-                vy = random.uniform(-3, 3)
-                self.particles.append(Particle(self.x, self.y, vx, vy, CYAN, 30))
+            self.emit(20, CYAN, 30, spread=3)
             
             # Teleport
             self.x = target_x
             self.y = target_y
             
             # Create teleport particles at new location
-            for _ in range(20):
-                vx = random.uniform(-3, 3)
-                vy = random.uniform(-3, 3)
-                self.particles.append(Particle(self.x, self.y, vx, vy, CYAN, 30))
+            self.emit(20, CYAN, 30, spread=3)
             
             spell.current_cooldown = spell.cooldown
             self.mana -= spell.mana_cost
+            return True
+        return False
+
+    def emit(self, requested: int, color, lifetime: int, spread: float = 2.0, speed=None):
+        # A burst of effect particles at the wizard, scaled to the current quality
+        count = emission_count(requested, self.world.count_of(Kind.WIZARD_PARTICLE), self.quality)
+        emit_particles(self.world, Kind.WIZARD_PARTICLE, self.x, self.y, count, color, lifetime,
+                       spread, speed)
 
     def create_casting_particles(self):
         spell = self.spell_manager.spells[self.current_spell]
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 3)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            self.particles.append(Particle(self.x, self.y, vx, vy, spell.color, 20))
+        self.emit(10, spell.color, 20, speed=(1, 3))
 
     def take_damage(self, damage: int):
         if self.invulnerable:
@@ -138,10 +139,7 @@ class Wizard:
         self.invulnerability_timer = 60  # 1 second at 60 FPS
         
         # Create damage particles
-        for _ in range(15):
-            vx = random.uniform(-2, 2)
-            vy = random.uniform(-2, 2)
-            self.particles.append(Particle(self.x, self.y, vx, vy, RED, 30))
+        self.emit(15, RED, 30)
 
     def gain_experience(self, amount: int):
         self.experience += amount
@@ -161,29 +159,12 @@ class Wizard:
         self.mana = self.max_mana
         
         # Create level up particles
-        for _ in range(30):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            self.particles.append(Particle(self.x, self.y, vx, vy, YELLOW, 45))
+        self.emit(30, YELLOW, 45, speed=(2, 5))
 
     def update(self, screen_width: int, screen_height: int):
-        # Update cooldowns
+        # Update cooldowns; projectiles and particles are moved by the world's systems
         self.spell_manager.update_cooldowns()
         
-        # Update projectiles
-        for projectile in self.projectiles[:]:
-            projectile.update(screen_width, screen_height)
-            if not projectile.active:
-                self.projectiles.remove(projectile)
-        
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.active:
-                self.particles.remove(particle)
-        
         # Update invulnerability
         if self.invulnerable:
             self.invulnerability_timer -= 1
@@ -193,48 +174,14 @@ class Wizard:
         # Regenerate mana
         self.mana = min(self.max_mana, self.mana + self.mana_regen)
 
-    def draw(self, screen):
-        # Draw wizard with invulnerability effect
-        if self.invulnerable and self.invulnerability_timer % 10 < 5:
-            # Flash effect when invulnerable
-            return
-        
-        pygame.draw.circle(screen, BLUE, (int(self.x), int(self.y)), self.radius)
-        
-        # Draw health bar
-        health_ratio = self.health / self.max_health
-        bar_width = 60
-        bar_height = 8
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - self.radius - 25
-        
-        # Background
-        pygame.draw.rect(screen, BLACK, (bar_x, bar_y, bar_width, bar_height))
-        # Health
-        pygame.draw.rect(screen, GREEN, (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
-        
-        # Draw mana bar
-        mana_ratio = self.mana / self.max_mana
-        mana_bar_y = bar_y - 12
-        
-        # Background
-        pygame.draw.rect(screen, BLACK, (bar_x, mana_bar_y, bar_width, bar_height))
-        # Mana
-        pygame.draw.rect(screen, CYAN, (bar_x, mana_bar_y, int(bar_width * mana_ratio), bar_height))
-        
-        # Draw level
-        level_y = mana_bar_y - 12
-        pygame.draw.rect(screen, BLACK, (bar_x, level_y, bar_width, bar_height))
-        level_ratio = self.experience / self.experience_to_next
-        pygame.draw.rect(screen, YELLOW, (bar_x, level_y, int(bar_width * level_ratio), bar_height))
-        
-        # Draw projectiles
-        for projectile in self.projectiles:
-            projectile.draw(screen)
-        
-        # Draw particles
-        for particle in self.particles:
-            particle.draw(screen)
+    @property
+    def flashing(self) -> bool:
+        # Flash effect when invulnerable
+        return self.invulnerable and self.invulnerability_timer % 10 < 5
+
+    def render_state(self) -> tuple:
+        return (self.x, self.y, self.radius, self.health / self.max_health,
+                self.mana / self.max_mana, self.experience / self.experience_to_next)
 
     @property
     def current_spell(self):
@@ -250,3 +197,38 @@ class Wizard:
 
     def get_spell_info(self) -> str:
         return self.spell_manager.get_spell_info(self.current_spell)
+
+def draw_wizard(backend, x: float, y: float, radius: int, health_ratio: float,
+                mana_ratio: float, level_ratio: float, scale: float = 1.0):
+    bar_y = y - radius - 25
+    bar_width = 60
+    bar_height = 8
+    if scale != 1.0:
+        x *= scale
+        y *= scale
+        bar_y *= scale
+        radius = max(1, round(radius * scale))
+        bar_width = round(bar_width * scale)
+        bar_height = max(1, round(bar_height * scale))
+    backend.circle(BLUE, (int(x), int(y)), radius)
+    
+    # Draw health bar
+    bar_x = x - bar_width // 2
+    
+    # Background
+    backend.rect(BLACK, (bar_x, bar_y, bar_width, bar_height))
+    # Health
+    backend.rect(GREEN, (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
+    
+    # Draw mana bar
+    mana_bar_y = bar_y - 12 * scale
+    
+    # Background
+    backend.rect(BLACK, (bar_x, mana_bar_y, bar_width, bar_height))
+    # Mana
+    backend.rect(CYAN, (bar_x, mana_bar_y, int(bar_width * mana_ratio), bar_height))
+    
+    # Draw level
+    level_y = mana_bar_y - 12 * scale
+    backend.rect(BLACK, (bar_x, level_y, bar_width, bar_height))
+    backend.rect(YELLOW, (bar_x, level_y, int(bar_width * level_ratio), bar_height))